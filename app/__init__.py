@@ -6,9 +6,13 @@ import time
 import uuid
 
 from flask import Flask, g, jsonify, request
-from flask_cors import CORS
 
+from app.compression import init_compression
+from app.cors import init_cors
+from app.json_provider import init_json_provider
 from app.logging_config import setup_logging
+from app.transform.cache import RESULT_CACHE_EXTENSION, ResultCache
+from app.transform.transformer.utility.xml_parser import check_parser_backend
 from config import get_config
 
 
@@ -32,22 +36,35 @@ def create_app(config_name: str | None = None) -> Flask:
     config_class = get_config(config_name)
     app.config.from_object(config_class)
     config_class.init_app(app)
+    check_parser_backend(app.config["XML_PARSER_BACKEND"])
+    init_json_provider(app)
+    # registered first, so responses are compressed after all other hooks
+    init_compression(app)
+    if app.config["RESULT_CACHE_ENABLED"]:
+        app.extensions[RESULT_CACHE_EXTENSION] = ResultCache(
+            app.config["RESULT_CACHE_MAX_BYTES"]
+        )
+    # the models are imported after config loaded FORCE_STD_XML from the .env file
+    from app.transform.session import SESSION_STORE_EXTENSION, SessionStore
+    from app.transform.transformer.utility.xml_emitter import emitters_match
+    from app.transform.transformer.utility.xml_writer import chunked_writing
+
+    # self-check of the fast serialization paths before the first request
+    emitters_match()
+    chunked_writing()
+
+    app.extensions[SESSION_STORE_EXTENSION] = SessionStore(
+        app.config["SESSION_MAX_COUNT"],
+        app.config["SESSION_TTL_SECONDS"],
+        app.config["SESSION_MAX_BYTES"],
+    )
 
     log_level_name = app.config.get("LOG_LEVEL", "INFO")
     log_level = getattr(logging, log_level_name.upper(), logging.INFO)
     logger = setup_logging(log_level, __name__)
 
     # Configure CORS
-    CORS(
-        app,
-        resources={
-            r"/*": {
-                "origins": "*",
-                "methods": ["GET", "POST", "OPTIONS"],
-                "allow_headers": ["Content-Type"],
-            }
-        },
-    )
+    init_cors(app)
 
     @app.before_request
     def capture_request_context():
@@ -3,7 +3,7 @@
 import logging
 import time
 
-from flask import jsonify, request
+from flask import jsonify, make_response, request
 from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
 
 from app.api import bp
@@ -13,7 +13,12 @@ from app.model_transformer.metrics import (
     REQUEST_COUNT,
     REQUEST_LATENCY,
 )
-from app.transform.main import post_transform
+from app.transform.main import (
+    delete_session,
+    post_session,
+    post_session_delta,
+    post_transform,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -59,6 +64,88 @@ def transform():
         )
 
 
+@bp.route("/transform/sessions", methods=["POST"])
+def create_transform_session():
+    """Transform a model and keep it in a session for later deltas."""
+    start_time = time.time()
+    try:
+        logger.info("Transform session request received")
+        transform_start_time = time.time()
+        response = make_response(post_session(request))
+        TRANSFORM_DURATION.observe(time.time() - transform_start_time)
+
+        REQUEST_COUNT.labels(
+            method="POST",
+            endpoint="/transform/sessions",
+            status=str(response.status_code),
+        ).inc()
+        return response
+    except Exception as exc:
+        logger.exception("Transform session request failed")
+        REQUEST_COUNT.labels(
+            method="POST", endpoint="/transform/sessions", status="500"
+        ).inc()
+        return jsonify({"error": str(exc)}), 500
+    finally:
+        REQUEST_LATENCY.labels(method="POST", endpoint="/transform/sessions").observe(
+            time.time() - start_time
+        )
+
+
+@bp.route("/transform/sessions/<session_id>", methods=["POST"])
+def update_transform_session(session_id: str):
+    """Apply a delta to the model of a session and transform it again."""
+    start_time = time.time()
+    try:
+        logger.info("Transform session delta received")
+        transform_start_time = time.time()
+        response = make_response(post_session_delta(request, session_id))
+        TRANSFORM_DURATION.observe(time.time() - transform_start_time)
+
+        REQUEST_COUNT.labels(
+            method="POST",
+            endpoint="/transform/sessions/<id>",
+            status=str(response.status_code),
+        ).inc()
+        return response
+    except Exception as exc:
+        logger.exception("Transform session delta failed")
+        REQUEST_COUNT.labels(
+            method="POST", endpoint="/transform/sessions/<id>", status="500"
+        ).inc()
+        return jsonify({"error": str(exc)}), 500
+    finally:
+        REQUEST_LATENCY.labels(
+            method="POST", endpoint="/transform/sessions/<id>"
+        ).observe(time.time() - start_time)
+
+
+@bp.route("/transform/sessions/<session_id>", methods=["DELETE"])
+def delete_transform_session(session_id: str):
+    """Remove a transformation session."""
+    start_time = time.time()
+    try:
+        logger.info("Transform session removal received")
+        response = make_response(delete_session(session_id))
+
+        REQUEST_COUNT.labels(
+            method="DELETE",
+            endpoint="/transform/sessions/<id>",
+            status=str(response.status_code),
+        ).inc()
+        return response
+    except Exception as exc:
+        logger.exception("Transform session removal failed")
+        REQUEST_COUNT.labels(
+            method="DELETE", endpoint="/transform/sessions/<id>", status="500"
+        ).inc()
+        return jsonify({"error": str(exc)}), 500
+    finally:
+        REQUEST_LATENCY.labels(
+            method="DELETE", endpoint="/transform/sessions/<id>"
+        ).observe(time.time() - start_time)
+
+
 @bp.route("/metrics", methods=["GET"])
 def metrics():
     """Expose Prometheus metrics."""
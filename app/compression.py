@@ -0,0 +1,189 @@
+"""Compression of response bodies and decompression of request bodies.
+
+Responses are compressed with gzip or deflate as accepted by the client once
+their body reaches COMPRESSION_MIN_BYTES. A streamed body is read until it
+reaches the size, then the rest is compressed while it is sent.
+
+A strong entity tag of a compressed response gets the coding as suffix.
+
+Request bodies with Content-Encoding gzip or deflate are decompressed while
+they are read. MAX_CONTENT_LENGTH limits the decompressed body, a larger body
+is rejected as soon as the exceeding bytes are decompressed.
+"""
+
+import io
+import logging
+import zlib
+from collections.abc import Iterable, Iterator
+from itertools import chain
+
+from flask import Flask, Response, current_app, request
+from werkzeug.exceptions import UnsupportedMediaType
+
+from app.transform.exceptions import InvalidContentEncoding, ModelLimitExceeded
+
+logger = logging.getLogger(__name__)
+
+# zlib window bits of the response content codings
+COMPRESS_WBITS = {"gzip": 31, "deflate": 15}
+# zlib window bits of the request content codings, detecting gzip or zlib headers
+DECOMPRESS_WBITS = {"gzip": 47, "x-gzip": 47, "deflate": 47}
+# bytes of a compressed request body read at once
+READ_SIZE = 64 * 1024
+
+# media types of compressed responses besides text
+COMPRESSIBLE_MIMETYPES = {"application/json", "application/xml"}
+
+
+class DecompressedStream(io.RawIOBase):
+    """Readable stream of the decompressed content of a compressed stream.
+
+    Each read returns at most the requested number of bytes, so a small
+    compressed body can't expand in memory at once. The decompressed content is
+    limited to max_size bytes if given.
+    """
+
+    def __init__(self, stream: io.RawIOBase, wbits: int, max_size: int | None = None):
+        """Create a stream decompressing a stream with zlib window bits."""
+        self._stream = stream
+        self._decompressor = zlib.decompressobj(wbits)
+        self._max_size = max_size
+        self._size = 0
+
+    def readable(self):
+        """Return that the stream is readable."""
+        return True
+
+    def readinto(self, buffer):
+        """Read decompressed bytes into a buffer and return their number."""
+        decompressor = self._decompressor
+        size = len(buffer)
+        try:
+            while True:
+                if decompressor.unconsumed_tail:
+                    data = decompressor.decompress(decompressor.unconsumed_tail, size)
+                elif decompressor.eof:
+                    return 0
+                else:
+                    compressed = self._stream.read(READ_SIZE)
+                    if not compressed:
+                        raise InvalidContentEncoding("the body is truncated")
+                    data = decompressor.decompress(compressed, size)
+                if data:
+                    self._check_size(len(data))
+                    buffer[: len(data)] = data
+                    return len(data)
+        except zlib.error as e:
+            raise InvalidContentEncoding(str(e))
+
+    def _check_size(self, size: int):
+        """Count decompressed bytes and raise if they exceed the maximum size."""
+        self._size += size
+        if self._max_size is not None and self._size > self._max_size:
+            raise ModelLimitExceeded("max_content_length", self._max_size)
+
+
+class RequestDecompressionMiddleware:
+    """WSGI middleware decompressing request bodies by their Content-Encoding."""
+
+    def __init__(self, wsgi_app, app: Flask):
+        """Wrap the WSGI application of an app limiting bodies by its config."""
+        self.wsgi_app = wsgi_app
+        self.app = app
+
+    def __call__(self, environ, start_response):
+        """Replace a compressed request body by its decompressed content."""
+        coding = environ.get("HTTP_CONTENT_ENCODING", "identity").strip().lower()
+        if coding != "identity":
+            if coding not in DECOMPRESS_WBITS:
+                error = UnsupportedMediaType(f"Unsupported Content-Encoding {coding}")
+                return error(environ, start_response)
+            stream = DecompressedStream(
+                environ["wsgi.input"],
+                DECOMPRESS_WBITS[coding],
+                self.app.config["MAX_CONTENT_LENGTH"],
+            )
+            environ["wsgi.input"] = io.BufferedReader(stream, READ_SIZE)
+            # the decompressed body is read up to its end
+            environ["wsgi.input_terminated"] = True
+            environ.pop("CONTENT_LENGTH", None)
+            del environ["HTTP_CONTENT_ENCODING"]
+        return self.wsgi_app(environ, start_response)
+
+
+def compress_chunks(chunks: Iterable[bytes], compressor) -> Iterator[bytes]:
+    """Return the compressed chunks of a body."""
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def is_compressible(response: Response):
+    """Return whether a response has a body, which is worth to be compressed."""
+    return (
+        request.method != "HEAD"
+        and 200 <= response.status_code < 300
+        and response.status_code not in (204, 206)
+        and "Content-Encoding" not in response.headers
+        and not response.direct_passthrough
+        and (
+            response.mimetype in COMPRESSIBLE_MIMETYPES
+            or response.mimetype.startswith("text/")
+        )
+    )
+
+
+def compress_response(response: Response):
+    """Compress a response body if the request accepts gzip or deflate."""
+    if not is_compressible(response):
+        return response
+    response.vary.add("Accept-Encoding")
+    if "Accept-Encoding" not in request.headers:
+        return response
+    coding = request.accept_encodings.best_match(list(COMPRESS_WBITS))
+    if coding is None:
+        return response
+
+    min_bytes = current_app.config["COMPRESSION_MIN_BYTES"]
+    head: list[bytes] = []
+    size = 0
+    rest = iter(())
+    if response.is_streamed:
+        # read until the body is large enough, the rest is compressed when sent
+        rest = response.iter_encoded()
+        for chunk in rest:
+            head.append(chunk)
+            size += len(chunk)
+            if size >= min_bytes:
+                break
+        else:
+            response.set_data(b"".join(head))
+    else:
+        size = response.content_length or len(response.get_data())
+    if size < min_bytes:
+        return response
+
+    compressor = zlib.compressobj(
+        current_app.config["COMPRESSION_LEVEL"], zlib.DEFLATED, COMPRESS_WBITS[coding]
+    )
+    if response.is_streamed:
+        response.response = compress_chunks(chain(head, rest), compressor)
+        response.headers.pop("Content-Length", None)
+    else:
+        response.set_data(b"".join(compress_chunks([response.get_data()], compressor)))
+    response.headers["Content-Encoding"] = coding
+    etag, weak = response.get_etag()
+    if etag is not None and not weak:
+        # the compressed body is another representation with its own strong tag
+        response.set_etag(f"{etag}-{coding}")
+    logger.debug(f"Compressed response body with {coding}")
+    return response
+
+
+def init_compression(app: Flask):
+    """Decompress request bodies and compress responses of an app if enabled."""
+    app.wsgi_app = RequestDecompressionMiddleware(app.wsgi_app, app)  # type: ignore[method-assign]
+    if app.config["COMPRESSION_ENABLED"]:
+        app.after_request(compress_response)
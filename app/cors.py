@@ -0,0 +1,36 @@
+"""Cross-origin access of browser clients to the API.
+
+flask-cors answers the preflight requests of all routes. Handlers answering a
+preflight request themselves list the same methods and headers.
+"""
+
+from flask import Flask
+from flask_cors import CORS
+
+# methods of the routes of the API
+CORS_METHODS = ["GET", "POST", "DELETE", "OPTIONS"]
+# request headers a browser may send, Content-Encoding for compressed uploads and
+# If-None-Match to revalidate a result
+CORS_ALLOW_HEADERS = [
+    "Content-Type",
+    "Content-Encoding",
+    "Authorization",
+    "If-None-Match",
+]
+# response headers a browser may read, the entity tag of a result
+CORS_EXPOSE_HEADERS = ["ETag"]
+
+
+def init_cors(app: Flask):
+    """Allow requests of any origin to all routes of the app."""
+    CORS(
+        app,
+        resources={
+            r"/*": {
+                "origins": "*",
+                "methods": CORS_METHODS,
+                "allow_headers": CORS_ALLOW_HEADERS,
+                "expose_headers": CORS_EXPOSE_HEADERS,
+            }
+        },
+    )
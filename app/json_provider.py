@@ -0,0 +1,68 @@
+"""JSON encoding of the Flask app, which uses orjson if it is installed.
+
+orjson encodes large strings several times faster than the standard library. It
+writes non-ASCII characters as UTF-8 instead of escaping them, the documents are
+otherwise equal to the ones of the default provider.
+"""
+
+import json
+
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:
+    orjson = None  # orjson is optional, the standard library encodes JSON
+
+
+# arguments of the default provider applied by orjson
+ORJSON_ARGUMENTS = {"default", "sort_keys", "ensure_ascii", "indent", "separators"}
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """JSON provider encoding with orjson, keys are sorted like by default."""
+
+    def dumps(self, obj, **kwargs):
+        """Return the JSON of an object.
+
+        orjson applies default, sort_keys and an indent of 2, it writes compact
+        separators without indent and ignores ensure_ascii. Other arguments or
+        values are encoded by the default provider.
+        """
+        indent = kwargs.get("indent")
+        separators = kwargs.get("separators")
+        if (
+            kwargs.keys() - ORJSON_ARGUMENTS
+            or indent not in (None, 2)
+            or separators is not None
+            and tuple(separators) != ((",", ": ") if indent else (",", ":"))
+        ):
+            return super().dumps(obj, **kwargs)
+        options = orjson.OPT_NON_STR_KEYS
+        if kwargs.get("sort_keys", self.sort_keys):
+            options |= orjson.OPT_SORT_KEYS
+        if indent:
+            options |= orjson.OPT_INDENT_2
+        default = kwargs.get("default", self.default)
+        return orjson.dumps(obj, default=default, option=options).decode()
+
+    def loads(self, s, **kwargs):
+        """Return the object of a JSON document."""
+        return orjson.loads(s)
+
+
+def init_json_provider(app: Flask):
+    """Use the orjson provider for the app if orjson is installed."""
+    if orjson is not None:
+        app.json = OrjsonProvider(app)
+
+
+def escape_json_string(text: str) -> bytes:
+    """Return a text as encoded content of a JSON string without the quotes.
+
+    The text is escaped like by the JSON provider of init_json_provider.
+    """
+    if orjson is not None:
+        return orjson.dumps(text)[1:-1]
+    return json.encoder.encode_basestring_ascii(text)[1:-1].encode()
@@ -7,6 +7,27 @@ REQUEST_COUNT = Counter(
     "Total HTTP requests",
     ["method", "endpoint", "status"],
 )
+RESULT_CACHE_HITS = Counter(
+    "transform_result_cache_hits_total",
+    "Transformations answered from the result cache",
+)
+RESULT_CACHE_MISSES = Counter(
+    "transform_result_cache_misses_total",
+    "Transformations not found in the result cache",
+)
+RESULT_CACHE_EVICTIONS = Counter(
+    "transform_result_cache_evictions_total",
+    "Results evicted from the result cache to stay within its size bound",
+)
+MODEL_LIMIT_HITS = Counter(
+    "transform_model_limit_hits_total",
+    "Posted models rejected for exceeding a configured limit",
+    ["limit"],
+)
+SESSION_EVICTIONS = Counter(
+    "transform_session_evictions_total",
+    "Transformation sessions evicted because they expired or the store was full",
+)
 REQUEST_LATENCY = Histogram(
     "http_request_duration_seconds",
     "HTTP request latency",
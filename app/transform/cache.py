@@ -0,0 +1,172 @@
+"""Content-addressed cache of serialized transformation results."""
+
+import hashlib
+import io
+import logging
+import threading
+from collections import OrderedDict
+from collections.abc import Iterable, Iterator
+from typing import IO
+
+from app.model_transformer.metrics import (
+    RESULT_CACHE_EVICTIONS,
+    RESULT_CACHE_HITS,
+    RESULT_CACHE_MISSES,
+)
+
+logger = logging.getLogger(__name__)
+
+# key of the cache in the extensions of the Flask app
+RESULT_CACHE_EXTENSION = "transform_result_cache"
+
+# whitespace after the root element is not part of the XML document
+TRAILING_WHITESPACE = b" \t\r\n"
+# bytes of a posted model read at once to complete its key
+READ_SIZE = 64 * 1024
+
+
+class ModelDigest:
+    """Incremental key of a posted model, which is read in parts.
+
+    The parts are normalized like the model of ResultCache.create_key, so the key
+    of the whole model is equal.
+    """
+
+    def __init__(self, direction: str):
+        """Create the digest of a model for a transformation direction."""
+        self._digest = hashlib.sha256(direction.encode())
+        self._digest.update(b"\0")
+        # whitespace, which is only hashed if more content follows
+        self._whitespace = b""
+        self._carriage_return = False
+
+    def update(self, data: bytes):
+        """Add the next part of the model."""
+        if self._carriage_return:
+            data = b"\r" + data
+        # a line ending may continue in the next part
+        self._carriage_return = data.endswith(b"\r")
+        if self._carriage_return:
+            data = data[:-1]
+        if b"\r" in data:
+            data = data.replace(b"\r\n", b"\n").replace(b"\r", b"\n")
+        end = len(data)
+        while end > 0 and data[end - 1] in TRAILING_WHITESPACE:
+            end -= 1
+        if end == 0:
+            self._whitespace += data
+            return
+        if self._whitespace:
+            self._digest.update(self._whitespace)
+        self._digest.update(memoryview(data)[:end])
+        self._whitespace = data[end:]
+
+    def hexdigest(self):
+        """Return the key of the model read so far."""
+        return self._digest.hexdigest()
+
+
+class DigestStream(io.RawIOBase):
+    """Readable stream of a posted model, which computes its key while it is read."""
+
+    def __init__(self, stream: IO[bytes], direction: str):
+        """Create a stream reading a binary stream for a transformation direction."""
+        self._stream = stream
+        self._digest = ModelDigest(direction)
+
+    def readable(self):
+        """Return that the stream is readable."""
+        return True
+
+    def readinto(self, buffer):
+        """Read bytes into a buffer and return their number."""
+        data = self._stream.read(len(buffer))
+        self._digest.update(data)
+        buffer[: len(data)] = data
+        return len(data)
+
+    def hexdigest(self):
+        """Return the key of the model, the unread rest of the stream is read first."""
+        while data := self._stream.read(READ_SIZE):
+            self._digest.update(data)
+        return self._digest.hexdigest()
+
+
+class ResultCache:
+    """LRU cache of response bodies bound by the total size of the stored bodies.
+
+    The cache is shared by the threads of a worker, all access is synchronized.
+    """
+
+    def __init__(self, max_bytes: int):
+        """Create an empty cache storing at most max_bytes of response bodies."""
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[str, bytes] = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def create_key(direction: str, model: str | bytes):
+        """Return the key of a posted model for a transformation direction.
+
+        The model is normalized like by a XML parser before hashing: line endings
+        are unified and trailing whitespace is ignored.
+        """
+        content = model.encode() if isinstance(model, str) else model
+        digest = ModelDigest(direction)
+        digest.update(content)
+        return digest.hexdigest()
+
+    def get(self, key: str):
+        """Return the cached body of a key or None and mark it as recently used."""
+        with self._lock:
+            body = self._entries.get(key)
+            if body is None:
+                RESULT_CACHE_MISSES.inc()
+                return None
+            self._entries.move_to_end(key)
+        RESULT_CACHE_HITS.inc()
+        return body
+
+    def put(self, key: str, body: bytes):
+        """Store a body and evict the least recently used bodies to fit the size."""
+        if len(body) > self.max_bytes:
+            logger.debug(f"Result with {len(body)} bytes is too large to be cached")
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._size -= len(previous)
+            self._entries[key] = body
+            self._size += len(body)
+            while self._size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= len(evicted)
+                RESULT_CACHE_EVICTIONS.inc()
+
+    def put_chunks(self, key: str, chunks: Iterable[bytes]) -> Iterator[bytes]:
+        """Return the chunks of a streamed body and store the body once complete.
+
+        The chunks are only kept as long as the body fits into the cache.
+        """
+        parts: list[bytes] | None = []
+        size = 0
+        for chunk in chunks:
+            if parts is not None:
+                size += len(chunk)
+                parts.append(chunk)
+                if size > self.max_bytes:
+                    logger.debug("Streamed result is too large to be cached")
+                    parts = None
+            yield chunk
+        if parts is not None:
+            self.put(key, b"".join(parts))
+
+    def __len__(self):
+        """Return the number of cached results."""
+        return len(self._entries)
+
+    @property
+    def size(self):
+        """Return the total size of the cached bodies in bytes."""
+        return self._size
@@ -155,6 +155,72 @@ class InvalidInputXML(KnownException):
         super().__init__(11, "Seems like the input XML content is unsupported.")
 
 
+class ModelLimitExceeded(KnownException):
+    """Exception raised for a posted model exceeding a configured limit."""
+
+    def __init__(self, limit_name: str, limit: int | None) -> None:
+        """Initialize an exception for an exceeded model limit.
+
+        Args:
+            limit_name (str): The name of the exceeded limit.
+            limit (int | None): The configured maximum.
+        """
+        self.limit_name = limit_name
+        super().__init__(12, f"The model exceeds the limit {limit_name}={limit}.")
+
+
+class UnknownSession(KnownException):
+    """Exception raised for a transformation session that doesn't exist."""
+
+    def __init__(self, session_id: str) -> None:
+        """Initialize an unknown session exception.
+
+        Args:
+            session_id (str): The ID of the requested session.
+        """
+        super().__init__(
+            13,
+            f"Session {session_id} doesn't exist or expired. "
+            "Please post the full model to create a new session.",
+        )
+
+
+class InvalidModelDelta(KnownException):
+    """Exception raised for a delta that can't be applied to a session model."""
+
+    def __init__(self, reason: str) -> None:
+        """Initialize an invalid model delta exception.
+
+        Args:
+            reason (str): Why the delta can't be applied.
+        """
+        super().__init__(15, f"Invalid model delta: {reason}.")
+
+
+class InvalidContentEncoding(KnownException):
+    """Exception raised for a compressed request body that can't be decompressed."""
+
+    def __init__(self, reason: str) -> None:
+        """Initialize an invalid content encoding exception.
+
+        Args:
+            reason (str): Why the body can't be decompressed.
+        """
+        super().__init__(16, f"The compressed request body is invalid: {reason}.")
+
+
+class InvalidModelGraph(KnownException):
+    """Exception raised for a posted JSON graph that isn't a valid model."""
+
+    def __init__(self, reason: str) -> None:
+        """Initialize an invalid model graph exception.
+
+        Args:
+            reason (str): Why the graph isn't a valid model.
+        """
+        super().__init__(17, f"Invalid model graph: {reason}.")
+
+
 class NoRequestTokensAvailable(KnownException):
     """Exception raised when there are no available Tokens for transformation request."""
 
@@ -0,0 +1,508 @@
+"""JSON graph interchange of petri nets and BPMN processes.
+
+Instead of XML a model can be posted and returned as JSON graph of its nodes and
+edges, so services generating models skip the XML parsing and serialization. The
+other fields of a node or edge (e.g. the graphics and toolspecific content of a
+petri net) are kept as their JSON values without the values of their defaults.
+The nets of pages and subprocesses are nested graphs. The diagram interchange of
+a BPMN isn't part of its graph.
+"""
+
+import logging
+from collections import defaultdict
+from collections.abc import Iterator
+from typing import IO, Any, TypeVar, get_args
+
+from pydantic import BaseModel, ValidationError
+
+from app.transform.exceptions import InvalidModelGraph, ModelLimitExceeded
+from app.transform.transformer.models.bpmn.bpmn import (
+    BPMN,
+    PROCESS_ITEM_FIELDS,
+    Collaboration,
+    Flow,
+    Lane,
+    LaneSet,
+    Process,
+)
+from app.transform.transformer.models.pnml.base import Name, ToolspecificGlobal
+from app.transform.transformer.models.pnml.pnml import (
+    Arc,
+    Net,
+    Page,
+    Place,
+    Pnml,
+    Transition,
+)
+from app.transform.transformer.utility.limits import ModelLimits
+from app.transform.transformer.utility.utility import canonical_items, create_arc_name
+
+logger = logging.getLogger(__name__)
+
+# media type of a JSON graph as request or response body
+GRAPH_MIMETYPE = "application/vnd.woped.graph+json"
+
+# node collection field of a net by node type
+NET_NODE_FIELDS = {"place": "places", "transition": "transitions"}
+NET_NODE_TYPES: dict[str, type[Place | Transition]] = {
+    "place": Place,
+    "transition": Transition,
+}
+
+# node collection field of a process by node type (the tag of the node class)
+PROCESS_NODE_FIELDS = {
+    get_args(Process.model_fields[field].annotation)[0].__xml_tag__: field
+    for field in PROCESS_ITEM_FIELDS
+    if field not in ("lane_sets", "subprocesses", "flows")
+}
+
+# fields of nodes and edges, which are part of the graph itself
+NET_NODE_EXCLUDE = {"id", "name"}
+ARC_EXCLUDE = {"id", "source", "target"}
+PROCESS_NODE_EXCLUDE = {"id", "name", "incoming", "outgoing"}
+FLOW_EXCLUDE = {"id", "name", "sourceRef", "targetRef"}
+
+
+class GraphNode(BaseModel):
+    """Node of a graph with the other fields of its model."""
+
+    id: str
+    type: str
+    name: str | None = None
+    attributes: dict[str, Any] = {}
+
+
+class GraphEdge(BaseModel):
+    """Edge (arc or flow) of a graph with the other fields of its model.
+
+    An edge without id gets the default id of the model.
+    """
+
+    id: str | None = None
+    source: str
+    target: str
+    name: str | None = None
+    attributes: dict[str, Any] = {}
+
+
+class NetGraph(BaseModel):
+    """Graph of a petri net with the nets of its pages."""
+
+    id: str | None = None
+    name: str | None = None
+    type: str | None = None
+    toolspecific: dict[str, Any] | None = None
+    nodes: list[GraphNode] = []
+    edges: list[GraphEdge] = []
+    pages: list["PageGraph"] = []
+
+
+class PageGraph(BaseModel):
+    """Page of a petri net with its net."""
+
+    id: str | None = None
+    net: NetGraph
+
+
+class PnmlGraph(BaseModel):
+    """Graph document of a PNML."""
+
+    net: NetGraph
+
+
+class LaneGraph(BaseModel):
+    """Lane with the ids of its nodes."""
+
+    id: str
+    name: str | None = None
+    nodes: list[str] = []
+
+
+class LaneSetGraph(BaseModel):
+    """Lane set of a process."""
+
+    id: str = ""
+    name: str | None = None
+    lanes: list[LaneGraph] = []
+
+
+class ProcessGraph(BaseModel):
+    """Graph of a process with its lanes and subprocesses.
+
+    Subprocesses are nodes of their parent process, which are connected by its
+    edges.
+    """
+
+    id: str
+    name: str | None = None
+    isExecutable: bool | None = False
+    nodes: list[GraphNode] = []
+    edges: list[GraphEdge] = []
+    lane_sets: list[LaneSetGraph] = []
+    subprocesses: list["ProcessGraph"] = []
+
+
+class BPMNGraph(BaseModel):
+    """Graph document of a BPMN with the collaboration of its pool."""
+
+    id: str = ""
+    process: ProcessGraph
+    collaboration: dict[str, Any] | None = None
+
+
+Graph = TypeVar("Graph", PnmlGraph, BPMNGraph)
+
+
+def model_attributes(model, exclude: set[str]) -> dict[str, Any]:
+    """Return the JSON values of the fields of a model without their defaults."""
+    return model.model_dump(
+        mode="json", by_alias=True, exclude=exclude, exclude_defaults=True
+    )
+
+
+def net_node(node: Place | Transition, type: str) -> GraphNode:
+    """Return the graph node of a place or transition.
+
+    The title of its name is the name of the node, the other fields of the name
+    are kept as attribute. A name without title is kept as attribute as well.
+    """
+    attributes = model_attributes(node, NET_NODE_EXCLUDE)
+    name = None
+    if node.name is not None:
+        name = node.name.title
+        name_attributes = model_attributes(node.name, {"title"})
+        if name_attributes or name is None:
+            attributes["name"] = name_attributes
+    return GraphNode(id=node.id or "", type=type, name=name, attributes=attributes)
+
+
+def net_graph(net: Net) -> NetGraph:
+    """Return the graph of a net and the nets of its pages in canonical order."""
+    nodes = [
+        net_node(node, type)
+        for type, field in NET_NODE_FIELDS.items()
+        for node in canonical_items(getattr(net, field))
+    ]
+    edges = [
+        GraphEdge(
+            id=arc.id,
+            source=arc.source,
+            target=arc.target,
+            attributes=model_attributes(arc, ARC_EXCLUDE),
+        )
+        for arc in canonical_items(net.arcs)
+    ]
+    toolspecific = None
+    if net.toolspecific_global is not None:
+        toolspecific = model_attributes(net.toolspecific_global, set())
+    return NetGraph(
+        id=net.id,
+        name=net.name,
+        type=net.type_field,
+        toolspecific=toolspecific,
+        nodes=nodes,
+        edges=edges,
+        pages=[
+            PageGraph(id=page.id, net=net_graph(page.net))
+            for page in canonical_items(net.pages)
+        ],
+    )
+
+
+def pnml_graph(pnml: Pnml) -> PnmlGraph:
+    """Return the graph document of a PNML."""
+    return PnmlGraph(net=net_graph(pnml.net))
+
+
+def check_node_ids(ids: list[str]):
+    """Raise if a graph has nodes with the same id."""
+    seen: set[str] = set()
+    for id in ids:
+        if id in seen:
+            raise InvalidModelGraph(f"node {id} exists twice")
+        seen.add(id)
+
+
+def check_edge(edge: GraphEdge, node_ids: set[str]):
+    """Raise if an edge connects unknown nodes and return its id."""
+    if edge.source not in node_ids or edge.target not in node_ids:
+        raise InvalidModelGraph(
+            f"edge from {edge.source} to {edge.target} connects unknown nodes"
+        )
+    return edge.id if edge.id is not None else create_arc_name(edge.source, edge.target)
+
+
+def graph_attributes(attributes: dict[str, Any], reserved: set[str]) -> dict[str, Any]:
+    """Return the attributes of a node or edge, raise if they set fields of the graph.
+
+    Fields like ids, names and the ends of edges are part of the graph itself.
+    """
+    fields = sorted(reserved & attributes.keys())
+    if fields:
+        raise InvalidModelGraph(f"attributes {fields} are part of the graph")
+    return attributes
+
+
+def net_from_graph(graph: NetGraph) -> Net:
+    """Return the net of a graph with the nets of its pages."""
+    check_node_ids([node.id for node in graph.nodes])
+    nodes: dict[str, set] = defaultdict(set)
+    for node in graph.nodes:
+        node_type = NET_NODE_TYPES.get(node.type)
+        if node_type is None:
+            raise InvalidModelGraph(
+                f"node type {node.type} unknown, use one of {list(NET_NODE_TYPES)}"
+            )
+        attributes = dict(node.attributes)
+        name = attributes.pop("name", None)
+        graph_attributes(attributes, NET_NODE_EXCLUDE)
+        if not isinstance(name, dict | None):
+            raise InvalidModelGraph(f"name attribute of node {node.id} isn't an object")
+        if name is not None or node.name is not None:
+            name = Name(**{**(name or {}), "title": node.name})
+        nodes[NET_NODE_FIELDS[node.type]].add(
+            node_type(**attributes, id=node.id, name=name)
+        )
+    node_ids = {node.id for node in graph.nodes}
+    arcs = {
+        Arc(
+            **graph_attributes(edge.attributes, ARC_EXCLUDE),
+            id=check_edge(edge, node_ids),
+            source=edge.source,
+            target=edge.target,
+        )
+        for edge in graph.edges
+    }
+    toolspecific = None
+    if graph.toolspecific is not None:
+        toolspecific = ToolspecificGlobal(**graph.toolspecific)
+    return Net(
+        id=graph.id,
+        name=graph.name,
+        type=graph.type,
+        toolspecific_global=toolspecific,
+        arcs=arcs,
+        pages={Page(id=page.id, net=net_from_graph(page.net)) for page in graph.pages},
+        **nodes,
+    )
+
+
+def pnml_from_graph(graph: PnmlGraph) -> Pnml:
+    """Return the PNML of a graph document."""
+    return Pnml(net=net_from_graph(graph.net))
+
+
+def process_graph(process: Process) -> ProcessGraph:
+    """Return the graph of a process and its subprocesses in canonical order."""
+    nodes = [
+        GraphNode(
+            id=node.id or "",
+            type=type,
+            name=node.name,
+            attributes=model_attributes(node, PROCESS_NODE_EXCLUDE),
+        )
+        for type, field in PROCESS_NODE_FIELDS.items()
+        for node in canonical_items(getattr(process, field))
+    ]
+    edges = [
+        GraphEdge(
+            id=flow.id,
+            source=flow.sourceRef,
+            target=flow.targetRef,
+            name=flow.name,
+            attributes=model_attributes(flow, FLOW_EXCLUDE),
+        )
+        for flow in canonical_items(process.flows)
+    ]
+    lane_sets = [
+        LaneSetGraph(
+            id=lane_set.id or "",
+            name=lane_set.name,
+            lanes=[
+                LaneGraph(
+                    id=lane.id or "", name=lane.name, nodes=sorted(lane.flowNodeRefs)
+                )
+                for lane in canonical_items(lane_set.lanes)
+            ],
+        )
+        for lane_set in canonical_items(process.lane_sets)
+    ]
+    return ProcessGraph(
+        id=process.id or "",
+        name=process.name,
+        isExecutable=process.isExecutable,
+        nodes=nodes,
+        edges=edges,
+        lane_sets=lane_sets,
+        subprocesses=[
+            process_graph(subprocess)
+            for subprocess in canonical_items(process.subprocesses)
+        ],
+    )
+
+
+def bpmn_graph(bpmn: BPMN) -> BPMNGraph:
+    """Return the graph document of a BPMN without its diagram interchange."""
+    collaboration = None
+    if bpmn.collaboration is not None:
+        collaboration = model_attributes(bpmn.collaboration.canonical(), set())
+    return BPMNGraph(
+        id=bpmn.id or "",
+        process=process_graph(bpmn.process),
+        collaboration=collaboration,
+    )
+
+
+def process_from_graph(
+    graph: ProcessGraph,
+    incoming: set[str] | None = None,
+    outgoing: set[str] | None = None,
+) -> Process:
+    """Return the process of a graph with its subprocesses.
+
+    The incoming and outgoing flows of the nodes are set from the edges, the
+    flows of a subprocess are the edges of its parent.
+    """
+    check_node_ids(
+        [node.id for node in graph.nodes] + [sub.id for sub in graph.subprocesses]
+    )
+    node_ids = {node.id for node in graph.nodes} | {s.id for s in graph.subprocesses}
+    node_incoming: dict[str, set[str]] = defaultdict(set)
+    node_outgoing: dict[str, set[str]] = defaultdict(set)
+    flows = set()
+    for edge in graph.edges:
+        id = check_edge(edge, node_ids)
+        flows.add(
+            Flow(
+                **graph_attributes(edge.attributes, FLOW_EXCLUDE),
+                id=id,
+                name=edge.name,
+                sourceRef=edge.source,
+                targetRef=edge.target,
+            )
+        )
+        node_outgoing[edge.source].add(id)
+        node_incoming[edge.target].add(id)
+
+    nodes: dict[str, set] = defaultdict(set)
+    for node in graph.nodes:
+        field = PROCESS_NODE_FIELDS.get(node.type)
+        if field is None:
+            raise InvalidModelGraph(
+                f"node type {node.type} unknown, use one of {list(PROCESS_NODE_FIELDS)}"
+            )
+        node_type = get_args(Process.model_fields[field].annotation)[0]
+        nodes[field].add(
+            node_type(
+                **graph_attributes(node.attributes, PROCESS_NODE_EXCLUDE),
+                id=node.id,
+                name=node.name,
+                incoming=node_incoming[node.id],
+                outgoing=node_outgoing[node.id],
+            )
+        )
+    lane_sets = {
+        LaneSet(
+            id=lane_set.id,
+            name=lane_set.name,
+            lanes={
+                Lane(id=lane.id, name=lane.name, flowNodeRefs=set(lane.nodes))
+                for lane in lane_set.lanes
+            },
+        )
+        for lane_set in graph.lane_sets
+    }
+    return Process(
+        id=graph.id,
+        name=graph.name,
+        isExecutable=graph.isExecutable,
+        incoming=incoming or set(),
+        outgoing=outgoing or set(),
+        lane_sets=lane_sets,
+        flows=flows,
+        subprocesses={
+            process_from_graph(sub, node_incoming[sub.id], node_outgoing[sub.id])
+            for sub in graph.subprocesses
+        },
+        **nodes,
+    )
+
+
+def bpmn_from_graph(graph: BPMNGraph) -> BPMN:
+    """Return the BPMN of a graph document."""
+    collaboration = None
+    if graph.collaboration is not None:
+        collaboration = Collaboration(**graph.collaboration)
+    return BPMN(
+        id=graph.id,
+        process=process_from_graph(graph.process),
+        collaboration=collaboration,
+    )
+
+
+def nested_graphs(graph: NetGraph | ProcessGraph) -> Iterator[NetGraph | ProcessGraph]:
+    """Return the graphs of the pages or subprocesses of a graph."""
+    if isinstance(graph, NetGraph):
+        return (page.net for page in graph.pages)
+    return iter(graph.subprocesses)
+
+
+def check_graph_limits(graph: NetGraph | ProcessGraph, limits: ModelLimits):
+    """Raise if a graph exceeds the model limits.
+
+    Nodes, edges and lanes count as elements, edges as connections and pages or
+    subprocesses as nested subprocesses. The depth of the JSON document is bound
+    by the depth of the subprocesses.
+    """
+    max_elements = limits.max_elements or float("inf")
+    max_subprocess_depth = limits.max_subprocess_depth or float("inf")
+    max_connections = limits.max_connections or float("inf")
+    elements = connections = 0
+    pending = [(graph, 0)]
+    while pending:
+        graph, depth = pending.pop()
+        if depth > max_subprocess_depth:
+            raise ModelLimitExceeded("max_subprocess_depth", limits.max_subprocess_depth)
+        elements += len(graph.nodes) + len(graph.edges)
+        if isinstance(graph, ProcessGraph):
+            elements += sum(len(lane_set.lanes) + 1 for lane_set in graph.lane_sets)
+        if elements > max_elements:
+            raise ModelLimitExceeded("max_elements", limits.max_elements)
+        connections += len(graph.edges)
+        if connections > max_connections:
+            raise ModelLimitExceeded("max_connections", limits.max_connections)
+        pending.extend((nested, depth + 1) for nested in nested_graphs(graph))
+
+
+def read_graph(
+    model: str | bytes | IO, graph_type: type[Graph], limits: ModelLimits | None
+) -> Graph:
+    """Return the graph document of a posted JSON model checked against the limits."""
+    content = model if isinstance(model, str | bytes) else model.read()
+    try:
+        graph = graph_type.model_validate_json(content)
+    except ValidationError as e:
+        logger.warning(f"Rejected invalid model graph: {e}")
+        raise InvalidModelGraph(f"{e.error_count()} wrong fields")
+    if limits is not None:
+        root = graph.net if isinstance(graph, PnmlGraph) else graph.process
+        check_graph_limits(root, limits)
+    return graph
+
+
+def read_pnml_graph(model: str | bytes | IO, limits: ModelLimits | None = None):
+    """Return the PNML of a posted JSON graph."""
+    graph = read_graph(model, PnmlGraph, limits)
+    try:
+        return pnml_from_graph(graph)
+    except ValidationError as e:
+        raise InvalidModelGraph(f"{e.error_count()} wrong attributes")
+
+
+def read_bpmn_graph(model: str | bytes | IO, limits: ModelLimits | None = None):
+    """Return the BPMN of a posted JSON graph."""
+    graph = read_graph(model, BPMNGraph, limits)
+    try:
+        return bpmn_from_graph(graph)
+    except ValidationError as e:
+        raise InvalidModelGraph(f"{e.error_count()} wrong attributes")
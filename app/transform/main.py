@@ -1,32 +1,70 @@
 """API to transform a given model into a selected direction."""
 
+import copy
+import functools
+import hashlib
+import io
+import itertools
 import logging
 import os
 import time
+from collections.abc import Callable, Iterable, Iterator
+from importlib import metadata
+from pathlib import Path
+from typing import IO
 
 import flask
 import requests
+from pydantic import BaseModel, ValidationError
+from werkzeug.exceptions import RequestEntityTooLarge
 
+from app.compression import COMPRESS_WBITS
+from app.cors import CORS_ALLOW_HEADERS, CORS_EXPOSE_HEADERS, CORS_METHODS
+from app.json_provider import escape_json_string
+from app.model_transformer.metrics import MODEL_LIMIT_HITS
+from app.transform.cache import RESULT_CACHE_EXTENSION, DigestStream, ResultCache
 from app.transform.exceptions import (
+    InvalidModelDelta,
     KnownException,
     MissingEnvironmentVariable,
+    ModelLimitExceeded,
     NoRequestTokensAvailable,
     PrivateInternalException,
     TokenCheckUnsuccessful,
     UnexpectedError,
     UnexpectedQueryParameter,
 )
+from app.transform.graph import (
+    GRAPH_MIMETYPE,
+    bpmn_graph,
+    pnml_graph,
+    read_bpmn_graph,
+    read_pnml_graph,
+)
+from app.transform.session import (
+    SESSION_STORE_EXTENSION,
+    ModelDelta,
+    ModelSession,
+    SessionStore,
+)
 from app.transform.transformer.models.bpmn.bpmn import BPMN
-from app.transform.transformer.models.pnml.pnml import Pnml
+from app.transform.transformer.models.bpmn.bpmn_graphics import (
+    GRAPHICS_OPTIONS,
+    GRAPHICS_PLACEHOLDER,
+)
+from app.transform.transformer.models.pnml.pnml import GRAPHICS_COMPACT, Pnml
 from app.transform.transformer.transform_bpmn_to_petrinet.transform import (
     bpmn_to_workflow_net,
 )
 from app.transform.transformer.transform_petrinet_to_bpmn.transform import pnml_to_bpmn
-from app.transform.transformer.utility.utility import clean_xml_string
-from flask import jsonify, make_response
+from app.transform.transformer.utility.limits import ModelLimits
+from flask import make_response
 
 CHECK_TOKEN_URL = "https://europe-west3-woped-422510.cloudfunctions.net/checkTokens"
 
+# Content types of a request body that is the raw model itself
+RAW_XML_MIMETYPES = {"application/xml", "text/xml"}
+
 logger = logging.getLogger(__name__)
 
 is_force_std_xml_active = os.getenv("FORCE_STD_XML")
@@ -42,32 +80,39 @@ def post_transform(request: flask.Request):
 
     Args:
         request: A request with a parameter "direction" as transformation direction
-        and a form with the xml model "bpmn" or "pnml".
+        and a form with the xml model "bpmn" or "pnml" or the xml model as raw
+        "application/xml" body or its JSON graph as GRAPH_MIMETYPE body.
     """
+    return handle_errors(process_transform_request, request)
+
+
+def process_transform_request(request: flask.Request):
+    """Check the request tokens and answer a transform or CORS preflight request."""
     start_time = time.time()
-    try:
-        if os.getenv("K_SERVICE") is not None:
-            logger.info("Checking request tokens")
-            response = requests.get(CHECK_TOKEN_URL)
-            if response.status_code == 400:
-                raise TokenCheckUnsuccessful()
-            if response.status_code == 429:
-                raise NoRequestTokensAvailable()
-
-        if request.method == "OPTIONS":
-            # Handle CORS preflight request
-            response = make_response()
-            response.headers["Access-Control-Allow-Origin"] = "*"
-            response.headers["Access-Control-Allow-Methods"] = "POST,OPTIONS"
-            response.headers[
-                "Access-Control-Allow-Headers"
-            ] = "Content-Type,Authorization"
-            return response
-
-        response = handle_transformation(request)
-        duration_ms = round((time.time() - start_time) * 1000, 2)
-        logger.info("Transformation completed", extra={"duration_ms": duration_ms})
+    check_request_tokens()
+
+    if request.method == "OPTIONS":
+        # Handle CORS preflight request
+        response = make_response()
+        response.headers["Access-Control-Allow-Origin"] = "*"
+        response.headers["Access-Control-Allow-Methods"] = ",".join(CORS_METHODS)
+        response.headers["Access-Control-Allow-Headers"] = ",".join(CORS_ALLOW_HEADERS)
         return response
+
+    response = handle_transformation(request)
+    duration_ms = round((time.time() - start_time) * 1000, 2)
+    logger.info("Transformation completed", extra={"duration_ms": duration_ms})
+    return response
+
+
+def handle_errors(handler: Callable[..., flask.Response | tuple], *args):
+    """Return the response of a handler or the description of its error."""
+    try:
+        return handler(*args)
+    except ModelLimitExceeded as e:
+        MODEL_LIMIT_HITS.labels(limit=e.limit_name).inc()
+        logger.warning(f"Rejected model exceeding the limit {e.limit_name}")
+        return str(e), 400
     except KnownException as e:
         # Exception with description for the end user.
         logger.warning("Known exception during transform", exc_info=True)
@@ -82,63 +127,503 @@ def post_transform(request: flask.Request):
         return str(UnexpectedError()), 400
 
 
-def handle_transformation(request: flask.Request):
-    """Handle the transformation."""
-    transform_direction = request.args.get("direction")
-    if transform_direction is None:
-        raise UnexpectedQueryParameter("direction")
+def check_request_tokens():
+    """Raise if the deployment has no request tokens left for a transformation."""
+    if os.getenv("K_SERVICE") is not None:
+        logger.info("Checking request tokens")
+        response = requests.get(CHECK_TOKEN_URL)
+        if response.status_code == 400:
+            raise TokenCheckUnsuccessful()
+        if response.status_code == 429:
+            raise NoRequestTokensAvailable()
+
 
-    if transform_direction == "bpmntopnml":
-        logger.info("Transform direction bpmntopnml")
-        if "bpmn" not in request.form:
-            logger.error(
-                f"Missing 'bpmn' field in form data. Received fields: {list(request.form.keys())}"
-            )
-            raise KnownException(
-                1001,
-                "Missing required form field 'bpmn'. Please send the BPMN XML "
-                "as form-data with key 'bpmn'.",
-            )
-        bpmn_xml_content = request.form["bpmn"]
+def is_raw_xml_request(request: flask.Request):
+    """Return whether the request body is the raw XML model instead of a form."""
+    return request.mimetype in RAW_XML_MIMETYPES
+
+
+def is_graph_request(request: flask.Request):
+    """Return whether the request body is the JSON graph of the model."""
+    return request.mimetype == GRAPH_MIMETYPE
+
+
+def get_parser_backend():
+    """Return the configured XML parser backend of the app."""
+    return flask.current_app.config.get("XML_PARSER_BACKEND")
+
+
+def get_model_limits():
+    """Return the configured limits of posted models."""
+    config = flask.current_app.config
+    return ModelLimits(
+        max_elements=config.get("MODEL_MAX_ELEMENTS"),
+        max_depth=config.get("MODEL_MAX_DEPTH"),
+        max_subprocess_depth=config.get("MODEL_MAX_SUBPROCESS_DEPTH"),
+        max_connections=config.get("MODEL_MAX_CONNECTIONS"),
+    )
+
+
+def get_result_cache() -> ResultCache | None:
+    """Return the result cache of the app or None if it is disabled."""
+    return flask.current_app.extensions.get(RESULT_CACHE_EXTENSION)
+
+
+def check_content_length(request: flask.Request):
+    """Raise if the request body is larger than MAX_CONTENT_LENGTH."""
+    max_length = request.max_content_length
+    if max_length is not None and (request.content_length or 0) > max_length:
+        raise ModelLimitExceeded("max_content_length", max_length)
+
+
+def read_model(request: flask.Request, field: str, error_id: int, buffered: bool):
+    """Return the posted model of a form field or of the raw body.
+
+    A raw body is returned as binary stream, so its bytes are read by the parser
+    without form decoding. If buffered the raw body is returned as bytes instead.
+    A body larger than MAX_CONTENT_LENGTH is rejected before it is read.
+    """
+    check_content_length(request)
+
+    if is_raw_xml_request(request) or is_graph_request(request):
         logger.debug(
-            f"Received BPMN XML content with length: {len(bpmn_xml_content)} characters"
+            f"Received raw {field.upper()} {request.mimetype} body with length: "
+            f"{request.content_length} bytes"
         )
+        if not buffered:
+            return request.stream
+        try:
+            return request.get_data()
+        except RequestEntityTooLarge:
+            # chunked body without content length
+            raise ModelLimitExceeded("max_content_length", request.max_content_length)
 
-        logger.debug("Starting BPMN XML parsing")
-        bpmn = BPMN.from_xml(bpmn_xml_content)
-        logger.debug(
-            f"BPMN parsed successfully - Process ID: {bpmn.process.id if bpmn.process else 'N/A'}"
+    if field not in request.form:
+        logger.error(
+            f"Missing '{field}' field in form data. "
+            f"Received fields: {list(request.form.keys())}"
+        )
+        raise KnownException(
+            error_id,
+            f"Missing required form field '{field}'. Please send the "
+            f"{field.upper()} XML as form-data with key '{field}' or as raw "
+            "'application/xml' body.",
         )
+    xml_content = request.form[field]
+    logger.debug(
+        f"Received {field.upper()} XML content with length: "
+        f"{len(xml_content)} characters"
+    )
+    return xml_content
 
-        logger.debug("Starting BPMN to workflow net transformation")
-        transformed_pnml = bpmn_to_workflow_net(bpmn)
-        logger.debug(
-            f"Transformation completed - Net contains {len(transformed_pnml.net.places)} places and {len(transformed_pnml.net.transitions)} transitions"
+
+def as_xml_stream(model: str | bytes | IO):
+    """Return a readable stream of a posted model."""
+    if isinstance(model, str):
+        return io.StringIO(model)
+    if isinstance(model, bytes):
+        return io.BytesIO(model)
+    return model
+
+
+def read_bpmn(model: str | bytes | IO):
+    """Return the BPMN of a posted model."""
+    logger.debug("Starting BPMN XML parsing")
+    # the diagram interchange isn't used by the transformation
+    bpmn = BPMN.from_stream(
+        as_xml_stream(model),
+        get_parser_backend(),
+        get_model_limits(),
+        skip_diagram=True,
+    )
+    logger.debug(
+        "BPMN parsed successfully - Process ID: "
+        f"{bpmn.process.id if bpmn.process else 'N/A'}"
+    )
+    return bpmn
+
+
+def transform_bpmn_to_pnml(
+    bpmn: BPMN, graphics: str = GRAPHICS_PLACEHOLDER, graph: bool = False
+):
+    """Return the response fields of a transformed BPMN.
+
+    The PNML is serialized while the response is sent, compact without default
+    toolspecific and graphics content for graphics=compact. If graph is set, the
+    field is the JSON graph of the PNML.
+    """
+    logger.debug("Starting BPMN to workflow net transformation")
+    transformed_pnml = bpmn_to_workflow_net(bpmn)
+    logger.debug(
+        "Transformation completed - Net contains "
+        f"{len(transformed_pnml.net.places)} places and "
+        f"{len(transformed_pnml.net.transitions)} transitions"
+    )
+    if graph:
+        return {"pnml": pnml_graph(transformed_pnml)}
+    return {"pnml": transformed_pnml.to_chunks(compact=graphics == GRAPHICS_COMPACT)}
+
+
+def read_pnml(model: str | bytes | IO):
+    """Return the PNML of a posted model."""
+    return Pnml.from_stream(
+        as_xml_stream(model), get_parser_backend(), get_model_limits()
+    )
+
+
+def transform_pnml_to_bpmn(
+    pnml: Pnml, graphics: str = GRAPHICS_PLACEHOLDER, graph: bool = False
+):
+    """Return the response fields of a transformed PNML.
+
+    The BPMN is serialized while the response is sent with placeholder or laid
+    out graphics or without diagram interchange. If graph is set, the field is
+    the JSON graph of the BPMN.
+    """
+    transformed_bpmn = pnml_to_bpmn(pnml)
+    if graph:
+        return {"bpmn": bpmn_graph(transformed_bpmn)}
+    return {"bpmn": transformed_bpmn.to_chunks(graphics=graphics)}
+
+
+def iter_json(fields: dict[str, str | Iterable[str]]) -> Iterator[bytes]:
+    """Return the JSON object of text fields as encoded chunks like jsonify.
+
+    A field is either text or chunks of text, each chunk is escaped and sent on
+    its own, so the complete text is never copied. The key of a field is sent
+    with its first chunk, so the first chunk of the object renders the first
+    field.
+    """
+    separator = "{"
+    for key in sorted(fields):
+        value = fields[key]
+        chunks = iter([value] if isinstance(value, str) else value)
+        yield (
+            f'{separator}"'.encode()
+            + escape_json_string(key)
+            + b'":"'
+            + escape_json_string(next(chunks, ""))
         )
+        for chunk in chunks:
+            yield escape_json_string(chunk)
+        yield b'"'
+        separator = ","
+    yield b"}\n"
 
-        logger.debug("Generating PNML XML string")
-        pnml_string = transformed_pnml.to_string()
-        logger.debug(f"PNML XML generated with length: {len(pnml_string)} characters")
 
-        response = jsonify({"pnml": clean_xml_string(pnml_string)})
-        response.headers["Access-Control-Allow-Origin"] = "*"
-        return response
-    elif transform_direction == "pnmltobpmn":
-        logger.info("Transform direction pnmltobpmn")
-        if "pnml" not in request.form:
-            logger.error(
-                f"Missing 'pnml' field in form data. Received fields: {list(request.form.keys())}"
-            )
-            raise KnownException(
-                1002,
-                "Missing required form field 'pnml'. Please send the PNML XML "
-                "as form-data with key 'pnml'.",
-            )
-        pnml_xml_content = request.form["pnml"]
-        pnml = Pnml.from_xml_str(pnml_xml_content)
-        transformed_bpmn = pnml_to_bpmn(pnml)
-        response = jsonify({"bpmn": clean_xml_string(transformed_bpmn.to_string())})
-        response.headers["Access-Control-Allow-Origin"] = "*"
-        return response
-    else:
+def iter_xml(fields: dict[str, str | Iterable[str]]) -> Iterator[bytes]:
+    """Return the model of transformation result fields as encoded chunks."""
+    (value,) = fields.values()
+    for chunk in [value] if isinstance(value, str) else value:
+        yield chunk.encode()
+
+
+def iter_graph(fields: dict[str, BaseModel]) -> Iterator[bytes]:
+    """Return the JSON graph of a transformation result without default values."""
+    (value,) = fields.values()
+    yield value.model_dump_json(exclude_defaults=True).encode()
+
+
+# media types of the response body, the raw XML model or its JSON graph is sent on
+# request
+JSON_MIMETYPE = "application/json"
+XML_MIMETYPES = ("application/xml", "text/xml")
+
+# sources and packages of the serialized results, the entity tags change with them
+RESULT_SOURCES = (Path(__file__).parent, Path(__file__).parents[1] / "json_provider.py")
+RESULT_PACKAGES = ("pydantic", "pydantic-xml", "orjson")
+
+
+def result_version(
+    sources: Iterable[Path] = RESULT_SOURCES,
+    packages: Iterable[str] = RESULT_PACKAGES,
+):
+    """Return the version of the serialized results, which is part of their tags.
+
+    The version is the digest of the modules transforming and serializing the
+    models and of the versions of the packages they use. It changes with each
+    release that may return other results, so clients don't keep outdated results
+    and a worker of another release doesn't confirm them.
+    """
+    digest = hashlib.sha256()
+    for source in sources:
+        paths = sorted(source.rglob("*.py")) if source.is_dir() else [source]
+        for path in paths:
+            digest.update(path.relative_to(source.parent).as_posix().encode())
+            digest.update(b"\0")
+            digest.update(path.read_bytes())
+    for package in packages:
+        try:
+            version = metadata.version(package)
+        except metadata.PackageNotFoundError:
+            version = ""
+        digest.update(f"{package}=={version}\0".encode())
+    return digest.hexdigest()[:16]
+
+
+RESULT_VERSION = result_version()
+
+# form field, error id of a missing field, reader and transformation of each
+# direction
+TRANSFORMATIONS: dict[str, tuple[str, int, Callable, Callable]] = {
+    "bpmntopnml": ("bpmn", 1001, read_bpmn, transform_bpmn_to_pnml),
+    "pnmltobpmn": ("pnml", 1002, read_pnml, transform_pnml_to_bpmn),
+}
+
+# reader of a posted JSON graph of each direction
+GRAPH_READERS: dict[str, Callable] = {
+    "bpmntopnml": read_bpmn_graph,
+    "pnmltobpmn": read_pnml_graph,
+}
+
+# graphics options of the directions
+DIRECTION_GRAPHICS = {
+    "pnmltobpmn": GRAPHICS_OPTIONS,
+    "bpmntopnml": (GRAPHICS_PLACEHOLDER, GRAPHICS_COMPACT),
+}
+
+
+def get_graphics(request: flask.Request, direction: str):
+    """Return the graphics option of a request.
+
+    Clients doing their own layout skip the BPMN graphics with graphics=none,
+    graphics=layout returns a BPMN with a server-side layout. graphics=compact
+    returns a PNML without default toolspecific and graphics content.
+    """
+    graphics = request.args.get("graphics", GRAPHICS_PLACEHOLDER)
+    if graphics not in DIRECTION_GRAPHICS.get(direction, (GRAPHICS_PLACEHOLDER,)):
+        raise UnexpectedQueryParameter("graphics")
+    return graphics
+
+
+def get_transform(direction: str, graphics: str) -> Callable:
+    """Return the transformation of a direction with a graphics option."""
+    _, _, _, transform = TRANSFORMATIONS[direction]
+    if graphics == GRAPHICS_PLACEHOLDER:
+        return transform
+    return functools.partial(transform, graphics=graphics)
+
+
+def get_transformation(request: flask.Request):
+    """Return the form field, error id, reader and transformation of a request.
+
+    The graphics option of the request is returned last. A JSON graph body is
+    read by the graph reader of the direction.
+    """
+    transform_direction = request.args.get("direction")
+    if transform_direction not in TRANSFORMATIONS:
         raise UnexpectedQueryParameter("direction")
+    logger.info(f"Transform direction {transform_direction}")
+    field, error_id, read, _ = TRANSFORMATIONS[transform_direction]
+    if is_graph_request(request):
+        read = functools.partial(
+            GRAPH_READERS[transform_direction], limits=get_model_limits()
+        )
+    graphics = get_graphics(request, transform_direction)
+    transform = get_transform(transform_direction, graphics)
+    return transform_direction, field, error_id, read, transform, graphics
+
+
+def accepted_mimetype(request: flask.Request):
+    """Return the media type of the response body a request prefers.
+
+    The JSON object is preferred to the raw XML model and both to the JSON graph,
+    so a wildcard doesn't select the JSON graph.
+    """
+    return request.accept_mimetypes.best_match(
+        [JSON_MIMETYPE, *XML_MIMETYPES, GRAPH_MIMETYPE], JSON_MIMETYPE
+    )
+
+
+def entity_tag(key: str):
+    """Return the strong entity tag of the result of a model by its key.
+
+    The results are serialized canonically, so the result of a key is always
+    the same body.
+    """
+    return f"{key}-{RESULT_VERSION}"
+
+
+def matching_entity_tag(request: flask.Request, etag: str):
+    """Return the tag of If-None-Match matching an entity tag or None.
+
+    The tags of the compressed bodies of the entity match as well.
+    """
+    for tag in [etag, *(f"{etag}-{coding}" for coding in COMPRESS_WBITS)]:
+        if request.if_none_match.contains_weak(tag):
+            return tag
+    return None
+
+
+def handle_transformation(request: flask.Request):
+    """Handle the transformation.
+
+    If the result cache is enabled, the response of an already transformed model
+    is returned from the cache instead of transforming the model again. The
+    transformed model is streamed as JSON body, as raw XML body for requests
+    accepting application/xml or as JSON graph for requests accepting
+    GRAPH_MIMETYPE. The JSON graph has no graphics options.
+
+    The response has the entity tag of the result. A request with a matching
+    If-None-Match tag is answered with 304 without the result. The key of a
+    streamed body is computed while it is parsed.
+    """
+    transform_direction, field, error_id, read, transform, graphics = get_transformation(
+        request
+    )
+    mimetype = accepted_mimetype(request)
+    if mimetype in XML_MIMETYPES:
+        render, mimetype = iter_xml, XML_MIMETYPES[0]
+    elif mimetype == GRAPH_MIMETYPE:
+        if graphics != GRAPHICS_PLACEHOLDER:
+            raise UnexpectedQueryParameter("graphics")
+        render, transform = iter_graph, functools.partial(transform, graph=True)
+    else:
+        render = iter_json
+
+    variant = transform_direction
+    if graphics != GRAPHICS_PLACEHOLDER:
+        variant = f"{variant}:{graphics}"
+    if render is iter_xml:
+        variant = f"{variant}:xml"
+    elif render is iter_graph:
+        variant = f"{variant}:graph"
+
+    cache = get_result_cache()
+    model = read_model(request, field, error_id, buffered=cache is not None)
+    if isinstance(model, str | bytes):
+        key = ResultCache.create_key(variant, model)
+        parsed = None
+    else:
+        stream = DigestStream(model, variant)
+        parsed = read(stream)
+        key = stream.hexdigest()
+
+    etag = entity_tag(key)
+    matched = matching_entity_tag(request, etag)
+    if matched is not None:
+        logger.debug("Returning not modified transformation result")
+        return model_response(b"", mimetype, matched, status=304)
+
+    body = cache.get(key) if cache is not None else None
+    if body is not None:
+        logger.debug("Returning cached transformation result")
+        return model_response(body, mimetype, etag)
+    chunks = render(transform(parsed if parsed is not None else read(model)))
+    if cache is not None:
+        chunks = cache.put_chunks(key, chunks)
+    return model_response(started(chunks), mimetype, etag)
+
+
+def started(chunks: Iterable[bytes]) -> Iterator[bytes]:
+    """Return the chunks of a body with its first chunk already rendered.
+
+    The body is sent after its status, so an error while rendering would end the
+    response early. An error rendering the first chunk, which serializes the
+    start of the model, is raised before the response is returned instead.
+    """
+    chunks = iter(chunks)
+    first = next(chunks, None)
+    if first is None:
+        return iter(())
+    return itertools.chain([first], chunks)
+
+
+def model_response(
+    body: bytes | Iterable[bytes], mimetype: str, etag: str, status: int = 200
+):
+    """Return a response of a transformed model, which varies by the Accept header.
+
+    Browsers of any origin may read its entity tag.
+    """
+    response = flask.current_app.response_class(body, status=status, mimetype=mimetype)
+    response.headers["Access-Control-Allow-Origin"] = "*"
+    # flask-cors leaves responses alone, which allow an origin already
+    response.headers["Access-Control-Expose-Headers"] = ",".join(CORS_EXPOSE_HEADERS)
+    response.vary.add("Accept")
+    response.set_etag(etag)
+    return response
+
+
+def get_session_store() -> SessionStore:
+    """Return the transformation session store of the app."""
+    return flask.current_app.extensions[SESSION_STORE_EXTENSION]
+
+
+def json_response(body: bytes | Iterable[bytes], status: int = 200):
+    """Return a response of a JSON body, which is accessible by any origin."""
+    response = flask.current_app.response_class(
+        body, status=status, mimetype=JSON_MIMETYPE
+    )
+    response.headers["Access-Control-Allow-Origin"] = "*"
+    return response
+
+
+def post_session(request: flask.Request):
+    """Create a session of a posted model and return its transformation.
+
+    The request is like a transform request. The response holds the id of the
+    session besides the transformed model.
+    """
+    return handle_errors(create_session, request)
+
+
+def create_session(request: flask.Request):
+    """Read the model of a request, transform it and keep it in a new session."""
+    check_request_tokens()
+    direction, field, error_id, read, transform, graphics = get_transformation(request)
+    content = read_model(request, field, error_id, buffered=True)
+    model = read(content)
+    session = ModelSession(direction, model, None, graphics, len(content))
+    with session.lock:
+        session.body = render_session_result(session, transform, copy.deepcopy(model))
+        get_session_store().add(session)
+    logger.info(f"Created transformation session {session.id}")
+    return json_response(session.body, 201)
+
+
+def post_session_delta(request: flask.Request, session_id: str):
+    """Apply a JSON delta to the model of a session and return its transformation."""
+    return handle_errors(apply_session_delta, request, session_id)
+
+
+def apply_session_delta(request: flask.Request, session_id: str):
+    """Apply the delta of a request to a session model and transform it again."""
+    check_request_tokens()
+    check_content_length(request)
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict):
+        raise InvalidModelDelta("the body must be a JSON object")
+    try:
+        delta = ModelDelta.model_validate(data)
+    except ValidationError as e:
+        raise InvalidModelDelta(f"{e.error_count()} wrong fields")
+
+    session = get_session_store().get(session_id)
+    transform = get_transform(session.direction, session.graphics)
+    with session.lock:
+        body = session.apply(
+            delta, lambda model: render_session_result(session, transform, model)
+        )
+    logger.info(f"Applied delta to transformation session {session.id}")
+    return json_response(body)
+
+
+def delete_session(session_id: str):
+    """Remove a session."""
+    return handle_errors(remove_session, session_id)
+
+
+def remove_session(session_id: str):
+    """Remove a session and return an empty response."""
+    get_session_store().remove(session_id)
+    response = make_response("", 204)
+    response.headers["Access-Control-Allow-Origin"] = "*"
+    return response
+
+
+def render_session_result(
+    session: ModelSession, transform: Callable, model: BPMN | Pnml
+):
+    """Return the JSON body of a transformed session model with the session id."""
+    return b"".join(iter_json({"session": session.id, **transform(model)}))
@@ -0,0 +1,342 @@
+"""Sessions to transform an edited model again after small changes (deltas).
+
+A session keeps the parsed model of a client. Instead of posting the full model
+after every edit, the client posts the added, removed or changed nodes and edges,
+which are applied to the kept model before it is transformed again. A delta saves
+reading and parsing the model, the whole edited model is transformed again.
+
+Sessions are kept in memory of the worker process that created them. With several
+workers or instances the requests of a session must be routed to the same worker
+(sticky routing), another worker answers them with UnknownSession.
+"""
+
+import copy
+import logging
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from collections.abc import Callable
+
+from pydantic import BaseModel
+
+from app.model_transformer.metrics import SESSION_EVICTIONS
+from app.transform.exceptions import (
+    InvalidModelDelta,
+    ModelLimitExceeded,
+    UnknownSession,
+)
+from app.transform.transformer.models.bpmn.base import GenericBPMNNode
+from app.transform.transformer.models.bpmn.bpmn import (
+    BPMN,
+    AndGateway,
+    EndEvent,
+    EventGateway,
+    ServiceTask,
+    StartEvent,
+    Task,
+    UserTask,
+    XorGateway,
+)
+from app.transform.transformer.models.bpmn.bpmn_graphics import GRAPHICS_PLACEHOLDER
+from app.transform.transformer.models.pnml.base import Name
+from app.transform.transformer.models.pnml.pnml import Place, Pnml, Transition
+from app.transform.transformer.utility.utility import create_arc_name
+
+logger = logging.getLogger(__name__)
+
+# key of the session store in the extensions of the Flask app
+SESSION_STORE_EXTENSION = "transform_session_store"
+
+# node types of a delta by their BPMN tag
+BPMN_NODE_TYPES: dict[str, type[GenericBPMNNode]] = {
+    "startEvent": StartEvent,
+    "endEvent": EndEvent,
+    "task": Task,
+    "userTask": UserTask,
+    "serviceTask": ServiceTask,
+    "exclusiveGateway": XorGateway,
+    "parallelGateway": AndGateway,
+    "eventBasedGateway": EventGateway,
+}
+
+# node types of a delta by their PNML tag
+PNML_NODE_TYPES: dict[str, type[Place | Transition]] = {
+    "place": Place,
+    "transition": Transition,
+}
+
+
+class DeltaNode(BaseModel):
+    """Node of a delta, the type is only required to add a node."""
+
+    id: str
+    type: str | None = None
+    name: str | None = None
+
+
+class DeltaEdge(BaseModel):
+    """Edge (flow or arc) of a delta."""
+
+    id: str | None = None
+    source: str
+    target: str
+
+
+class ModelDelta(BaseModel):
+    """Changes of the top level process or net of a model.
+
+    The changes are applied in the order: removed edges, removed nodes (with their
+    edges), changed node names, added nodes and added edges.
+    """
+
+    remove_edges: list[str] = []
+    remove_nodes: list[str] = []
+    change_nodes: list[DeltaNode] = []
+    add_nodes: list[DeltaNode] = []
+    add_edges: list[DeltaEdge] = []
+
+    def is_empty(self):
+        """Return whether the delta doesn't change anything."""
+        return not (
+            self.remove_edges
+            or self.remove_nodes
+            or self.change_nodes
+            or self.add_nodes
+            or self.add_edges
+        )
+
+
+def check_delta(
+    delta: ModelDelta,
+    node_ids: set[str],
+    edge_ids: set[str],
+    node_types: dict[str, type],
+):
+    """Raise if a delta can't be applied to a model with the nodes and edges.
+
+    The delta is checked completely before it is applied, so a rejected delta
+    doesn't change the model. Added edges without id get the default id of the
+    model.
+    """
+    node_ids, edge_ids = set(node_ids), set(edge_ids)
+    for edge_id in delta.remove_edges:
+        if edge_id not in edge_ids:
+            raise InvalidModelDelta(f"edge {edge_id} doesn't exist")
+        edge_ids.remove(edge_id)
+    for node_id in delta.remove_nodes:
+        if node_id not in node_ids:
+            raise InvalidModelDelta(f"node {node_id} doesn't exist")
+        node_ids.remove(node_id)
+    for node in delta.change_nodes:
+        if node.id not in node_ids:
+            raise InvalidModelDelta(f"node {node.id} doesn't exist")
+    for node in delta.add_nodes:
+        if node.id in node_ids:
+            raise InvalidModelDelta(f"node {node.id} already exists")
+        if node.type not in node_types:
+            raise InvalidModelDelta(
+                f"node type {node.type} unknown, use one of {list(node_types)}"
+            )
+        node_ids.add(node.id)
+    for edge in delta.add_edges:
+        if edge.source not in node_ids or edge.target not in node_ids:
+            raise InvalidModelDelta(
+                f"edge from {edge.source} to {edge.target} connects unknown nodes"
+            )
+        if edge.id is None:
+            edge.id = create_arc_name(edge.source, edge.target)
+        if edge.id in edge_ids:
+            raise InvalidModelDelta(f"edge {edge.id} already exists")
+        edge_ids.add(edge.id)
+
+
+def apply_bpmn_delta(bpmn: BPMN, delta: ModelDelta):
+    """Apply a checked delta to the process of a BPMN."""
+    process = bpmn.process
+    graph = process._graph
+    check_delta(delta, set(graph.node_ids()), set(graph.edges), BPMN_NODE_TYPES)
+
+    for flow_id in delta.remove_edges:
+        process.remove_flow(process.get_flow(flow_id))
+    for node_id in delta.remove_nodes:
+        node = process.get_node(node_id)
+        for flow in [
+            *process.get_incoming(node_id),
+            *process.get_outgoing(node_id),
+        ]:
+            process.remove_flow(flow)
+        process.remove_node(node)
+    for changed in delta.change_nodes:
+        process.get_node(changed.id).name = changed.name
+    for added in delta.add_nodes:
+        node_type = BPMN_NODE_TYPES[added.type]  # type: ignore[index]
+        process.add_node(node_type(id=added.id, name=added.name))
+    for edge in delta.add_edges:
+        process.add_flow(
+            process.get_node(edge.source), process.get_node(edge.target), id=edge.id
+        )
+
+
+def apply_pnml_delta(pnml: Pnml, delta: ModelDelta):
+    """Apply a checked delta to the net of a PNML."""
+    net = pnml.net
+    arcs = {arc.id: arc for arc in net.arcs}
+    node_ids = set(net._graph.node_ids())
+    check_delta(delta, node_ids, set(arcs), PNML_NODE_TYPES)
+    # types of the nodes after the delta, an arc connects a place and a transition
+    node_types = {id: net._graph.kind(id) for id in node_ids}
+    for node_id in delta.remove_nodes:
+        node_types.pop(node_id)
+    for added in delta.add_nodes:
+        node_types[added.id] = PNML_NODE_TYPES[added.type]  # type: ignore[index]
+    for edge in delta.add_edges:
+        if {node_types[edge.source], node_types[edge.target]} != {Place, Transition}:
+            raise InvalidModelDelta(
+                f"arc from {edge.source} to {edge.target} doesn't connect a place "
+                "and a transition"
+            )
+
+    for arc_id in delta.remove_edges:
+        net.remove_arc(arcs[arc_id])
+    for node_id in delta.remove_nodes:
+        net.remove_element_with_connecting_arcs(net.get_element(node_id))
+    for changed in delta.change_nodes:
+        node = net.get_element(changed.id)
+        node.name = Name(title=changed.name) if changed.name is not None else None
+    for added in delta.add_nodes:
+        node_type = PNML_NODE_TYPES[added.type]  # type: ignore[index]
+        net.add_element(node_type.create(id=added.id, name=added.name))
+    for edge in delta.add_edges:
+        net.add_arc_from_id(edge.source, edge.target, edge.id)
+
+
+class ModelSession:
+    """Parsed model of a client with the response of its last transformation."""
+
+    def __init__(
+        self,
+        direction: str,
+        model: BPMN | Pnml,
+        body: bytes | None,
+        graphics: str = GRAPHICS_PLACEHOLDER,
+        source_size: int = 0,
+    ):
+        """Create a session of a parsed model and its transformation.
+
+        The source size is the size of the posted model in bytes.
+        """
+        self.id = uuid.uuid4().hex
+        self.direction = direction
+        self.graphics = graphics
+        self.model = model
+        self.body = body
+        self.source_size = source_size
+        self.last_access = time.monotonic()
+        # a session is changed by one request at a time
+        self.lock = threading.Lock()
+
+    def apply(
+        self,
+        delta: ModelDelta,
+        transform: Callable[[BPMN | Pnml], bytes],
+    ):
+        """Apply a delta and return the response of the transformed model.
+
+        The kept model is never transformed itself, because the transformation
+        changes its input. Without changes the last response is returned.
+        """
+        if delta.is_empty() and self.body is not None:
+            return self.body
+        if isinstance(self.model, BPMN):
+            apply_bpmn_delta(self.model, delta)
+        else:
+            apply_pnml_delta(self.model, delta)
+        # an edited model stays in the session even if it can't be transformed
+        self.body = None
+        self.body = transform(copy.deepcopy(self.model))
+        return self.body
+
+    @property
+    def size(self):
+        """Return the size of the posted model and the last response in bytes.
+
+        The parsed model takes a multiple of the size of its XML, so this is a
+        measure of the memory of the session rather than the memory itself.
+        """
+        return self.source_size + len(self.body or b"")
+
+
+class SessionStore:
+    """Sessions bound by their number, size and idle time, least recently used first.
+
+    The size of the sessions (see ModelSession.size) changes with their deltas, so
+    it is checked whenever the store is accessed.
+    """
+
+    def __init__(
+        self, max_sessions: int, ttl_seconds: float, max_bytes: int | None = None
+    ):
+        """Create an empty store of at most max_sessions sessions of max_bytes."""
+        self.max_sessions = max_sessions
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self._sessions: OrderedDict[str, ModelSession] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _evict(self, now: float):
+        """Remove expired sessions and the oldest sessions above the bounds."""
+        size = self.size
+        max_bytes = self.max_bytes if self.max_bytes is not None else float("inf")
+        while self._sessions:
+            session = next(iter(self._sessions.values()))
+            is_expired = now - session.last_access > self.ttl_seconds
+            if (
+                not is_expired
+                and len(self._sessions) <= self.max_sessions
+                and size <= max_bytes
+            ):
+                return
+            self._sessions.popitem(last=False)
+            size -= session.size
+            SESSION_EVICTIONS.inc()
+            logger.debug(f"Evicted transformation session {session.id}")
+
+    def add(self, session: ModelSession):
+        """Add a session and evict sessions to stay within the bounds.
+
+        A session larger than the size bound is rejected.
+        """
+        if self.max_bytes is not None and session.size > self.max_bytes:
+            raise ModelLimitExceeded("max_session_bytes", self.max_bytes)
+        with self._lock:
+            self._sessions[session.id] = session
+            self._evict(time.monotonic())
+        return session
+
+    def get(self, id: str):
+        """Return a session and mark it as recently used."""
+        with self._lock:
+            now = time.monotonic()
+            self._evict(now)
+            session = self._sessions.get(id)
+            if session is None:
+                raise UnknownSession(id)
+            session.last_access = now
+            self._sessions.move_to_end(id)
+        return session
+
+    def remove(self, id: str):
+        """Remove a session."""
+        with self._lock:
+            if self._sessions.pop(id, None) is None:
+                raise UnknownSession(id)
+
+    def __len__(self):
+        """Return the number of sessions."""
+        return len(self._sessions)
+
+    @property
+    def size(self):
+        """Return the total size of the sessions in bytes."""
+        return sum(session.size for session in self._sessions.values())
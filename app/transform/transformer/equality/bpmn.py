@@ -4,13 +4,13 @@ import logging
 
 from app.transform.exceptions import PrivateInternalException
 from app.transform.transformer.equality.utils import create_type_dict, to_comp_string
-from app.transform.transformer.models.bpmn.base import GenericBPMNNode
+from app.transform.transformer.models.bpmn.base import GenericBPMNNode, LinkingNode
 from app.transform.transformer.models.bpmn.bpmn import BPMN, Flow, LaneSet, Process
 
 logger = logging.getLogger(__name__)
 
 
-def bpmn_element_to_comp_value(e: GenericBPMNNode | Flow):
+def bpmn_element_to_comp_value(e: GenericBPMNNode | LinkingNode | Flow):
     """Returns a concatenation of a by in/source and out/target comparable BPMN node."""
     if isinstance(e, LaneSet):
         return to_comp_string(
@@ -19,7 +19,7 @@ def bpmn_element_to_comp_value(e: GenericBPMNNode | Flow):
                 for lane in sorted(e.lanes, key=lambda x: x.id)
             ]
         )
-    elif isinstance(e, GenericBPMNNode):
+    elif isinstance(e, GenericBPMNNode | LinkingNode):
         return to_comp_string(e.id, e.name, sorted(e.outgoing), sorted(e.incoming))
     elif isinstance(e, Flow):
         return to_comp_string(e.name, e.sourceRef, e.targetRef)
@@ -30,7 +30,7 @@ def bpmn_element_to_comp_value(e: GenericBPMNNode | Flow):
 def bpmn_type_map(bpmn: Process):
     """Returns a by type grouped dictionary of the bpmn elements."""
     return create_type_dict(
-        [*bpmn._flatten_node_typ_map(), *bpmn.flows, *bpmn.lane_sets],
+        [*bpmn.get_nodes(), *bpmn.flows, *bpmn.lane_sets],
         bpmn_element_to_comp_value,
     )
 
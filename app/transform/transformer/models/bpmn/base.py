@@ -1,8 +1,10 @@
 """BPMN objects and extensions."""
 
+from typing import TYPE_CHECKING
+
 from pydantic_xml import attr, element
 
-from app.transform.transformer.utility.utility import BaseBPMNModel
+from app.transform.transformer.utility.utility import BaseBPMNModel, HelperNode
 
 ns_map = {
     "xsi": "http://www.w3.org/2001/XMLSchema-instance",
@@ -17,12 +19,14 @@ class BPMNNamespace(BaseBPMNModel, ns="bpmn", nsmap=ns_map):  # type: ignore[cal
     """Extension of BaseBPMNModel with namespace bpmn and namespace map."""
 
 
-class GenericBPMNNode(BPMNNamespace):
-    """BPMN extension of BPMNNamespace with name, incoming and outgoing attribute."""
+class FlowEnds:
+    """Degrees of a node by the ids of its incoming and outgoing flows."""
 
-    name: str | None = attr(default=None)
-    incoming: set[str] = element("incoming", default_factory=set)
-    outgoing: set[str] = element("outgoing", default_factory=set)
+    __slots__ = ()
+
+    if TYPE_CHECKING:
+        incoming: set[str]
+        outgoing: set[str]
 
     def get_in_degree(self):
         """Returns incoming degree of this instance."""
@@ -33,5 +37,30 @@ class GenericBPMNNode(BPMNNamespace):
         return len(self.outgoing)
 
 
+class GenericBPMNNode(BPMNNamespace, FlowEnds):
+    """BPMN extension of BPMNNamespace with name, incoming and outgoing attribute."""
+
+    name: str | None = attr(default=None)
+    incoming: set[str] = element("incoming", default_factory=set)
+    outgoing: set[str] = element("outgoing", default_factory=set)
+
+
+class LinkingNode(HelperNode, FlowEnds):
+    """Node linking adjacent BPMN elements, which is transformed to a place.
+
+    Linking nodes are only added to processes before their transformation, so they
+    are helper nodes instead of models.
+    """
+
+    __slots__ = ("name", "incoming", "outgoing")
+
+    def __init__(self, id: str):
+        """Create a linking node without flows."""
+        super().__init__(id)
+        self.name: str | None = None
+        self.incoming: set[str] = set()
+        self.outgoing: set[str] = set()
+
+
 class Gateway(GenericBPMNNode):
     """Gateway extension of BPMN node."""
@@ -1,12 +1,16 @@
 """BPMN objects and handling."""
 
+import io
 import logging
+from collections.abc import Iterator
 from pathlib import Path
-from typing import cast
+from typing import IO, TypeVar, cast
+from xml.etree.ElementTree import Element
 
 from app.transform.exceptions import (
     InternalTransformationException,
     InvalidInputXML,
+    ModelLimitExceeded,
     NotSupportedBPMNElement,
     PrivateInternalException,
 )
@@ -14,23 +18,46 @@ from app.transform.transformer.models.bpmn.base import (
     BPMNNamespace,
     Gateway,
     GenericBPMNNode,
+    LinkingNode,
+    ns_map,
 )
 from app.transform.transformer.models.bpmn.bpmn_graphics import (
     BPMNDiagram,
-    BPMNEdge,
-    BPMNLabel,
+    GRAPHICS_LAYOUT,
+    GRAPHICS_NONE,
+    GRAPHICS_PLACEHOLDER,
+    ORIGIN_WAYPOINTS,
     BPMNPlane,
-    BPMNShape,
-    DCBounds,
-    DIWaypoint,
+    DiagramEdge,
+    DiagramShape,
+    diagram_element,
+    diagram_model,
+)
+from app.transform.transformer.utility.graph_index import GraphIndex, NodeView
+from app.transform.transformer.utility.layout import layered_layout
+from app.transform.transformer.utility.limits import ModelLimits, limit_events
+from app.transform.transformer.utility.utility import (
+    canonical_key,
+    create_arc_name,
+    get_tag_name,
+)
+from app.transform.transformer.utility.xml_parser import iterparse
+from app.transform.transformer.utility.xml_writer import (
+    CHUNK_SIZE,
+    XML_HEADER,
+    XMLChunkWriter,
+    write_items,
+    writes_chunks,
 )
-from app.transform.transformer.utility.utility import create_arc_name, get_tag_name
-from defusedxml.ElementTree import fromstring
 from pydantic import PrivateAttr
 from pydantic_xml import attr, element
 
 logger = logging.getLogger(__name__)
 
+# linking nodes are part of processes before their transformation
+ProcessNode = GenericBPMNNode | LinkingNode
+AnyNode = TypeVar("AnyNode", bound=ProcessNode)
+
 supported_elements = {
     "eventbasedGateway",
     "exclusiveGateway",
@@ -75,6 +102,119 @@ ignored_elements = {
 
 supported_tags = {e.lower() for e in {*supported_elements, *ignored_elements}}
 
+# namespaced tag of the diagram interchange (DI) of a BPMN
+DIAGRAM_TAG = f"{{{ns_map['bpmndi']}}}BPMNDiagram"
+PROCESS_TAG = f"{{{ns_map['bpmn']}}}process"
+PLANE_TAG = f"{{{ns_map['bpmndi']}}}BPMNPlane"
+# namespaces of the diagram interchange
+DI_NAMESPACES = (ns_map["bpmndi"], ns_map["dc"], ns_map["di"])
+
+# collection fields of a process, which are serialized item by item
+PROCESS_ITEM_FIELDS = (
+    "lane_sets",
+    "start_events",
+    "end_events",
+    "intermediatecatch_events",
+    "tasks",
+    "user_tasks",
+    "service_tasks",
+    "xor_gws",
+    "or_gws",
+    "and_gws",
+    "event_gws",
+    "subprocesses",
+    "flows",
+)
+
+# size of the shapes, the space around the diagram and of the pool and lane title
+EVENT_SIZE = (36.0, 36.0)
+GATEWAY_SIZE = (50.0, 50.0)
+ACTIVITY_SIZE = (100.0, 80.0)
+LABEL_WIDTH = 50.0
+LABEL_HEIGHT = 20.0
+PLACEHOLDER_LABEL = (0.0, 0.0, LABEL_WIDTH, LABEL_HEIGHT)
+DIAGRAM_MARGIN = 50.0
+HEADER_WIDTH = 30.0
+LAYOUT_PADDING = 30.0
+
+
+def parse_supported_bpmn_tree(
+    source: IO,
+    parser_backend: str | None = None,
+    limits: ModelLimits | None = None,
+    skip_diagram: bool = False,
+):
+    """Parse a BPMN XML source and check the used tags while the tree is built.
+
+    The supported tags and the single pool restriction are checked on the start
+    events of the parser, so the element tree is only walked once (by pydantic_xml)
+    after parsing. Tag names are normalized once per distinct namespaced tag.
+    The model limits are checked on the parse events as well.
+
+    If skip_diagram is set, the diagram interchange subtrees are dropped while they
+    are parsed, so they are never kept in the tree nor deserialized. Their tags are
+    still checked.
+    """
+    tag_names: dict[str, str] = {}
+    amount_of_participants = 0
+    with_end_events = limits is not None or skip_diagram
+    events = limit_events(
+        iterparse(
+            source,
+            events=("start", "end") if with_end_events else ("start",),
+            backend=parser_backend,
+        ),
+        limits,
+        subprocess_tag="subProcess",
+        connection_tag="sequenceFlow",
+    )
+    depth = 0
+    root = None
+    # open elements of a skipped diagram with the root element first
+    skipped_path: list = []
+    for event, elem in events:
+        if event == "end":
+            depth -= 1
+            if skipped_path:
+                skipped_path.pop()
+                parent = skipped_path[-1]
+                if parent is root:
+                    root.remove(elem)
+                    skipped_path.clear()
+                else:
+                    # one child per closed child, the parser may already have
+                    # added later siblings, which are dropped instead
+                    del parent[-1]
+            continue
+
+        depth += 1
+        if depth == 1:
+            root = elem
+        elif skipped_path:
+            skipped_path.append(elem)
+        elif skip_diagram and depth == 2 and elem.tag == DIAGRAM_TAG:
+            skipped_path.extend((root, elem))
+        tag_name = tag_names.get(elem.tag)
+        if tag_name is None:
+            tag_name = tag_names[elem.tag] = get_tag_name(elem)
+        if tag_name == "participant":
+            amount_of_participants += 1
+
+    used_tags = set(tag_names.values())
+    unhandled_tags = used_tags.difference(supported_tags)
+    logger.debug(
+        f"Found {len(used_tags)} unique BPMN tags, {amount_of_participants} participants"
+    )
+    if amount_of_participants > 1:
+        raise NotSupportedBPMNElement(
+            "participant is only supported when there is exactly one pool in "
+            "the BPMN model. Your BPMN is not compliant with this restriction."
+        )
+    if len(unhandled_tags) > 0:
+        logger.warning(f"BPMN contains unsupported tags: {unhandled_tags}")
+        raise NotSupportedBPMNElement(str(unhandled_tags))
+    return events.root
+
 
 # Gateways
 class EventGateway(Gateway, tag="eventBasedGateway"):  # type: ignore[call-arg]
@@ -220,14 +360,12 @@ class Process(GenericBPMNNode):
     flows: set[Flow] = element(default_factory=set)
 
     # internal helper structures
-    _type_map: dict[type[GenericBPMNNode], set[GenericBPMNNode]] = PrivateAttr(
+    _type_map: dict[type[ProcessNode], set[ProcessNode]] = PrivateAttr(
         default_factory=dict
     )
 
-    _temp_node_id_to_incoming: dict[str, set[Flow]] = PrivateAttr(default_factory=dict)
-    _temp_node_id_to_outgoing: dict[str, set[Flow]] = PrivateAttr(default_factory=dict)
-    _temp_nodes: dict[str, GenericBPMNNode] = PrivateAttr(default_factory=dict)
-    _temp_flows: dict[str, Flow] = PrivateAttr(default_factory=dict)
+    # nodes by id with the flows connecting them, flows by id
+    _graph: GraphIndex[ProcessNode, Flow] = PrivateAttr(default_factory=GraphIndex)
 
     # Holds the name of the ID of the usertask and participant (lane name)
     # Also holds the IDs of the usertasks within subprocesses
@@ -244,7 +382,7 @@ class Process(GenericBPMNNode):
     def _init_reference_structures(self):
         """Instance initializer."""
         self._type_map = cast(
-            dict[type[GenericBPMNNode], set[GenericBPMNNode]],
+            dict[type[ProcessNode], set[ProcessNode]],
             {
                 Task: self.tasks,
                 UserTask: self.user_tasks,
@@ -257,98 +395,78 @@ class Process(GenericBPMNNode):
                 EventGateway: self.event_gws,
                 Process: self.subprocesses,
                 IntermediateCatchEvent: self.intermediatecatch_events,
-                GenericBPMNNode: set(),
+                LinkingNode: set(),
             },
         )
-        self._temp_node_id_to_incoming: dict[str, set[Flow]] = {}
-        self._temp_node_id_to_outgoing: dict[str, set[Flow]] = {}
-        self._temp_nodes: dict[str, GenericBPMNNode] = {}
-        self._temp_flows: dict[str, Flow] = {}
-
-        for node in self._flatten_node_typ_map():
-            self._temp_nodes[node.id] = node
+        graph = self._graph = GraphIndex()
+        for node in self.get_nodes():
+            graph.add_node(node.id, node)
 
         for flow in self.flows:
-            self._temp_flows[flow.id] = flow
-            self._update_flow_incoming_outgoing(flow)
+            graph.add_edge(flow.id, flow, flow.sourceRef, flow.targetRef)
+
+    def get_nodes(
+        self,
+        kind: type[AnyNode] | tuple[type[AnyNode], ...] = (
+            GenericBPMNNode,
+            LinkingNode,
+        ),
+    ) -> NodeView[AnyNode]:
+        """Return a live view of the nodes of kinds, all nodes by default."""
+        return NodeView(self._type_map, kind)
 
     def _flatten_node_typ_map(self):
         """Flatten nodes."""
-        r: list[GenericBPMNNode] = []
-        [r.extend(x) for x in self._type_map.values()]
-        return r
-
-    def _update_flow_incoming_outgoing(self, flow: Flow):
-        """Update source / target reference of instance."""
-        if flow.targetRef not in self._temp_node_id_to_incoming:
-            self._temp_node_id_to_incoming[flow.targetRef] = set([flow])
-        else:
-            self._temp_node_id_to_incoming[flow.targetRef].add(flow)
-
-        if flow.sourceRef not in self._temp_node_id_to_outgoing:
-            self._temp_node_id_to_outgoing[flow.sourceRef] = set([flow])
-        else:
-            self._temp_node_id_to_outgoing[flow.sourceRef].add(flow)
+        return list(self.get_nodes())
 
     def _update_actual_incoming_outgoing(self, flow: Flow):
         """Update underlying source / target of instance."""
         self.flows.add(flow)
-        source = self._temp_nodes[flow.sourceRef]
-        target = self._temp_nodes[flow.targetRef]
-        source.outgoing.add(flow.id)
-        target.incoming.add(flow.id)
+        graph = self._graph
+        graph.node(flow.sourceRef).outgoing.add(flow.id)
+        graph.node(flow.targetRef).incoming.add(flow.id)
 
     def get_incoming(self, id: str):
         """Return the incoming flows of a element by id."""
-        return self._temp_node_id_to_incoming[id]
+        return self._graph.incoming(id)
 
     def get_outgoing(self, id: str):
         """Return the outgoing flows of a element by id."""
-        return self._temp_node_id_to_outgoing[id]
+        return self._graph.outgoing(id)
 
     def get_node(self, id: str):
         """Return a node by id."""
-        return self._temp_nodes[id]
+        return self._graph.node(id)
 
     def is_node_existing(self, id: str):
         """Returns whether node with a id is existing in process."""
-        return id in self._temp_nodes
-
-    def change_node_id(self, node: GenericBPMNNode, new_id: str):
-        """Change node id and update connected flows."""
-        incoming_flows: set[Flow] = self._temp_node_id_to_incoming.get(node.id, set())
-        incoming_flows_id_map: list[tuple[str, str, str, str | None]] = [
-            (f.id, f.sourceRef, new_id, f.name) for f in incoming_flows
-        ]
-
-        outgoing_flows: set[Flow] = self._temp_node_id_to_outgoing.get(node.id, set())
-        outgoing_flows_id_map: list[tuple[str, str, str, str | None]] = [
-            (f.id, new_id, f.targetRef, f.name) for f in outgoing_flows
-        ]
-
-        for f in [*incoming_flows, *outgoing_flows]:
-            self.remove_flow(f)
-        self.remove_node(node)
-
-        new_node = node.model_copy(deep=True)
-        new_node.id = new_id
-
-        self.add_node(new_node)
-        for id, source_id, target_id, name in [
-            *outgoing_flows_id_map,
-            *incoming_flows_id_map,
-        ]:
-            self.add_flow(
-                source=self._temp_nodes[source_id],
-                target=self._temp_nodes[target_id],
-                id=id,
-                name=name,
-            )
+        return id in self._graph
+
+    def change_node_id(self, node: ProcessNode, new_id: str):
+        """Change node id in place and update the refs of the connected flows."""
+        if new_id == node.id:
+            return
+        graph = self._graph
+        if new_id in graph:
+            raise InternalTransformationException(f"node {new_id} already exists")
+        # the hash of a node depends on its id
+        storage_set = self._type_map[type(node)]
+        storage_set.remove(node)
+        incoming, outgoing = graph.remove_node(node.id)
+        node.id = new_id
+        storage_set.add(node)
+        graph.add_node(new_id, node)
+        for flow in incoming:
+            flow.targetRef = new_id
+            graph.move_edge(flow.id, flow.sourceRef, new_id)
+        for flow in outgoing:
+            flow.sourceRef = new_id
+            graph.move_edge(flow.id, new_id, flow.targetRef)
 
     def add_flow(
         self,
-        source: GenericBPMNNode,
-        target: GenericBPMNNode,
+        source: ProcessNode,
+        target: ProcessNode,
         id: str | None = None,
         name: str | None = None,
     ):
@@ -356,7 +474,8 @@ class Process(GenericBPMNNode):
         if id is None:
             id = create_arc_name(source.id, target.id)
 
-        if id in self._temp_flows:
+        graph = self._graph
+        if id in graph.edges:
             raise InternalTransformationException(
                 f"flow with the id {id} already exists!"
             )
@@ -365,16 +484,15 @@ class Process(GenericBPMNNode):
         self.add_node(target)
 
         a = Flow(id=id, sourceRef=source.id, targetRef=target.id, name=name)
-        self._temp_flows[id] = a
-        self._update_flow_incoming_outgoing(a)
+        graph.add_edge(id, a, a.sourceRef, a.targetRef)
         self._update_actual_incoming_outgoing(a)
         return a
 
     def add_constructed_flow(self, flow: Flow):
         """Add a finished flow to instance."""
         self.add_flow(
-            self._temp_nodes[flow.sourceRef],
-            self._temp_nodes[flow.targetRef],
+            self._graph.node(flow.sourceRef),
+            self._graph.node(flow.targetRef),
             flow.id,
             flow.name,
         )
@@ -383,25 +501,21 @@ class Process(GenericBPMNNode):
         """Remove underlying flow of instance."""
         self.flows.remove(flow)
 
-        source = self._temp_nodes[flow.sourceRef]
-        target = self._temp_nodes[flow.targetRef]
-        source.outgoing.remove(flow.id)
-        target.incoming.remove(flow.id)
+        graph = self._graph
+        graph.node(flow.sourceRef).outgoing.remove(flow.id)
+        graph.node(flow.targetRef).incoming.remove(flow.id)
 
     def remove_flow(self, flow: Flow):
         """Remove flow reference of instance."""
-        self._temp_flows.pop(flow.id)
-        self._temp_node_id_to_incoming[flow.targetRef].remove(flow)
-        self._temp_node_id_to_outgoing[flow.sourceRef].remove(flow)
-
+        self._graph.remove_edge(flow.id)
         self._remove_actual_flow(flow)
 
-    def add_nodes(self, *args: GenericBPMNNode):
+    def add_nodes(self, *args: ProcessNode):
         """Add multiple nodes to the BPMN."""
         for node in args:
             self.add_node(node)
 
-    def add_node(self, new_node: GenericBPMNNode):
+    def add_node(self, new_node: ProcessNode):
         """Add single node to the BPMN."""
         storage_set = self._type_map[type(new_node)]
         if storage_set is None:
@@ -412,11 +526,11 @@ class Process(GenericBPMNNode):
 
         storage_set.add(new_node)
 
-        self._temp_nodes[new_node.id] = new_node
+        self._graph.add_node(new_node.id, new_node)
 
         return new_node
 
-    def remove_node(self, to_remove_node: GenericBPMNNode):
+    def remove_node(self, to_remove_node: ProcessNode):
         """Remove single node frome the BPMN."""
         storage_set = self._type_map[type(to_remove_node)]
         if storage_set is None:
@@ -427,43 +541,68 @@ class Process(GenericBPMNNode):
 
         storage_set.remove(to_remove_node)
 
-        self._temp_nodes.pop(to_remove_node.id)
-
-        if to_remove_node.id in self._temp_node_id_to_incoming:
-            incoming = self._temp_node_id_to_incoming.pop(to_remove_node.id)
-            for arc in incoming:
-                arc.targetRef = ""
-        if to_remove_node.id in self._temp_node_id_to_outgoing:
-            outgoing = self._temp_node_id_to_outgoing.pop(to_remove_node.id)
-            for arc in outgoing:
-                arc.sourceRef = ""
+        graph = self._graph
+        incoming, outgoing = graph.remove_node(to_remove_node.id)
+        for arc in incoming:
+            arc.targetRef = ""
+            graph.move_edge(arc.id, arc.sourceRef, "")
+        for arc in outgoing:
+            arc.sourceRef = ""
+            graph.move_edge(arc.id, "", arc.targetRef)
 
     def get_flow_target_by_id(self, flow_id: str):
         """Return target nodes from flow id."""
-        return self._temp_nodes[self._temp_flows[flow_id].targetRef]
+        graph = self._graph
+        return graph.node(graph.edges[flow_id][0].targetRef)
 
     def get_flow_source_by_id(self, flow_id: str):
         """Return source nodes from flow id."""
-        return self._temp_nodes[self._temp_flows[flow_id].sourceRef]
+        graph = self._graph
+        return graph.node(graph.edges[flow_id][0].sourceRef)
 
     def get_flow(self, id: str):
         """Return flow by id."""
-        return self._temp_flows[id]
+        return self._graph.edges[id][0]
+
+    def is_flow_existing(self, id: str):
+        """Returns whether flow with a id is existing in process."""
+        return id in self._graph.edges
 
-    def remove_node_with_connecting_flows(self, node: GenericBPMNNode):
+    def get_flow_between(self, source_id: str, target_id: str):
+        """Return the flow from a source to a target id or None."""
+        return self._graph.edge_between(source_id, target_id)
+
+    def remove_node_with_connecting_flows(self, node: ProcessNode):
         """Remove node and its connected flows."""
         if node.get_in_degree() > 0:
-            incoming_arc = list(self._temp_node_id_to_incoming[node.id])[0]
+            incoming_arc = next(iter(self._graph.incoming(node.id)))
             source_id = incoming_arc.sourceRef
             self.remove_flow(incoming_arc)
         if node.get_out_degree() > 0:
-            outgoing_arc = list(self._temp_node_id_to_outgoing[node.id])[0]
+            outgoing_arc = next(iter(self._graph.outgoing(node.id)))
             target_id = outgoing_arc.targetRef
             self.remove_flow(outgoing_arc)
         self.remove_node(node)
         return source_id, target_id
 
 
+# size of the shapes by node type, other nodes are activities
+SHAPE_SIZES: dict[type[GenericBPMNNode], tuple[float, float]] = {
+    StartEvent: EVENT_SIZE,
+    EndEvent: EVENT_SIZE,
+    IntermediateCatchEvent: EVENT_SIZE,
+    XorGateway: GATEWAY_SIZE,
+    OrGateway: GATEWAY_SIZE,
+    AndGateway: GATEWAY_SIZE,
+    EventGateway: GATEWAY_SIZE,
+}
+
+
+def has_label(node: GenericBPMNNode):
+    """Return whether the shape of a node has its name as external label."""
+    return bool(node.name) and not isinstance(node, Process | Task)
+
+
 class BPMN(BPMNNamespace, tag="definitions"):  # type: ignore[call-arg]
     """Extension of BPMNNamespace with attributes process and diagram."""
 
@@ -472,29 +611,37 @@ class BPMN(BPMNNamespace, tag="definitions"):  # type: ignore[call-arg]
     diagram: BPMNDiagram | None = element(default=None)
 
     @staticmethod
-    def from_xml(xml_content: str):
+    def from_xml(
+        xml_content: str,
+        parser_backend: str | None = None,
+        limits: ModelLimits | None = None,
+        skip_diagram: bool = False,
+    ):
         """Return a BPMN from a XML string."""
         logger.debug("Parsing BPMN from XML string")
+        return BPMN.from_stream(
+            io.StringIO(xml_content), parser_backend, limits, skip_diagram
+        )
+
+    @staticmethod
+    def from_stream(
+        stream: IO,
+        parser_backend: str | None = None,
+        limits: ModelLimits | None = None,
+        skip_diagram: bool = False,
+    ):
+        """Return a BPMN from a readable text or binary XML stream.
+
+        Binary streams (e.g. a request body) are passed to the parser as they are,
+        the parser detects the encoding from the XML declaration. A model exceeding
+        the limits is rejected before the BPMN objects are created.
+        If skip_diagram is set, the returned BPMN has no diagram, the diagram
+        interchange isn't read into objects.
+        """
         try:
-            tree = fromstring(xml_content)
-            used_tags: set[str] = set()
-            amount_of_participants = 0
-            for elem in tree.iter():
-                if get_tag_name(elem) == "participant":
-                    amount_of_participants += 1
-                used_tags.add(get_tag_name(elem))
-            unhandled_tags = used_tags.difference(supported_tags)
-            logger.debug(
-                f"Found {len(used_tags)} unique BPMN tags, {amount_of_participants} participants"
+            tree = parse_supported_bpmn_tree(
+                stream, parser_backend, limits, skip_diagram
             )
-            if amount_of_participants > 1:
-                raise NotSupportedBPMNElement(
-                    "participant is only supported when there is exactly one pool in "
-                    "the BPMN model. Your BPMN is not compliant with this restriction."
-                )
-            if len(unhandled_tags) > 0:
-                logger.warning(f"BPMN contains unsupported tags: {unhandled_tags}")
-                raise NotSupportedBPMNElement(str(unhandled_tags))
             bpmn = BPMN.from_xml_tree(tree)
             logger.debug(
                 f"Successfully parsed BPMN with process ID: {bpmn.process.id if bpmn.process else 'N/A'}"
@@ -503,6 +650,9 @@ class BPMN(BPMNNamespace, tag="definitions"):  # type: ignore[call-arg]
         except NotSupportedBPMNElement as e:
             logger.error(f"BPMN contains unsupported elements: {e}")
             raise e
+        except ModelLimitExceeded as e:
+            logger.warning(f"BPMN exceeds the model limits: {e.limit_name}")
+            raise e
         except Exception as e:
             logger.error(f"Failed to parse BPMN XML: {e}", exc_info=True)
             raise InvalidInputXML()
@@ -523,64 +673,194 @@ class BPMN(BPMNNamespace, tag="definitions"):  # type: ignore[call-arg]
         """Transform this instance into a string and creates placeholder graphics."""
         try:
             self.set_graphics()
-            return cast(str, self.to_xml(encoding="unicode"))
+            return cast(str, self.canonical().to_xml(encoding="unicode"))
         except Exception:
             raise PrivateInternalException("Can't convert bpmn to string.")
 
+    def to_chunks(
+        self, chunk_size: int = CHUNK_SIZE, graphics: str = GRAPHICS_PLACEHOLDER
+    ) -> Iterator[str]:
+        """Return the XML with header and graphics as chunks of text.
+
+        The nodes and flows of the process are serialized one by one in their
+        canonical order while the chunks are consumed. The graphics (placeholder,
+        layout or none) are written as XML elements without building their models.
+        """
+        self._normalize_lane_ids()
+        process = self.process
+        process_shell = process.model_copy(
+            update={f: set() for f in PROCESS_ITEM_FIELDS}
+        )
+        try:
+            shell = self.model_copy(update={"process": process_shell, "diagram": None})
+            root = shell.canonical().to_xml_tree()
+        except Exception:
+            raise PrivateInternalException("Can't convert bpmn to string.")
+        if not writes_chunks(root):
+            try:
+                if graphics == GRAPHICS_NONE:
+                    shell = shell.model_copy(update={"process": process})
+                    xml = shell.canonical().to_xml(encoding="unicode")
+                else:
+                    self.set_graphics(layout=graphics == GRAPHICS_LAYOUT)
+                    xml = self.canonical().to_xml(encoding="unicode")
+            except Exception:
+                raise PrivateInternalException("Can't convert bpmn to string.")
+            return iter([XML_HEADER + cast(str, xml)])
+
+        def write():
+            writer = XMLChunkWriter(chunk_size)
+            writer.write(XML_HEADER)
+            namespaces = DI_NAMESPACES if graphics != GRAPHICS_NONE else ()
+            writer.start(root, namespaces=namespaces)
+            for child in root:
+                if child.tag != PROCESS_TAG:
+                    writer.element(child)
+                    continue
+                writer.start(child)
+                for process_child in child:
+                    writer.element(process_child)
+                yield from write_items(
+                    writer, process_shell, process, PROCESS_ITEM_FIELDS
+                )
+                writer.end()
+            if graphics != GRAPHICS_NONE:
+                plane_id, plane_element = self._diagram_plane()
+                writer.start(Element(DIAGRAM_TAG, {"id": "diagram1"}))
+                writer.start(
+                    Element(PLANE_TAG, {"id": plane_id, "bpmnElement": plane_element})
+                )
+                for diagram in self._diagram_elements(graphics == GRAPHICS_LAYOUT):
+                    writer.element(diagram_element(diagram))
+                    yield from writer.chunks()
+                writer.end()
+                writer.end()
+            writer.end()
+            yield from writer.chunks(final=True)
+
+        return write()
+
     def write_to_file(self, path: str):
         """Save this instance xml encoded to a file."""
         content = self.to_string()
         Path(path).write_text(content)
 
-    def set_graphics(self):
-        """Define graphical representation of this instance."""
-        d = BPMNDiagram(id="diagram1")
+    def _diagram_plane(self):
+        """Return the id and the referenced element of the diagram plane."""
         bpmn = self.process
         plane_id = bpmn.id
         if self.collaboration:
             plane_id = self.collaboration.id
-        p = BPMNPlane(id=f"plane{bpmn.id}", bpmnElement=plane_id)
-
+        return f"plane{bpmn.id}", plane_id
+
+    def _normalize_lane_ids(self):
+        """Remove spaces from lane ids, which are referenced by the graphics."""
+        for lane_set in self.process.lane_sets:
+            for lane in lane_set.lanes:
+                lane.id = lane.id.replace(" ", "")
+
+    def _diagram_elements(
+        self, layout: bool = False
+    ) -> Iterator[DiagramShape | DiagramEdge]:
+        """Return the shapes and edges of the graphics at the origin or laid out.
+
+        The elements of each kind are returned in their canonical order.
+        """
+        if layout:
+            yield from self._layout()
+            return
+        bpmn = self.process
         if self.collaboration and self.collaboration.participant:
-            p.eles.append(
-                BPMNShape(
-                    id="Participant_id",
-                    bpmnElement=self.collaboration.participant.id,
-                    bounds=DCBounds(width=600, height=500),
-                )
+            yield DiagramShape(
+                "Participant_id", self.collaboration.participant.id, (0, 0, 600, 500)
             )
-        if bpmn.lane_sets:
-            for lane_set in bpmn.lane_sets:
-                for lane in lane_set.lanes:
-                    lane.id = lane.id.replace(" ", "")
-                    p.eles.append(
-                        BPMNShape(
-                            id=f"{lane.id}_di",
-                            bpmnElement=lane.id,
-                            bounds=DCBounds(width=600, height=200),
-                        )
-                    )
-
-        for flow in bpmn.flows:
-            p.eles.append(
-                BPMNEdge(
-                    id=f"{flow.id}_di",
-                    bpmnElement=flow.id,
-                    waypoints=[DIWaypoint(), DIWaypoint()],
-                )
+        for lane_set in sorted(bpmn.lane_sets, key=canonical_key):
+            for lane in sorted(lane_set.lanes, key=canonical_key):
+                yield DiagramShape(f"{lane.id}_di", lane.id, (0, 0, 600, 200))
+
+        for flow in sorted(bpmn.flows, key=canonical_key):
+            yield DiagramEdge(f"{flow.id}_di", flow.id)
+
+        for node in sorted(bpmn.get_nodes(), key=canonical_key):
+            yield DiagramShape(
+                f"{node.id}_di",
+                node.id,
+                (0, 0, 100, 80),
+                is_expanded=True if isinstance(node, Process) else None,
+                label=PLACEHOLDER_LABEL if has_label(node) else None,
             )
 
-        for node in bpmn._flatten_node_typ_map():
-            s = BPMNShape(
-                id=f"{node.id}_di",
-                bpmnElement=node.id,
-                bounds=DCBounds(width=100, height=80),
+    def _layout(self) -> Iterator[DiagramShape | DiagramEdge]:
+        """Return the shapes and edges of a layered layout from left to right.
+
+        Nodes and flows are sorted by id, so a model always gets the same layout.
+        Each lane is a horizontal band of the pool.
+        """
+        bpmn = self.process
+        nodes = sorted(bpmn.get_nodes(), key=lambda n: n.id)
+        flows = sorted(bpmn.flows, key=lambda f: f.id)
+        lanes = sorted(
+            (lane for lane_set in bpmn.lane_sets for lane in lane_set.lanes),
+            key=lambda lane: lane.id,
+        )
+        sizes = {node.id: SHAPE_SIZES.get(type(node), ACTIVITY_SIZE) for node in nodes}
+        groups = {ref: i for i, lane in enumerate(lanes) for ref in lane.flowNodeRefs}
+        # nodes outside of all lanes are placed below the lanes
+        group_count = len(lanes) + (not lanes or any(n not in groups for n in sizes))
+        if lanes:
+            groups = {id: groups.get(id, len(lanes)) for id in sizes}
+
+        participant = self.collaboration and self.collaboration.participant
+        # the pool and lanes have their title on the left
+        lane_x = DIAGRAM_MARGIN + (HEADER_WIDTH if participant else 0)
+        x0 = lane_x + (HEADER_WIDTH if lanes else 0) + LAYOUT_PADDING
+        laid_out = [f for f in flows if f.sourceRef in sizes and f.targetRef in sizes]
+        layout = layered_layout(
+            sizes,
+            [(f.sourceRef, f.targetRef) for f in laid_out],
+            groups,
+            group_count,
+            origin=(x0, DIAGRAM_MARGIN),
+        )
+        right = x0 + layout.width + LAYOUT_PADDING
+        if participant:
+            yield DiagramShape(
+                "Participant_id",
+                participant.id,
+                (DIAGRAM_MARGIN, DIAGRAM_MARGIN, right - DIAGRAM_MARGIN, layout.height),
+            )
+        for lane, (top, bottom) in zip(lanes, layout.bands):
+            yield DiagramShape(
+                f"{lane.id}_di", lane.id, (lane_x, top, right - lane_x, bottom - top)
+            )
+
+        routes = dict(zip((f.id for f in laid_out), layout.routes))
+        for flow in flows:
+            waypoints = routes.get(flow.id, ORIGIN_WAYPOINTS)
+            yield DiagramEdge(f"{flow.id}_di", flow.id, waypoints)
+
+        for node in nodes:
+            x, y = layout.positions[node.id]
+            width, height = sizes[node.id]
+            label = None
+            if has_label(node):
+                label_x = x + width / 2 - LABEL_WIDTH / 2
+                label = (label_x, y + height + 5, LABEL_WIDTH, LABEL_HEIGHT)
+            yield DiagramShape(
+                f"{node.id}_di",
+                node.id,
+                (x, y, width, height),
+                is_expanded=True if type(node) is Process else None,
+                label=label,
             )
-            if isinstance(node, Process):
-                s.isExpanded = True
-            if node.name and not isinstance(node, Process | Task):
-                s.label = BPMNLabel(bounds=DCBounds(width=50, height=20))
-            p.eles.append(s)
-
-        d.plane = p
-        self.diagram = d
+
+    def set_graphics(self, layout: bool = False):
+        """Define graphical representation of this instance.
+
+        The shapes are placed at the origin unless they are laid out.
+        """
+        self._normalize_lane_ids()
+        plane_id, plane_element = self._diagram_plane()
+        p = BPMNPlane(id=plane_id, bpmnElement=plane_element)
+        p.eles = [diagram_model(x) for x in self._diagram_elements(layout)]
+        self.diagram = BPMNDiagram(id="diagram1", plane=p)
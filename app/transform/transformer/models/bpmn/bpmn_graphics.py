@@ -1,5 +1,9 @@
 """BPMNDI based objects."""
 
+from collections.abc import Sequence
+from typing import NamedTuple
+from xml.etree.ElementTree import Element, SubElement
+
 from pydantic_xml import attr, element
 
 from app.transform.transformer.models.bpmn.base import ns_map
@@ -64,3 +68,98 @@ class BPMNDiagram(BPMNDINamespace, tag="BPMNDiagram"):  # type: ignore[call-arg]
     """BPMNDiagram extension of BPMNDINamespace with plane as attribute."""
 
     plane: BPMNPlane | None = element(default=None)
+
+
+# namespaced tags of the diagram interchange
+SHAPE_TAG = f"{{{ns_map['bpmndi']}}}BPMNShape"
+EDGE_TAG = f"{{{ns_map['bpmndi']}}}BPMNEdge"
+LABEL_TAG = f"{{{ns_map['bpmndi']}}}BPMNLabel"
+BOUNDS_TAG = f"{{{ns_map['dc']}}}Bounds"
+WAYPOINT_TAG = f"{{{ns_map['di']}}}waypoint"
+
+# graphics of a BPMN: shapes at the origin, laid out shapes or no graphics
+GRAPHICS_PLACEHOLDER = "placeholder"
+GRAPHICS_LAYOUT = "layout"
+GRAPHICS_NONE = "none"
+GRAPHICS_OPTIONS = (GRAPHICS_PLACEHOLDER, GRAPHICS_LAYOUT, GRAPHICS_NONE)
+
+Bounds = tuple[float, float, float, float]
+ORIGIN_WAYPOINTS = ((0.0, 0.0), (0.0, 0.0))
+
+
+class DiagramShape(NamedTuple):
+    """Shape of a node with bounds (x, y, width, height) and label bounds."""
+
+    id: str
+    bpmn_element: str
+    bounds: Bounds
+    is_expanded: bool | None = None
+    label: Bounds | None = None
+
+
+class DiagramEdge(NamedTuple):
+    """Edge of a flow with its waypoints, both at the origin by default."""
+
+    id: str
+    bpmn_element: str
+    waypoints: Sequence[tuple[float, float]] = ORIGIN_WAYPOINTS
+
+
+def bounds_model(bounds: Bounds):
+    """Return the DCBounds of bounds (x, y, width, height)."""
+    x, y, width, height = bounds
+    return DCBounds(x=x, y=y, width=width, height=height)
+
+
+def diagram_model(diagram: DiagramShape | DiagramEdge):
+    """Return the BPMNDI object of a shape or edge."""
+    if isinstance(diagram, DiagramEdge):
+        return BPMNEdge(
+            id=diagram.id,
+            bpmnElement=diagram.bpmn_element,
+            waypoints=[DIWaypoint(x=x, y=y) for x, y in diagram.waypoints],
+        )
+    shape = BPMNShape(
+        id=diagram.id,
+        bpmnElement=diagram.bpmn_element,
+        bounds=bounds_model(diagram.bounds),
+    )
+    if diagram.is_expanded is not None:
+        shape.isExpanded = diagram.is_expanded
+    if diagram.label is not None:
+        shape.label = BPMNLabel(bounds=bounds_model(diagram.label))
+    return shape
+
+
+def bounds_element(bounds: Bounds):
+    """Return the XML element of bounds (x, y, width, height)."""
+    x, y, width, height = (str(float(v)) for v in bounds)
+    return Element(
+        BOUNDS_TAG, {"id": "", "x": x, "y": y, "width": width, "height": height}
+    )
+
+
+def diagram_element(diagram: DiagramShape | DiagramEdge):
+    """Return the XML element of a shape or edge.
+
+    The element equals the serialized diagram_model without building it.
+    """
+    attrib = {
+        "id": diagram.id,
+        "bpmnElement": diagram.bpmn_element,
+    }
+    if isinstance(diagram, DiagramEdge):
+        edge = Element(EDGE_TAG, attrib)
+        for x, y in diagram.waypoints:
+            SubElement(
+                edge, WAYPOINT_TAG, {"id": "", "x": str(float(x)), "y": str(float(y))}
+            )
+        return edge
+    if diagram.is_expanded is not None:
+        attrib["isExpanded"] = str(diagram.is_expanded).lower()
+    shape = Element(SHAPE_TAG, attrib)
+    if diagram.label is not None:
+        label = SubElement(shape, LABEL_TAG, {"id": ""})
+        label.append(bounds_element(diagram.label))
+    shape.append(bounds_element(diagram.bounds))
+    return shape
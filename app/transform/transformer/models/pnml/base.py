@@ -1,8 +1,12 @@
 """BaseModels for BPMN-XML-Mappings."""
 
+from typing import TYPE_CHECKING
+
 from pydantic_xml import attr, element
 
 from app.transform.transformer.models.pnml.graphics import (
+    DEFAULT_OFFSET_GRAPHICS,
+    DEFAULT_POSITION_GRAPHICS,
     Coordinates,
     OffsetGraphics,
     PositionGraphics,
@@ -14,13 +18,18 @@ from app.transform.transformer.models.pnml.workflow import (
     TriggerType,
     WorkflowBranchingType,
 )
-from app.transform.transformer.utility.utility import WOPED, BaseModel
+from app.transform.transformer.utility.utility import (
+    WOPED,
+    BaseModel,
+    SharedModel,
+    flyweight,
+)
 
 
 class Name(BaseModel, tag="name"):  # type: ignore[call-arg]
     """Name extension of BaseModel (+graphics, title)."""
 
-    graphics: OffsetGraphics = element(default=OffsetGraphics())
+    graphics: OffsetGraphics = element(default=DEFAULT_OFFSET_GRAPHICS)
     title: str | None = element(tag="text", default=None)
 
 
@@ -50,7 +59,7 @@ class ToolspecificGlobal(BaseModel, tag="toolspecific"):  # type: ignore[call-ar
     version: str = attr(default="1.0")
 
     resources: Resources | None = None
-    bounds: PositionGraphics = element(tag="bounds", default=PositionGraphics())
+    bounds: PositionGraphics = element(tag="bounds", default=DEFAULT_POSITION_GRAPHICS)
     scale: str = element(tag="scale", default="100")
     treeWidthRight: str = element(tag="treeWidthRight", default="748")
     overviewPanelVisible: str = element(tag="overviewPanelVisible", default="true")
@@ -62,8 +71,8 @@ class ToolspecificGlobal(BaseModel, tag="toolspecific"):  # type: ignore[call-ar
     variables: str = element(tag="variables", default=None)
 
 
-class Toolspecific(BaseModel, tag="toolspecific"):  # type: ignore[call-arg]
-    """WOPED Toolspecific extension of BaseModel for a Netelement."""
+class Toolspecific(SharedModel, tag="toolspecific"):  # type: ignore[call-arg]
+    """WOPED Toolspecific extension of SharedModel for a Netelement."""
 
     tool: str = attr(default=WOPED)
     version: str = attr(default="1.0")
@@ -130,12 +139,17 @@ class Toolspecific(BaseModel, tag="toolspecific"):  # type: ignore[call-arg]
         return self.is_workflow_message() or self.is_workflow_time()
 
 
-class NetElement(BaseModel):
-    """NetElement extension of BaseModel (+name, graphics, toolspecific)."""
+DEFAULT_TOOLSPECIFIC = flyweight(Toolspecific())
 
-    name: Name | None = None
-    graphics: PositionGraphics | None = None
-    toolspecific: Toolspecific | None = None
+
+class WorkflowAnnotations:
+    """Name and workflow annotations in the toolspecific of net elements."""
+
+    __slots__ = ()
+
+    if TYPE_CHECKING:
+        name: Name | None
+        toolspecific: Toolspecific | None
 
     def get_name(self):
         """Returns name of instance."""
@@ -148,12 +162,17 @@ class NetElement(BaseModel):
         self.name = Name(title=new_name)
 
     def set_copy_of_exisiting_toolspecific(self, tool: Toolspecific | None):
-        """Set a copy of a existing Toolspecific instance."""
+        """Set a existing Toolspecific instance, which is shared as it's immutable."""
         if not tool:
             return self
-        self.toolspecific = tool.model_copy()
+        self.toolspecific = tool
         return self
 
+    def _update_toolspecific(self, **update: object):
+        """Set a copy of the (default) toolspecific with changed fields."""
+        toolspecific = self.toolspecific or DEFAULT_TOOLSPECIFIC
+        self.toolspecific = flyweight(toolspecific.model_copy(update=update))
+
     def is_workflow_element(self):
         """Return whether instance is workflow element."""
         return self.toolspecific and self.toolspecific.is_woped()
@@ -206,44 +225,43 @@ class NetElement(BaseModel):
 
     def mark_as_workflow_operator(self, type: WorkflowBranchingType, id: str):
         """Mark this instance as workflow operator."""
-        if not self.toolspecific:
-            self.toolspecific = Toolspecific()
-        self.toolspecific.operator = Operator(id=id, type=type)
+        self._update_toolspecific(operator=Operator(id=id, type=type))
         return self
 
     def mark_as_workflow_subprocess(self):
         """Mark this instance as a subprocess."""
-        if not self.toolspecific:
-            self.toolspecific = Toolspecific()
-        self.toolspecific.subprocess = True
+        self._update_toolspecific(subprocess=True)
         return self
 
     def mark_as_workflow_resource(self, role_name: str, orga: str):
         """Mark this instance as a resource."""
-        if not self.toolspecific:
-            self.toolspecific = Toolspecific()
-
-        self.toolspecific.trigger = Trigger(id="", type=TriggerType.Resource)
-        self.toolspecific.transitionResource = TransitionResource(
-            roleName=role_name, organizationalUnitName=orga
+        self._update_toolspecific(
+            trigger=Trigger(id="", type=TriggerType.Resource),
+            transitionResource=TransitionResource(
+                roleName=role_name, organizationalUnitName=orga
+            ),
         )
         return self
 
     def mark_as_workflow_message(self):
         """Mark this instance as a message."""
-        if not self.toolspecific:
-            self.toolspecific = Toolspecific()
-        self.toolspecific.trigger = Trigger(id="", type=TriggerType.Message)
+        self._update_toolspecific(trigger=Trigger(id="", type=TriggerType.Message))
         return self
 
     def mark_as_workflow_time(self):
         """Mark this instance as a time."""
-        if not self.toolspecific:
-            self.toolspecific = Toolspecific()
-        self.toolspecific.trigger = Trigger(id="", type=TriggerType.Time)
+        self._update_toolspecific(trigger=Trigger(id="", type=TriggerType.Time))
         return self
 
 
+class NetElement(BaseModel, WorkflowAnnotations):
+    """NetElement extension of BaseModel (+name, graphics, toolspecific)."""
+
+    name: Name | None = None
+    graphics: PositionGraphics | None = None
+    toolspecific: Toolspecific | None = None
+
+
 class Inscription(BaseModel, tag="inscription"):  # type: ignore[call-arg]
     """Inscription extension of BaseModel (+text, graphics)."""
 
@@ -1,25 +1,37 @@
-"""Moduel for shared graphics xml elements."""
+"""Moduel for shared graphics xml elements.
+
+Graphics are immutable and equal graphics are shared by the elements of a net.
+"""
 
 from pydantic_xml import attr, element
 
-from app.transform.transformer.utility.utility import BaseModel
+from app.transform.transformer.utility.utility import SharedModel, flyweight
 
 
-class Coordinates(BaseModel):
-    """Coordinate extension of BaseModel (+x and y)."""
+class Coordinates(SharedModel):
+    """Coordinate extension of SharedModel (+x and y)."""
 
     x: float = attr(default=20.0)
     y: float = attr(default=20.0)
 
 
-class PositionGraphics(BaseModel, tag="graphics"):  # type: ignore[call-arg]
+DEFAULT_COORDINATES = flyweight(Coordinates())
+
+
+class PositionGraphics(SharedModel, tag="graphics"):  # type: ignore[call-arg]
     """Placeholder graphics for position."""
 
-    dimension: Coordinates = element("dimension", default=Coordinates())
-    position: Coordinates = element("position", default=Coordinates())
+    dimension: Coordinates = element("dimension", default=DEFAULT_COORDINATES)
+    position: Coordinates = element("position", default=DEFAULT_COORDINATES)
+
+
+DEFAULT_POSITION_GRAPHICS = flyweight(PositionGraphics())
+
+
+class OffsetGraphics(SharedModel, tag="graphics"):  # type: ignore[call-arg]
+    """Graphics extension of SharedModel (+offset, dimension, position)."""
 
+    offset: Coordinates = element("offset", default=DEFAULT_COORDINATES)
 
-class OffsetGraphics(BaseModel, tag="graphics"):  # type: ignore[call-arg]
-    """Graphics extension of BaseModel (+offset, dimension, position)."""
 
-    offset: Coordinates = element("offset", default=Coordinates())
+DEFAULT_OFFSET_GRAPHICS = flyweight(OffsetGraphics())
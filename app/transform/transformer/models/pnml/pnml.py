@@ -1,12 +1,16 @@
 """PNML models."""
 
+import io
 import logging
+from collections.abc import Iterator, Sequence
 from pathlib import Path
-from typing import cast
+from typing import IO, TypeVar, cast
+from xml.etree.ElementTree import Element
 
 from app.transform.exceptions import (
     InternalTransformationException,
     InvalidInputXML,
+    ModelLimitExceeded,
     PrivateInternalException,
 )
 from app.transform.transformer.models.pnml.base import (
@@ -24,17 +28,37 @@ from app.transform.transformer.models.pnml.transform_helper import (
     TimeHelperPNML,
     XORHelperPNML,
 )
+from app.transform.transformer.utility.graph_index import GraphIndex, NodeView
+from app.transform.transformer.utility.limits import ModelLimits, limit_events
 from app.transform.transformer.utility.utility import (
     BaseModel,
     create_arc_name,
     create_silent_node_name,
 )
-from defusedxml.ElementTree import fromstring
+from app.transform.transformer.utility.xml_emitter import get_emitter
+from app.transform.transformer.utility.xml_parser import iterparse
+from app.transform.transformer.utility.xml_writer import (
+    CHUNK_SIZE,
+    XML_HEADER,
+    XMLChunkWriter,
+    write_items,
+    writes_chunks,
+)
 from pydantic import PrivateAttr
 from pydantic_xml import attr, element
 
 logger = logging.getLogger(__name__)
 
+# helper elements are part of nets during the transformation
+NetNode = NetElement | HelperPNMLElement
+AnyNetElement = TypeVar("AnyNetElement", bound=NetNode)
+
+# collection fields of a net, which are serialized item by item
+NET_ITEM_FIELDS = ("places", "transitions", "arcs", "pages")
+
+# graphics option of a PNML result without default toolspecific and graphics content
+GRAPHICS_COMPACT = "compact"
+
 
 class Transition(NetElement, tag="transition"):  # type: ignore[call-arg]
     """Transition extension of NetElement."""
@@ -67,6 +91,18 @@ class Arc(BaseModel, tag="arc"):  # type: ignore[call-arg]
         """Retuns a hashed of the arc instance."""
         return hash((type(self),) + (self.id,) + (self.source,) + (self.target,))
 
+    def sort_key(self):
+        """Return the key of the arc in the canonical order of a collection."""
+        return (self.id or "", self.source, self.target)
+
+    def index_key(self):
+        """Return the key of the arc in the edge index of its net.
+
+        The arcs of the transitions of a WoPeD operator share their ids, so an arc
+        is indexed by its id with its source and target.
+        """
+        return (self.id, self.source, self.target)
+
 
 class Page(BaseModel, tag="page"):  # type: ignore[call-arg]
     """Page extension of BaseModel (+Net)."""
@@ -78,7 +114,10 @@ class Net(BaseModel, tag="net"):  # type: ignore[call-arg]
     """Net extension of BaseModel (+ID, type_field, places, transitions, arcs...).
 
     This class also contains internal helperstructures to improve the performance of
-    operations. It also contains helper methods to modify the Net.
+    operations. The graph index indexes the places, transitions and helper elements by
+    id with the arcs connecting them, pages are indexed by id on their own because a
+    subprocess page has the id of its transition. It also contains helper methods to
+    modify the Net.
     """
 
     toolspecific_global: ToolspecificGlobal | None = None
@@ -92,23 +131,17 @@ class Net(BaseModel, tag="net"):  # type: ignore[call-arg]
     pages: set[Page] = element(default_factory=set)
 
     # internal helper structures
-    _temp_elements: dict[str, NetElement] = PrivateAttr(default_factory=dict)
     _type_map: dict[type[BaseModel], set[BaseModel]] = PrivateAttr(default_factory=dict)
-    _temp_arcs: dict[int, Arc] = PrivateAttr(default_factory=dict)
-    _temp_node_id_to_incoming: dict[str, set[Arc]] = PrivateAttr(default_factory=dict)
-    _temp_node_id_to_outgoing: dict[str, set[Arc]] = PrivateAttr(default_factory=dict)
+    _graph: GraphIndex[NetNode, Arc] = PrivateAttr(default_factory=GraphIndex)
+    _pages: dict[str, Page] = PrivateAttr(default_factory=dict)
 
     def get_incoming(self, id: str):
         """Return the incoming arcs of a node by id."""
-        if id not in self._temp_node_id_to_incoming:
-            return {}
-        return self._temp_node_id_to_incoming[id]
+        return self._graph.incoming(id)
 
     def get_outgoing(self, id: str):
         """Return the outgoing arcs of a node by id."""
-        if id not in self._temp_node_id_to_outgoing:
-            return {}
-        return self._temp_node_id_to_outgoing[id]
+        return self._graph.outgoing(id)
 
     def __init__(self, **data):
         """Net constructor."""
@@ -130,54 +163,59 @@ class Net(BaseModel, tag="net"):  # type: ignore[call-arg]
                 MessageHelperPNML: set([]),
             },
         )
+        graph = self._graph
         for place in self.places:
-            self._temp_elements[place.id] = place
+            graph.add_node(place.id, place)
 
         for transition in self.transitions:
-            self._temp_elements[transition.id] = transition
+            graph.add_node(transition.id, transition)
 
         for arc in self.arcs:
-            self._temp_arcs[hash(arc)] = arc
-            self._update_arc_incoming_outgoing(arc)
+            graph.add_edge(arc.index_key(), arc, arc.source, arc.target)
+
+        for page in self.pages:
+            self._register_page(page)
+
+    def _register_page(self, page: Page):
+        """Index a page that is already part of the pages set."""
+        self._pages[page.id or ""] = page
+
+    def _register_arc(self, arc: Arc):
+        """Index an arc that is already part of the arcs set."""
+        self._graph.add_edge(arc.index_key(), arc, arc.source, arc.target)
+
+    def get_elements(
+        self,
+        kind: type[AnyNetElement] | tuple[type[AnyNetElement], ...] = (
+            NetElement,
+            HelperPNMLElement,
+        ),
+    ) -> NodeView[AnyNetElement]:
+        """Return a live view of the elements of kinds, all elements by default."""
+        return NodeView(self._type_map, kind)
 
     def _flatten_node_typ_map(self):
-        """Return all nodes as a single list."""
+        """Return all nodes and pages as a single list."""
         all_nodes: list[BaseModel] = []
         for type_sets in self._type_map.values():
             all_nodes.extend(type_sets)
         return all_nodes
 
-    def _update_arc_incoming_outgoing(self, arc: Arc):
-        """Updates helper node to arc mapping with the constructed arc."""
-        if arc.target not in self._temp_node_id_to_incoming:
-            self._temp_node_id_to_incoming[arc.target] = set([arc])
-        else:
-            self._temp_node_id_to_incoming[arc.target].add(arc)
-
-        if arc.source not in self._temp_node_id_to_outgoing:
-            self._temp_node_id_to_outgoing[arc.source] = set([arc])
-        else:
-            self._temp_node_id_to_outgoing[arc.source].add(arc)
-
     def get_in_degree(self, node: BaseModel):
         """Return degree of incoming arcs."""
-        if node.id not in self._temp_node_id_to_incoming:
-            return 0
-        return len(self._temp_node_id_to_incoming[node.id])
+        return len(self._graph.incoming(node.id))
 
     def get_out_degree(self, node: BaseModel):
         """Return degree of outgoing arcs."""
-        if node.id not in self._temp_node_id_to_outgoing:
-            return 0
-        return len(self._temp_node_id_to_outgoing[node.id])
+        return len(self._graph.outgoing(node.id))
 
     def add_arc_with_handle_same_type_from_id(self, source_id: str, target_id: str):
         """Add arc connecting source and target id."""
-        source = self._temp_elements[source_id]
-        target = self._temp_elements[target_id]
+        source = self.get_element(source_id)
+        target = self.get_element(target_id)
         self.add_arc_with_handle_same_type(source, target)
 
-    def add_arc_with_handle_same_type(self, source: NetElement, target: NetElement):
+    def add_arc_with_handle_same_type(self, source: NetNode, target: NetNode):
         """Add arc and add node should source and target be of same type."""
         if isinstance(source, Place) and isinstance(target, Place):
             t = self.add_element(
@@ -196,11 +234,11 @@ class Net(BaseModel, tag="net"):  # type: ignore[call-arg]
 
     def add_arc_from_id(self, source_id: str, target_id: str, id: str | None = None):
         """Add arc connecting source and target id."""
-        source = self._temp_elements[source_id]
-        target = self._temp_elements[target_id]
+        source = self.get_element(source_id)
+        target = self.get_element(target_id)
         self.add_arc(source, target, id)
 
-    def add_arc(self, source: NetElement, target: NetElement, id: str | None = None):
+    def add_arc(self, source: NetNode, target: NetNode, id: str | None = None):
         """Add arc based on source and target instance."""
         if id is None:
             id = create_arc_name(source.id, target.id)
@@ -212,7 +250,8 @@ class Net(BaseModel, tag="net"):  # type: ignore[call-arg]
             raise InternalTransformationException(
                 "Cant connect identical petrinet elements"
             )
-        if id in self._temp_arcs:
+        graph = self._graph
+        if (id, source.id, target.id) in graph.edges:
             raise InternalTransformationException(
                 f"arc {id} already exists from {source.id} to {target.id}!"
             )
@@ -221,65 +260,73 @@ class Net(BaseModel, tag="net"):  # type: ignore[call-arg]
         self.add_element(target)
 
         a = Arc(id=id, source=source.id, target=target.id)
-        self._temp_arcs[hash(a)] = a
-        self._update_arc_incoming_outgoing(a)
+        graph.add_edge(a.index_key(), a, a.source, a.target)
 
         self.arcs.add(a)
 
+    def get_arc_between(self, source_id: str, target_id: str):
+        """Return the arc from a source to a target id or None."""
+        return self._graph.edge_between(source_id, target_id)
+
     def remove_arc(self, arc: Arc):
         """Remove arc based on instance."""
-        self._temp_arcs.pop(hash(arc))
-        if arc.target:
-            self._temp_node_id_to_incoming[arc.target].remove(arc)
-        if arc.source:
-            self._temp_node_id_to_outgoing[arc.source].remove(arc)
-
+        self._graph.remove_edge(arc.index_key())
         self.arcs.remove(arc)
 
     def add_page(self, new_page: Page):
         """Add a new page or add if not existing (check by id)."""
-        storage_set = self.pages
-        for p in self.pages:
-            if p.id == new_page.id:
-                return p
+        page = self._pages.get(new_page.id or "")
+        if page is not None:
+            return page
 
-        storage_set.add(new_page)
+        self.pages.add(new_page)
+        self._register_page(new_page)
         return new_page
 
-    def add_element(self, new_node: NetElement):
+    def add_element(self, new_node: NetNode):
         """Add a node to net or return if already exising (check by id)."""
         storage_set = self._type_map[type(new_node)]
         if storage_set is None:
             raise InternalTransformationException("No Petrinet node")
 
-        if new_node.id in self._temp_elements:
+        graph = self._graph
+        if new_node.id in graph:
             return new_node
 
         storage_set.add(new_node)
 
-        self._temp_elements[new_node.id] = new_node
+        graph.add_node(new_node.id, new_node)
         return new_node
 
     def get_element(self, id: str):
         """Return element by id."""
-        if id not in self._temp_elements:
+        element = self._graph.get(id)
+        if element is None:
             raise InternalTransformationException(
                 f"Cant get nonexisting Node with id {id}"
             )
-        return self._temp_elements[id]
+        return element
 
     def get_page(self, id: str):
         """Return page by id."""
-        pages = {p.id: p for p in self.pages}
-        if id not in pages:
+        page = self._pages.get(id)
+        if page is None:
             raise InternalTransformationException("Cant find page")
-        return pages[id]
+        return page
+
+    def get_nested_page(self, path: Sequence[str]):
+        """Return the page at the end of a path of page ids through nested nets."""
+        if not path:
+            raise InternalTransformationException("Cant find page")
+        net = self
+        for id in path:
+            page = net.get_page(id)
+            net = page.net
+        return page
 
     def get_node_or_none(self, id: str):
         """Return node by id or None as default."""
-        if id not in self._temp_elements:
-            return None
-        return self._temp_elements[id]
+        return self._graph.get(id)
 
     def remove_element(self, to_remove_node: BaseModel):
         """Remove element by instance."""
@@ -289,27 +336,59 @@ class Net(BaseModel, tag="net"):  # type: ignore[call-arg]
 
         storage_set.remove(to_remove_node)
 
-        self._temp_elements.pop(to_remove_node.id)
-        incoming = self._temp_node_id_to_incoming.pop(to_remove_node.id, set())
-        outgoing = self._temp_node_id_to_outgoing.pop(to_remove_node.id, set())
+        incoming, outgoing = self._graph.remove_node(to_remove_node.id)
         for arc in incoming:
-            arc.target = ""
+            self._change_arc_ends(arc, arc.source, "")
         for arc in outgoing:
-            arc.source = ""
+            self._change_arc_ends(arc, "", arc.target)
+
+    def _change_arc_ends(self, arc: Arc, source: str, target: str):
+        """Change the source and target of an arc, which is indexed again."""
+        # the hash of an arc depends on its ends
+        self.remove_arc(arc)
+        arc.source = source
+        arc.target = target
+        self.arcs.add(arc)
+        self._register_arc(arc)
 
     def change_id(self, old_id: str, new_id: str):
-        """Change the ID of a existing node and the connecting arcs."""
-        if old_id not in self._temp_elements:
+        """Change the ID of a existing node in place and the ends of its arcs.
+
+        The page of a subprocess transition isn't changed, see change_page_id.
+        """
+        graph = self._graph
+        if old_id not in graph:
             raise InternalTransformationException("old element not exisiting")
-        if new_id in self._temp_elements:
+        if new_id in graph:
             raise InternalTransformationException("new id already exists")
-        current_node = self._temp_elements[old_id]
-        incoming, outgoing = self.get_incoming_outgoing_and_remove_arcs(current_node)
-        self.remove_element(current_node)
+        current_node = graph.node(old_id)
+        # the hash of an element depends on its id
+        storage_set = self._type_map[type(current_node)]
+        storage_set.remove(current_node)
+        incoming, outgoing = graph.remove_node(old_id)
         current_node.id = new_id
-        self.add_element(current_node)
-        self.connect_to_element(current_node, incoming)
-        self.connect_from_element(current_node, outgoing)
+        storage_set.add(current_node)
+        graph.add_node(new_id, current_node)
+        for arc in incoming:
+            self._change_arc_ends(arc, arc.source, new_id)
+        for arc in outgoing:
+            self._change_arc_ends(arc, new_id, arc.target)
+
+    def change_page_id(self, old_id: str, new_id: str):
+        """Change the ID of a existing page, it is indexed again in the pages set.
+
+        The page of a subprocess transition has the id of the transition, so a
+        renamed subprocess transition needs its page renamed as well.
+        """
+        if old_id not in self._pages:
+            raise InternalTransformationException("old page not exisiting")
+        if new_id in self._pages:
+            raise InternalTransformationException("new id already exists")
+        page = self._pages.pop(old_id)
+        self.pages.remove(page)
+        page.id = new_id
+        self.pages.add(page)
+        self._register_page(page)
 
     def remove_element_with_connecting_arcs(self, to_remove_node: BaseModel):
         """Remove element by instance and connecting arcs."""
@@ -321,7 +400,7 @@ class Net(BaseModel, tag="net"):  # type: ignore[call-arg]
 
         self.remove_element(to_remove_node)
 
-    def get_incoming_and_remove_arcs(self, transition: NetElement):
+    def get_incoming_and_remove_arcs(self, transition: NetNode):
         """Get a copy of each incoming arc and remove original arcs."""
         incoming_arcs: list[Arc] = [
             arc.model_copy() for arc in self.get_incoming(transition.id)
@@ -330,7 +409,7 @@ class Net(BaseModel, tag="net"):  # type: ignore[call-arg]
             self.remove_arc(to_remove_arc)
         return incoming_arcs
 
-    def get_outgoing_and_remove_arcs(self, transition: NetElement):
+    def get_outgoing_and_remove_arcs(self, transition: NetNode):
         """Get a copy of each outgoing arc and remove original arcs."""
         outgoing_arcs: list[Arc] = [
             arc.model_copy() for arc in self.get_outgoing(transition.id)
@@ -339,18 +418,18 @@ class Net(BaseModel, tag="net"):  # type: ignore[call-arg]
             self.remove_arc(to_remove_arc)
         return outgoing_arcs
 
-    def get_incoming_outgoing_and_remove_arcs(self, transition: NetElement):
+    def get_incoming_outgoing_and_remove_arcs(self, transition: NetNode):
         """Get a copy of all connecting arc and remove original arcs."""
         return self.get_incoming_and_remove_arcs(
             transition
         ), self.get_outgoing_and_remove_arcs(transition)
 
-    def connect_to_element(self, element: NetElement, incoming_arcs: list[Arc]):
+    def connect_to_element(self, element: NetNode, incoming_arcs: list[Arc]):
         """Connect each source of the arcs to a specified element."""
         for arc in incoming_arcs:
             self.add_arc_from_id(arc.source, element.id)
 
-    def connect_from_element(self, element: NetElement, outgoing_arcs: list[Arc]):
+    def connect_from_element(self, element: NetNode, outgoing_arcs: list[Arc]):
         """Connect each target of the arcs from a specified element."""
         for arc in outgoing_arcs:
             self.add_arc_from_id(element.id, arc.target)
@@ -369,7 +448,7 @@ class Pnml(BaseModel, tag="pnml"):  # type: ignore[call-arg]
         """Return string of net instance as serialized XML."""
         logger.debug("Serializing PNML to XML string")
         try:
-            xml_str = cast(str, self.to_xml(encoding="unicode"))
+            xml_str = cast(str, self.canonical().to_xml(encoding="unicode"))
             logger.debug(
                 f"Successfully serialized PNML to XML ({len(xml_str)} characters)"
             )
@@ -378,21 +457,85 @@ class Pnml(BaseModel, tag="pnml"):  # type: ignore[call-arg]
             logger.error(f"Failed to serialize PNML: {e}", exc_info=True)
             raise PrivateInternalException("Can't convert pnml to string.")
 
+    def to_chunks(
+        self, chunk_size: int = CHUNK_SIZE, compact: bool = False
+    ) -> Iterator[str]:
+        """Return the XML of the net with header as chunks of text.
+
+        The nodes and arcs of the net are serialized one by one in their canonical
+        order while the chunks are consumed. The text equals the header followed
+        by to_string. A compact text leaves out the default toolspecific and
+        graphics content, which is restored when the text is parsed.
+        """
+        net = self.net
+        net_shell = net.model_copy(update={f: set() for f in NET_ITEM_FIELDS})
+        try:
+            root = self.model_copy(update={"net": net_shell}).to_xml_tree()
+        except Exception as e:
+            logger.error(f"Failed to serialize PNML: {e}", exc_info=True)
+            raise PrivateInternalException("Can't convert pnml to string.")
+        if not writes_chunks(root):
+            emitter = get_emitter(Pnml, compact=True) if compact else None
+            if emitter is not None:
+                return iter([XML_HEADER + emitter.to_xml(self.canonical())])
+            return iter([XML_HEADER + self.to_string()])
+        net_emitter = get_emitter(Net, compact=True) if compact else None
+
+        def write():
+            writer = XMLChunkWriter(chunk_size)
+            writer.write(XML_HEADER)
+            writer.start(root)
+            for child in root:
+                if child.tag != "net":
+                    writer.element(child)
+                    continue
+                writer.start(child)
+                if net_emitter is not None:
+                    # the content of the shell without the items
+                    writer.write(net_emitter(net_shell)[1])
+                else:
+                    for net_child in child:
+                        writer.element(net_child)
+                yield from write_items(writer, net_shell, net, NET_ITEM_FIELDS, compact)
+                writer.end()
+            writer.end()
+            yield from writer.chunks(final=True)
+
+        return write()
+
     def write_to_file(self, path: str):
         """Save net to file."""
         Path(path).write_text(self.to_string())
 
     @staticmethod
-    def from_xml_str(xml_content: str):
+    def from_xml_str(
+        xml_content: str,
+        parser_backend: str | None = None,
+        limits: ModelLimits | None = None,
+    ):
         """Return a petri net from a XML string."""
         logger.debug("Parsing PNML from XML string")
+        return Pnml.from_stream(io.StringIO(xml_content), parser_backend, limits)
+
+    @staticmethod
+    def from_stream(
+        stream: IO, parser_backend: str | None = None, limits: ModelLimits | None = None
+    ):
+        """Return a petri net from a readable text or binary XML stream.
+
+        Binary streams (e.g. a request body) are passed to the parser as they are,
+        the parser detects the encoding from the XML declaration. A model exceeding
+        the limits is rejected as soon as the exceeding element is read.
+        """
         try:
-            tree = fromstring(xml_content)
-            net = Pnml.from_xml_tree(tree)
+            net = read_pnml_stream(stream, parser_backend, limits)
             logger.debug(
                 f"Successfully parsed PNML with net ID: {net.net.id if net.net else 'N/A'}"
             )
             return net
+        except ModelLimitExceeded as e:
+            logger.warning(f"PNML exceeds the model limits: {e.limit_name}")
+            raise e
         except Exception as e:
             logger.error(f"Failed to parse PNML XML: {e}", exc_info=True)
             raise InvalidInputXML()
@@ -407,3 +550,90 @@ class Pnml(BaseModel, tag="pnml"):  # type: ignore[call-arg]
     def generate_empty_net(id="new_net"):
         """Return empty petri net."""
         return Pnml(net=Net(id=id))
+
+
+def read_pnml_stream(
+    source: IO, parser_backend: str | None = None, limits: ModelLimits | None = None
+) -> Pnml:
+    """Build a petri net while the PNML is parsed incrementally.
+
+    Places, transitions, arcs and pages are created as soon as their end tag was read
+    and are registered in the helper structures of their net right away. Processed
+    subtrees are dropped from the element tree, so only the currently open path is
+    kept in memory instead of the whole document tree.
+
+    Only the nets that the model itself would deserialize are built: the net of the
+    pnml root and the net of each page of a net that is build. As for the model, the
+    first net and the first global toolspecific of a parent win.
+
+    The model limits are checked on the start tags, so a model exceeding them is
+    rejected before the objects of the exceeding elements are created.
+    """
+    # open elements with the net they build (None if the element is no net)
+    path: list[tuple[Element, Net | None]] = []
+    parent_nets: dict[Element, Net] = {}
+
+    events = limit_events(
+        iterparse(source, events=("start", "end"), backend=parser_backend),
+        limits,
+        subprocess_tag="page",
+        connection_tag="arc",
+    )
+    for event, elem in events:
+        if event == "start":
+            net = None
+            if elem.tag == "net" and path and path[-1][0] not in parent_nets:
+                parent, _ = path[-1]
+                is_root_net = len(path) == 1 and parent.tag == "pnml"
+                is_page_net = (
+                    parent.tag == "page"
+                    and len(path) > 1
+                    and path[-2][1] is not None
+                )
+                if is_root_net or is_page_net:
+                    # only the attributes are read, the children are added later
+                    net = Net.from_xml_tree(Element(elem.tag, dict(elem.attrib)))
+                    parent_nets[parent] = net
+            path.append((elem, net))
+            continue
+
+        path.pop()
+        if not path:
+            if elem.tag != "pnml" or elem not in parent_nets:
+                raise InvalidInputXML()
+            return Pnml(
+                id=elem.get("id", ""),
+                name=elem.get("name"),
+                net=parent_nets.pop(elem),
+            )
+
+        parent, parent_net = path[-1]
+        if parent_net is None:
+            continue
+
+        if elem.tag == "place":
+            parent_net.add_element(Place.from_xml_tree(elem))
+        elif elem.tag == "transition":
+            parent_net.add_element(Transition.from_xml_tree(elem))
+        elif elem.tag == "arc":
+            arc = Arc.from_xml_tree(elem)
+            parent_net.arcs.add(arc)
+            parent_net._register_arc(arc)
+        elif elem.tag == "page":
+            if elem not in parent_nets:
+                raise InvalidInputXML()
+            page = Page(
+                id=elem.get("id", ""),
+                name=elem.get("name"),
+                net=parent_nets.pop(elem),
+            )
+            parent_net.pages.add(page)
+            parent_net._register_page(page)
+        elif elem.tag == "toolspecific" and parent_net.toolspecific_global is None:
+            parent_net.toolspecific_global = ToolspecificGlobal.from_xml_tree(elem)
+
+        # children of a net are removed as soon as they are closed, so the net holds
+        # no other child than the open one, which is closed now
+        del parent[-1]
+
+    raise InvalidInputXML()
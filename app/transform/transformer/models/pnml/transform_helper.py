@@ -1,33 +1,67 @@
 """Elements used as placeholder nodes to simplify transformation."""
 
-from app.transform.transformer.models.pnml.base import NetElement
+from app.transform.transformer.models.pnml.base import (
+    Name,
+    Toolspecific,
+    WorkflowAnnotations,
+)
+from app.transform.transformer.utility.utility import HelperNode
 
 
-class HelperPNMLElement(NetElement):
-    """Superclass for HelperPNMLElements for transformation."""
+class HelperPNMLElement(HelperNode, WorkflowAnnotations):
+    """Superclass for HelperPNMLElements for transformation.
+
+    Helper elements are removed before a net is serialized, so they are helper
+    nodes with the name and toolspecific of net elements instead of models.
+    """
+
+    __slots__ = ("name", "toolspecific")
+
+    def __init__(
+        self,
+        id: str,
+        name: Name | None = None,
+        toolspecific: Toolspecific | None = None,
+    ):
+        """Create a helper element."""
+        super().__init__(id)
+        self.name = name
+        self.toolspecific = toolspecific
 
 
 # Gateway
 class GatewayHelperPNML(HelperPNMLElement):
     """Superclass for helper gateways for transformation."""
 
+    __slots__ = ()
+
 
 class XORHelperPNML(GatewayHelperPNML):
     """Expected to be transformed to a BPMN-XOR-Gateway."""
 
+    __slots__ = ()
+
 
 class ANDHelperPNML(GatewayHelperPNML):
     """Expected to be transformed to a BPMN-AND-Gateway."""
 
+    __slots__ = ()
+
 
 # Trigger
 class TriggerHelperPNML(HelperPNMLElement):
     """Superclass for helper triggers for transformation."""
 
+    __slots__ = ()
+
 
 class MessageHelperPNML(TriggerHelperPNML):
     """Expected to be transformed to a BPMN-IntermediateCatchEvent(Message)."""
 
+    __slots__ = ()
+
 
 class TimeHelperPNML(TriggerHelperPNML):
     """Expected to be transformed to a BPMN-IntermediateCatchEvent(Time)."""
+
+    __slots__ = ()
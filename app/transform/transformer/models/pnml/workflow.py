@@ -4,8 +4,11 @@ from enum import Enum
 
 from pydantic_xml import attr, element
 
-from app.transform.transformer.models.pnml.graphics import PositionGraphics
-from app.transform.transformer.utility.utility import BaseModel
+from app.transform.transformer.models.pnml.graphics import (
+    DEFAULT_POSITION_GRAPHICS,
+    PositionGraphics,
+)
+from app.transform.transformer.utility.utility import SharedModel
 
 
 class WorkflowBranchingType(int, Enum):
@@ -22,8 +25,8 @@ class WorkflowBranchingType(int, Enum):
     XorJoinAndSplit = 109
 
 
-class Operator(BaseModel, tag="operator"):  # type: ignore[call-arg]
-    """Operator extension of BaseModel (+id, type)."""
+class Operator(SharedModel, tag="operator"):  # type: ignore[call-arg]
+    """Operator extension of SharedModel (+id, type)."""
 
     type: WorkflowBranchingType = attr()
 
@@ -36,19 +39,19 @@ class TriggerType(int, Enum):
     Time = 202
 
 
-class Trigger(BaseModel, tag="trigger"):  # type: ignore[call-arg]
-    """Trigger extension of BaseModel (+id, type)."""
+class Trigger(SharedModel, tag="trigger"):  # type: ignore[call-arg]
+    """Trigger extension of SharedModel (+id, type)."""
 
     id: str = attr()
     type: TriggerType = attr()
 
-    graphics: PositionGraphics = element(default=PositionGraphics())
+    graphics: PositionGraphics = element(default=DEFAULT_POSITION_GRAPHICS)
 
 
-class TransitionResource(BaseModel, tag="transitionResource"):  # type: ignore[call-arg]
-    """Transition Resource extension of BaseModel."""
+class TransitionResource(SharedModel, tag="transitionResource"):  # type: ignore[call-arg]
+    """Transition Resource extension of SharedModel."""
 
     roleName: str = attr()
     organizationalUnitName: str = attr()
 
-    graphics: PositionGraphics = element(default=PositionGraphics())
+    graphics: PositionGraphics = element(default=DEFAULT_POSITION_GRAPHICS)
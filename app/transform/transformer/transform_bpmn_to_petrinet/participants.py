@@ -22,9 +22,8 @@ def find_subprocess_participants(
     subprocess._participant_mapping = participant_mapping
     for sb in subprocess.subprocesses:
         find_subprocess_participants(participant_mapping, sb, current_lane_name)
-    for node in subprocess._flatten_node_typ_map():
-        if isinstance(node, UserTask):
-            participant_mapping[node.id] = current_lane_name
+    for node in subprocess.get_nodes(UserTask):
+        participant_mapping[node.id] = current_lane_name
 
 
 def create_participant_mapping(bpmn: Process):
@@ -1,6 +1,6 @@
-"""Insert GenericBPMNNodes."""
+"""Insert linking nodes."""
 
-from app.transform.transformer.models.bpmn.base import Gateway, GenericBPMNNode
+from app.transform.transformer.models.bpmn.base import Gateway, LinkingNode
 from app.transform.transformer.models.bpmn.bpmn import (
     EndEvent,
     IntermediateCatchEvent,
@@ -10,14 +10,18 @@ from app.transform.transformer.models.bpmn.bpmn import (
 from app.transform.transformer.utility.utility import create_silent_node_name
 
 
+# types of the nodes that will be transformed to transitions
+WF_TRANSITION_TYPES = (Process, Gateway, IntermediateCatchEvent)
+
+
 def is_target_wf_transition(node):
     """If node will be transformed to transition."""
-    return isinstance(node, Process | Gateway | IntermediateCatchEvent)
+    return isinstance(node, WF_TRANSITION_TYPES)
 
 
 def is_place_like(node):
     """BPMN node will be transformed to a place."""
-    return type(node) == GenericBPMNNode or isinstance(node, StartEvent | EndEvent)
+    return isinstance(node, LinkingNode | StartEvent | EndEvent)
 
 
 def insert_temp_between_adjacent_mapped_transition(bpmn: Process):
@@ -25,21 +29,18 @@ def insert_temp_between_adjacent_mapped_transition(bpmn: Process):
 
     Certain adjacent BPMN Elements that will be transformed to transitions can break
     the transformation if they are adjacent to other workflow elements.
-    As a solution GenericBPMNNodes are inserted around each critical element.
+    As a solution linking nodes are inserted around each critical element.
     They will be transformed to Places as part of the transformation.
     """
-    nodes = bpmn._flatten_node_typ_map()
-    for node in nodes:
-        if not is_target_wf_transition(node):
-            continue
-
+    # the inserted linking nodes aren't part of the view
+    for node in bpmn.get_nodes(WF_TRANSITION_TYPES):
         for incoming_flow in bpmn.get_incoming(node.id).copy():
             incoming_node = bpmn.get_node(incoming_flow.sourceRef)
             # Connected node is already place like
             if is_place_like(incoming_node):
                 continue
 
-            linking_node = GenericBPMNNode(
+            linking_node = LinkingNode(
                 id=create_silent_node_name(incoming_node.id, node.id)
             )
 
@@ -55,7 +56,7 @@ def insert_temp_between_adjacent_mapped_transition(bpmn: Process):
             if is_place_like(outgoing_node):
                 continue
 
-            linking_node = GenericBPMNNode(
+            linking_node = LinkingNode(
                 id=create_silent_node_name(node.id, outgoing_node.id)
             )
 
@@ -1,9 +1,12 @@
 """Module for processing gateways for bpmn workflows."""
 
 import logging
-from typing import cast
 
-from app.transform.transformer.models.bpmn.base import Gateway, GenericBPMNNode
+from app.transform.transformer.models.bpmn.base import (
+    Gateway,
+    GenericBPMNNode,
+    LinkingNode,
+)
 from app.transform.transformer.models.bpmn.bpmn import Flow, Process
 
 logger = logging.getLogger(__name__)
@@ -20,8 +23,8 @@ def remove_unnecessary_gateways(bpmn: Process, gateways: set[Gateway]):
             continue
         to_remove_gws.append(gw)
 
-        in_arc: Flow = list(bpmn.get_incoming(gw.id))[0]
-        out_arc: Flow = list(bpmn.get_outgoing(gw.id))[0]
+        in_arc: Flow = next(iter(bpmn.get_incoming(gw.id)))
+        out_arc: Flow = next(iter(bpmn.get_outgoing(gw.id)))
         source_node = bpmn.get_node(in_arc.sourceRef)
         target_node = bpmn.get_node(out_arc.targetRef)
 
@@ -44,7 +47,7 @@ def add_pn_place_between_adjacent_gateways(bpmn: Process, gateways: set[Gateway]
                 continue
             bpmn.remove_flow(out_flow)
 
-            linking_node = GenericBPMNNode(id=gw.id + out_node.id)
+            linking_node = LinkingNode(id=gw.id + out_node.id)
             bpmn.add_node(linking_node)
             bpmn.add_flow(gw, linking_node)
             bpmn.add_flow(linking_node, out_node)
@@ -53,11 +56,7 @@ def add_pn_place_between_adjacent_gateways(bpmn: Process, gateways: set[Gateway]
 
 def get_gateways(bpmn: Process):
     """Get all gateways of a process."""
-    nodes = bpmn._flatten_node_typ_map()
-    gateways = cast(
-        set[Gateway], {node for node in nodes if issubclass(type(node), Gateway)}
-    )
-    return gateways
+    return set(bpmn.get_nodes(Gateway))
 
 
 def preprocess_gateways(bpmn: Process):
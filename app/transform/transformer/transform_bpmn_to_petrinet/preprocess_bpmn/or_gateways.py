@@ -235,10 +235,7 @@ def inclusive_gws_to_parallel_gws(bpmn: Process, gws: list[InclusiveGatewayBridg
 def replace_inclusive_gateways(in_bpmn: Process):
     """Replace OR gateways with a combination of AND- and XOR-Gateways."""
     logger.debug("Replacing inclusive (OR) gateways")
-    nodes = in_bpmn._flatten_node_typ_map()
-    inclusive_gateways: list[OrGateway] = [
-        node for node in nodes if isinstance(node, OrGateway)
-    ]
+    inclusive_gateways = list(in_bpmn.get_nodes(OrGateway))
     logger.debug(f"Found {len(inclusive_gateways)} inclusive gateways")
     if len(inclusive_gateways) == 0:
         return
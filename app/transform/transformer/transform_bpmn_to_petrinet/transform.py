@@ -4,7 +4,11 @@ import logging
 from collections.abc import Callable
 
 from app.transform.exceptions import NotSupportedBPMNElement
-from app.transform.transformer.models.bpmn.base import Gateway, GenericBPMNNode
+from app.transform.transformer.models.bpmn.base import (
+    Gateway,
+    GenericBPMNNode,
+    LinkingNode,
+)
 from app.transform.transformer.models.bpmn.bpmn import (
     BPMN,
     AndGateway,
@@ -61,7 +65,9 @@ def merge_single_triggers(net: Net):
         if net.get_out_degree(trigger) == 0:
             continue
 
-        connecting_place = net.get_element(list(net.get_outgoing(trigger.id))[0].target)
+        connecting_place = net.get_element(
+            next(iter(net.get_outgoing(trigger.id))).target
+        )
 
         # no following element to merge with
         if net.get_out_degree(connecting_place) == 0:
@@ -130,7 +136,7 @@ def transform_bpmn_to_petrinet(
     logger.debug(f"Starting transform_bpmn_to_petrinet for process: {bpmn.id}")
     pnml = Pnml.generate_empty_net(bpmn.id)
     net = pnml.net
-    nodes = set(bpmn._flatten_node_typ_map())
+    nodes = set(bpmn.get_nodes())
     logger.debug(f"Found {len(nodes)} nodes in BPMN process")
 
     # find workflow specific nodes
@@ -189,6 +195,7 @@ def transform_bpmn_to_petrinet(
             | StartEvent
             | EndEvent
             | GenericBPMNNode
+            | LinkingNode
             | EventGateway,
         ):
             net.add_element(Place(id=node.id))
@@ -285,5 +292,5 @@ def bpmn_to_workflow_net(bpmn: BPMN):
 
 def bpmn_to_wf_net_from_xml(bpmn_xml: str):
     """Return a processed and transformed workflow net of process from xml str."""
-    bpmn = BPMN.from_xml(bpmn_xml)
+    bpmn = BPMN.from_xml(bpmn_xml, skip_diagram=True)
     return bpmn_to_workflow_net(bpmn)
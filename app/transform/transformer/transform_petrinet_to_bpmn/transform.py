@@ -58,12 +58,8 @@ def remove_unnecessary_gateways(bpmn: Process):
     while is_rerun_reduce:
         is_rerun_reduce = False
 
-        gw_nodes: list[Gateway] = [
-            node
-            for node in bpmn._flatten_node_typ_map()
-            if issubclass(type(node), Gateway)
-        ]
-        for gw_node in gw_nodes:
+        # the gateways change while they are reduced
+        for gw_node in list(bpmn.get_nodes(Gateway)):
             if gw_node.get_in_degree() > 1 or gw_node.get_out_degree() > 1:
                 continue
             if gw_node.get_in_degree() == 0 or gw_node.get_out_degree() == 0:
@@ -71,7 +67,7 @@ def remove_unnecessary_gateways(bpmn: Process):
 
             source_id, target_id = bpmn.remove_node_with_connecting_flows(gw_node)
             new_flow_id = create_arc_name(source_id, target_id)
-            if new_flow_id in bpmn._temp_flows:
+            if bpmn.is_flow_existing(new_flow_id):
                 continue
 
             bpmn.add_flow(
@@ -101,17 +97,9 @@ def transform_petrinet_to_bpmn(net: Net):
     transitions.difference_update(to_handle_subprocesses)
     logger.debug(f"Found {len(to_handle_subprocesses)} subprocesses")
 
-    to_handle_temp_gateways: list[GatewayHelperPNML] = [
-        elem
-        for elem in net._flatten_node_typ_map()
-        if isinstance(elem, GatewayHelperPNML)
-    ]
+    to_handle_temp_gateways = list(net.get_elements(GatewayHelperPNML))
 
-    to_handle_temp_triggers: list[TriggerHelperPNML] = [
-        elem
-        for elem in net._flatten_node_typ_map()
-        if isinstance(elem, TriggerHelperPNML)
-    ]
+    to_handle_temp_triggers = list(net.get_elements(TriggerHelperPNML))
 
     # Only transitions could be  be mapped to usertasks
     to_handle_temp_resources: list[Transition] = [
@@ -167,8 +155,8 @@ def transform_petrinet_to_bpmn(net: Net):
 
     # handle remaining arcs
     for arc in net.arcs:
-        source_in_nodes = arc.source in net._temp_elements
-        target_in_nodes = arc.target in net._temp_elements
+        source_in_nodes = arc.source in net._graph
+        target_in_nodes = arc.target in net._graph
         if not source_in_nodes or not target_in_nodes:
             continue
         source = bpmn.get_node(arc.source)
@@ -180,7 +168,7 @@ def transform_petrinet_to_bpmn(net: Net):
     remove_silent_tasks(bpmn)
     remove_unnecessary_gateways(bpmn)
     logger.debug(
-        f"Transformation completed - BPMN has {len(bpmn._flatten_node_typ_map())} nodes and {len(bpmn.flows)} flows"
+        f"Transformation completed - BPMN has {len(bpmn.get_nodes())} nodes and {len(bpmn.flows)} flows"
     )
 
     return bpmn_general
@@ -97,7 +97,7 @@ def find_workflow_operators(net: Net):
     """Return all workflow operators of a net."""
     logger.debug("Finding workflow operators in net")
     operator_map: dict[str, list[NetElement]] = {}
-    for node in net._temp_elements.values():
+    for node in net._graph.nodes():
         if isinstance(node, Page):
             continue
         if not node.is_workflow_operator():
@@ -149,8 +149,8 @@ def handle_workflow_subprocesses(
         page = net.get_page(sb_id)
         page_net = page.net
 
-        outer_source_id = list(net.get_incoming(sb_id))[0].source
-        outer_sink_id = list(net.get_outgoing(sb_id))[0].target
+        outer_source_id = next(iter(net.get_incoming(sb_id))).source
+        outer_sink_id = next(iter(net.get_outgoing(sb_id))).target
 
         inner_source_id, inner_sink_id = (
             page_net.get_element(outer_source_id),
@@ -218,9 +218,7 @@ def find_role_type_of_subprocess(net: Net, current_role: str | None = None):
     Should there be more than one role a exception will be thrown.
     """
     to_handle_temp_resources: list[NetElement] = [
-        elem
-        for elem in net._flatten_node_typ_map()
-        if isinstance(elem, NetElement) and elem.is_workflow_resource()
+        elem for elem in net.get_elements() if elem.is_workflow_resource()
     ]
     for resource in to_handle_temp_resources:
         if not resource.toolspecific or not resource.toolspecific.transitionResource:
@@ -242,9 +240,7 @@ def annotate_resources(net: Net, bpmn: BPMN):
     current_organization: str | None = None
     role_map: dict[str, list[str]] = {}
     to_handle_temp_resources: list[NetElement] = [
-        elem
-        for elem in net._flatten_node_typ_map()
-        if isinstance(elem, NetElement) and elem.is_workflow_resource()
+        elem for elem in net.get_elements() if elem.is_workflow_resource()
     ]
     for resource in to_handle_temp_resources:
         if not resource.toolspecific or not resource.toolspecific.transitionResource:
@@ -283,11 +279,13 @@ def annotate_resources(net: Net, bpmn: BPMN):
         return
 
     # Add all elements without a role annotation to a Unkown lane
-    all_net_elements = net._flatten_node_typ_map()
-    all_net_ids = {node.id for node in all_net_elements}
-    unhandled_ids = all_net_ids.difference(handled_nodes).intersection(
-        [node.id for node in bpmn.process._flatten_node_typ_map()]
-    )
+    all_net_ids = {node.id for node in net.get_elements()}
+    all_net_ids.update(page.id for page in net.pages)
+    unhandled_ids = {
+        id
+        for id in all_net_ids.difference(handled_nodes)
+        if bpmn.process.is_node_existing(id)
+    }
     UNKOWN_LANE = "Unkown participant"
     role_map[UNKOWN_LANE] = list(unhandled_ids)
 
@@ -0,0 +1,223 @@
+"""Index of the nodes and edges of nets and processes.
+
+Nets and processes keep their nodes and edges as sets of models, which are
+serialized. The transformation passes look up nodes by id and follow their edges,
+which the graph index of a net or process answers: each node id is interned as an
+integer, which indexes flat lists of the nodes, their kinds and their incoming and
+outgoing edges. Edges are kept by key with the interned ids of their endpoints and
+by the pair of their endpoints, so an edge is found by key or by its source and
+target without a scan of the adjacency.
+
+The index is a plain object with slots, so the passes don't pay the attribute
+lookup of pydantic models for each access of an index. An id stays interned after
+its node is removed, edges may reference ids without node.
+
+The index only maps ids to the models, the nodes and edges stay pydantic models,
+which the passes create and change. The adjacency is kept as mutable sets per id,
+not as compact arrays, since the passes change the graph on nearly every step.
+
+Node views iterate the nodes of a kind in the sets a net or process keeps per node
+type, so the passes don't copy every node to select the gateways or helpers.
+"""
+
+from collections.abc import Hashable, Iterator, Mapping
+from itertools import chain
+from typing import Generic, TypeVar
+
+Node = TypeVar("Node")
+Edge = TypeVar("Edge")
+
+
+class GraphIndex(Generic[Node, Edge]):
+    """Interned node ids with the adjacency of their edges."""
+
+    __slots__ = (
+        "_ids",
+        "_keys",
+        "_nodes",
+        "_kinds",
+        "_incoming",
+        "_outgoing",
+        "_count",
+        "_pairs",
+        "edges",
+    )
+
+    def __init__(self):
+        """Create an empty graph index."""
+        self._ids: dict[str, int] = {}
+        self._keys: list[str] = []
+        self._nodes: list[Node | None] = []
+        self._kinds: list[type | None] = []
+        self._incoming: list[set[Edge]] = []
+        self._outgoing: list[set[Edge]] = []
+        self._count = 0
+        # edges by key with the interned ids of their source and target
+        self.edges: dict[Hashable, tuple[Edge, int, int]] = {}
+        # edges by key of each pair of interned source and target ids
+        self._pairs: dict[tuple[int, int], dict[Hashable, Edge]] = {}
+
+    def intern(self, id: str) -> int:
+        """Return the integer of a node id, a new id gets the next integer."""
+        index = self._ids.get(id)
+        if index is None:
+            index = self._ids[id] = len(self._keys)
+            self._keys.append(id)
+            self._nodes.append(None)
+            self._kinds.append(None)
+            self._incoming.append(set())
+            self._outgoing.append(set())
+        return index
+
+    def __contains__(self, id: str) -> bool:
+        """Return whether a node with an id exists."""
+        index = self._ids.get(id)
+        return index is not None and self._nodes[index] is not None
+
+    def __len__(self) -> int:
+        """Return the number of nodes."""
+        return self._count
+
+    def __eq__(self, other: object) -> bool:
+        """Return whether two indexes have the same nodes by id and edges by key.
+
+        Models compare their private attributes, so the indexes of equal models have
+        to be equal independent of the order their ids were interned.
+        """
+        if not isinstance(other, GraphIndex):
+            return NotImplemented
+        return self._node_map() == other._node_map() and {
+            key: entry[0] for key, entry in self.edges.items()
+        } == {key: entry[0] for key, entry in other.edges.items()}
+
+    def _node_map(self) -> dict[str, Node]:
+        """Return the nodes by id."""
+        return dict(zip(self.node_ids(), self.nodes()))
+
+    def node(self, id: str) -> Node:
+        """Return the node of an id, raise KeyError if it has no node."""
+        node = self._nodes[self._ids[id]]
+        if node is None:
+            raise KeyError(id)
+        return node
+
+    def get(self, id: str) -> Node | None:
+        """Return the node of an id or None."""
+        index = self._ids.get(id)
+        return None if index is None else self._nodes[index]
+
+    def kind(self, id: str) -> type | None:
+        """Return the type of the node of an id or None."""
+        index = self._ids.get(id)
+        return None if index is None else self._kinds[index]
+
+    def nodes(self) -> Iterator[Node]:
+        """Return the nodes in the order their ids were interned."""
+        return (node for node in self._nodes if node is not None)
+
+    def node_ids(self) -> Iterator[str]:
+        """Return the ids of the nodes in the order they were interned."""
+        return (key for key, node in zip(self._keys, self._nodes) if node is not None)
+
+    def add_node(self, id: str, node: Node):
+        """Set the node of an id, it keeps the edges of the id."""
+        index = self.intern(id)
+        if self._nodes[index] is None:
+            self._count += 1
+        self._nodes[index] = node
+        self._kinds[index] = type(node)
+
+    def remove_node(self, id: str) -> tuple[set[Edge], set[Edge]]:
+        """Remove the node of an id and return its detached incoming and outgoing edges.
+
+        The edges stay in the index, they reference the id without node.
+        """
+        index = self._ids[id]
+        if self._nodes[index] is not None:
+            self._count -= 1
+        self._nodes[index] = None
+        self._kinds[index] = None
+        incoming, outgoing = self._incoming[index], self._outgoing[index]
+        self._incoming[index] = set()
+        self._outgoing[index] = set()
+        return incoming, outgoing
+
+    def incoming(self, id: str) -> set[Edge]:
+        """Return the incoming edges of an id, the set is part of the index."""
+        index = self._ids.get(id)
+        return set() if index is None else self._incoming[index]
+
+    def outgoing(self, id: str) -> set[Edge]:
+        """Return the outgoing edges of an id, the set is part of the index."""
+        index = self._ids.get(id)
+        return set() if index is None else self._outgoing[index]
+
+    def add_edge(self, key: Hashable, edge: Edge, source: str, target: str):
+        """Add an edge by key from a source to a target id, it replaces the key."""
+        if key in self.edges:
+            self.remove_edge(key)
+        source_index = self.intern(source)
+        target_index = self.intern(target)
+        self.edges[key] = (edge, source_index, target_index)
+        self._pairs.setdefault((source_index, target_index), {})[key] = edge
+        self._outgoing[source_index].add(edge)
+        self._incoming[target_index].add(edge)
+
+    def remove_edge(self, key: Hashable) -> Edge:
+        """Remove the edge of a key from the adjacency of its endpoints."""
+        edge, source_index, target_index = self.edges.pop(key)
+        pair = (source_index, target_index)
+        between = self._pairs[pair]
+        del between[key]
+        if not between:
+            del self._pairs[pair]
+        self._outgoing[source_index].discard(edge)
+        self._incoming[target_index].discard(edge)
+        return edge
+
+    def move_edge(self, key: Hashable, source: str, target: str):
+        """Index the edge of a key from a new source to a new target id."""
+        self.add_edge(key, self.remove_edge(key), source, target)
+
+    def edge(self, key: Hashable) -> Edge | None:
+        """Return the edge of a key or None."""
+        entry = self.edges.get(key)
+        return None if entry is None else entry[0]
+
+    def edge_between(self, source: str, target: str) -> Edge | None:
+        """Return the first added edge from a source to a target id or None."""
+        source_index = self._ids.get(source)
+        target_index = self._ids.get(target)
+        if source_index is None or target_index is None:
+            return None
+        between = self._pairs.get((source_index, target_index))
+        return None if between is None else next(iter(between.values()))
+
+
+class NodeView(Generic[Node]):
+    """Live view of the nodes of a kind in the sets of the node types of a model.
+
+    Nodes added to or removed from the sets are seen by the view, its length is the
+    sum of the sizes of the sets. Like a set, a view can't be iterated while its
+    nodes change, a pass changing them iterates a list of the view.
+    """
+
+    __slots__ = ("_sets",)
+
+    def __init__(self, type_map: Mapping[type, set], kind: type | tuple[type, ...]):
+        """Create a view of the sets of the subtypes of a kind or tuple of kinds."""
+        self._sets: tuple[set[Node], ...] = tuple(
+            nodes for node_type, nodes in type_map.items() if issubclass(node_type, kind)
+        )
+
+    def __iter__(self) -> Iterator[Node]:
+        """Return the nodes set by set."""
+        return chain.from_iterable(self._sets)
+
+    def __len__(self) -> int:
+        """Return the number of nodes."""
+        return sum(len(nodes) for nodes in self._sets)
+
+    def __contains__(self, node: object) -> bool:
+        """Return whether a node is part of the view."""
+        return any(node in nodes for nodes in self._sets)
@@ -0,0 +1,375 @@
+"""Layered (Sugiyama-style) layout of directed graphs from left to right.
+
+The layout runs in near-linear time in the number of nodes and edges:
+
+1. Cycles are broken by reversing the back edges of a depth-first search.
+2. Nodes are ranked into layers by their longest path from a source.
+3. Edges spanning several layers get dummy nodes in each crossed layer. Edges
+   spanning more than MAX_SPAN layers are routed above the nodes instead, so
+   the number of dummy nodes stays linear in the number of edges.
+4. Crossings are reduced by a few barycenter sweeps, nodes of a group (lane)
+   stay next to each other.
+5. Coordinates are assigned layer by layer, each node as close as possible to
+   the center of its predecessors in the same group.
+
+Nodes, edges and adjacencies are kept in flat lists of numbers indexed by node
+and edge, so large graphs do not allocate objects per node or edge for the
+garbage collector to track. Coordinates are multiples of a half.
+"""
+
+from typing import NamedTuple
+
+# space between two layers and between two nodes of a layer
+LAYER_GAP = 50.0
+NODE_GAP = 30.0
+# space above and below the nodes of a group
+GROUP_PADDING = 20.0
+# barycenter sweeps (down and up) to reduce crossings
+SWEEPS = 4
+# most layers spanned by an edge with dummy nodes
+MAX_SPAN = 8
+
+Point = tuple[float, float]
+
+
+class GraphLayout(NamedTuple):
+    """Positions of the nodes and routes of the edges of a graph layout.
+
+    A position is the upper left corner of a node. A route holds the waypoints
+    of an edge. A band holds the upper and lower y of the nodes of a group.
+    """
+
+    positions: dict[str, Point]
+    routes: list[list[Point]]
+    bands: list[tuple[float, float]]
+    width: float
+    height: float
+
+
+def adjacency(count: int, sources: list[int], targets: list[int] | range):
+    """Return the targets of each source as offsets into a flat list.
+
+    The targets of node v are targets[offsets[v]:offsets[v + 1]].
+    """
+    offsets = [0] * (count + 1)
+    for source in sources:
+        offsets[source + 1] += 1
+    for v in range(count):
+        offsets[v + 1] += offsets[v]
+    free = offsets[:-1]
+    adjacent = [0] * len(sources)
+    for source, target in zip(sources, targets):
+        adjacent[free[source]] = target
+        free[source] += 1
+    return offsets, adjacent
+
+
+def break_cycles(count: int, sources: list[int], targets: list[int]):
+    """Return a flag for each edge whether it is reversed to break a cycle.
+
+    Back edges of a depth-first search are reversed, the search starts at the
+    nodes without predecessors.
+    """
+    offsets, out_edges = adjacency(count, sources, range(len(sources)))
+    has_predecessor = bytearray(count)
+    for target in targets:
+        has_predecessor[target] = 1
+    roots = [v for v in range(count) if not has_predecessor[v]]
+    roots += [v for v in range(count) if has_predecessor[v]]
+
+    cursor = offsets[:-1]
+    state = bytearray(count)  # 0 unvisited, 1 on stack, 2 done
+    reverse = bytearray(len(sources))
+    for root in roots:
+        if state[root]:
+            continue
+        state[root] = 1
+        stack = [root]
+        while stack:
+            node = stack[-1]
+            if cursor[node] == offsets[node + 1]:
+                state[node] = 2
+                stack.pop()
+                continue
+            edge = out_edges[cursor[node]]
+            cursor[node] += 1
+            target = targets[edge]
+            if state[target] == 1:
+                reverse[edge] = 1
+            elif state[target] == 0:
+                state[target] = 1
+                stack.append(target)
+    return reverse
+
+
+def rank_layers(count: int, sources: list[int], targets: list[int]):
+    """Return the layer of each node of an acyclic graph by its longest path."""
+    offsets, successors = adjacency(count, sources, targets)
+    in_degree = [0] * count
+    for target in targets:
+        in_degree[target] += 1
+    layer = [0] * count
+    queue = [v for v in range(count) if in_degree[v] == 0]
+    for node in queue:
+        for target in successors[offsets[node] : offsets[node + 1]]:
+            layer[target] = max(layer[target], layer[node] + 1)
+            in_degree[target] -= 1
+            if in_degree[target] == 0:
+                queue.append(target)
+    return layer
+
+
+def order_layers(
+    order: list[int],
+    bounds: list[int],
+    upper: list[int],
+    lower: list[int],
+    group: list[int],
+):
+    """Reorder the nodes of each layer to reduce crossings of the edges.
+
+    The nodes of layer l are order[bounds[l]:bounds[l + 1]], each edge connects
+    an upper with a lower node of the next layer.
+    """
+    count = len(group)
+    position = [0] * count
+    for start, end in zip(bounds, bounds[1:]):
+        for i in range(start, end):
+            position[order[i]] = i - start
+    key = [0.0] * count
+
+    def sweep(layers: range, offsets: list[int], adjacent: list[int]):
+        for layer in layers:
+            start, end = bounds[layer], bounds[layer + 1]
+            if end - start < 2:
+                continue
+            nodes = order[start:end]
+            for node in nodes:
+                first, last = offsets[node], offsets[node + 1]
+                if first < last:
+                    neighbours = adjacent[first:last]
+                    barycenter = sum(position[v] for v in neighbours) / (last - first)
+                else:
+                    barycenter = position[node]
+                # a barycenter is below the count of nodes, groups come first
+                key[node] = group[node] * count + barycenter
+            nodes.sort(key=key.__getitem__)
+            order[start:end] = nodes
+            for i, node in enumerate(nodes):
+                position[node] = i
+
+    predecessors = adjacency(count, lower, upper)
+    successors = adjacency(count, upper, lower)
+    layer_count = len(bounds) - 1
+    for _ in range(SWEEPS):
+        sweep(range(1, layer_count), *predecessors)
+        sweep(range(layer_count - 2, -1, -1), *successors)
+
+
+def half(value: float):
+    """Return a value rounded to a multiple of a half."""
+    return round(value * 2) / 2
+
+
+def layered_layout(
+    sizes: dict[str, tuple[float, float]],
+    edges: list[tuple[str, str]],
+    groups: dict[str, int] | None = None,
+    group_count: int = 1,
+    origin: Point = (0.0, 0.0),
+):
+    """Return a layout of nodes (width, height by id) connected by edges.
+
+    Nodes can be assigned to groups (0 to group_count - 1), which are placed as
+    horizontal bands from top to bottom. Nodes without group are in group 0. The
+    layout starts at the origin.
+    """
+    index = {id: i for i, id in enumerate(sizes)}
+    count = len(index)
+    sources = [index[source] for source, _ in edges]
+    targets = [index[target] for _, target in edges]
+    reverse = break_cycles(count, sources, targets)
+    upper = [t if r else s for s, t, r in zip(sources, targets, reverse)]
+    lower = [s if r else t for s, t, r in zip(sources, targets, reverse)]
+    edge_range = range(len(edges))
+    layer = rank_layers(
+        count,
+        [upper[e] for e in edge_range if upper[e] != lower[e]],
+        [lower[e] for e in edge_range if upper[e] != lower[e]],
+    )
+    width = [size[0] for size in sizes.values()]
+    height = [size[1] for size in sizes.values()]
+    if groups:
+        group = [groups.get(id, 0) for id in sizes]
+    else:
+        group = [0] * count
+
+    # proper edges between neighbouring layers, the dummy nodes of an edge have
+    # consecutive numbers starting at first_dummy
+    first_dummy = [-1] * len(edges)
+    proper_upper: list[int] = []
+    proper_lower: list[int] = []
+    for e in edge_range:
+        source, target = upper[e], lower[e]
+        if source == target or layer[target] - layer[source] > MAX_SPAN:
+            continue
+        first_dummy[e] = len(layer)
+        previous = source
+        for dummy_layer in range(layer[source] + 1, layer[target]):
+            dummy = len(layer)
+            layer.append(dummy_layer)
+            group.append(group[source])
+            proper_upper.append(previous)
+            proper_lower.append(dummy)
+            previous = dummy
+        proper_upper.append(previous)
+        proper_lower.append(target)
+    total = len(layer)
+    width += [0.0] * (total - count)
+    height += [0.0] * (total - count)
+
+    # nodes by layer, the nodes of layer l are order[bounds[l]:bounds[l + 1]]
+    order = sorted(range(total), key=layer.__getitem__)
+    layer_count = layer[order[-1]] + 1 if order else 0
+    bounds = [0] * (layer_count + 1)
+    for node_layer in layer:
+        bounds[node_layer + 1] += 1
+    for node_layer in range(layer_count):
+        bounds[node_layer + 1] += bounds[node_layer]
+    order_layers(order, bounds, proper_upper, proper_lower, group)
+
+    # x by layer, nodes are centered in the width of their layer
+    x = [0.0] * total
+    layer_x = origin[0]
+    for start, end in zip(bounds, bounds[1:]):
+        nodes = order[start:end]
+        layer_width = max(width[v] for v in nodes)
+        for node in nodes:
+            x[node] = layer_x + half((layer_width - width[node]) / 2)
+        layer_x += layer_width + LAYER_GAP
+
+    # y relative to the group band, each node close to the center of its
+    # predecessors and nodes without predecessors close to their successors
+    center = [0.0] * total
+    pred_offsets, predecessors = adjacency(total, proper_lower, proper_upper)
+    succ_offsets, successors = adjacency(total, proper_upper, proper_lower)
+    for start, end in zip(bounds, bounds[1:]):
+        previous_group = -1
+        free_y = 0.0
+        for node in order[start:end]:
+            node_group = group[node]
+            if node_group != previous_group:
+                previous_group = node_group
+                free_y = GROUP_PADDING
+            y = free_y
+            aligned = [
+                center[v]
+                for v in predecessors[pred_offsets[node] : pred_offsets[node + 1]]
+                if group[v] == node_group
+            ]
+            if aligned:
+                y = max(y, half(sum(aligned) / len(aligned) - height[node] / 2))
+            center[node] = y + height[node] / 2
+            free_y = y + height[node] + NODE_GAP
+
+    band_height = [2 * GROUP_PADDING] * group_count
+    for start, end in zip(reversed(bounds[:-1]), reversed(bounds[1:])):
+        previous_group = -1
+        limit = 0.0
+        for node in reversed(order[start:end]):
+            node_group = group[node]
+            if node_group != previous_group:
+                previous_group = node_group
+                limit = float("inf")
+            if pred_offsets[node] == pred_offsets[node + 1]:
+                aligned = [
+                    center[v]
+                    for v in successors[succ_offsets[node] : succ_offsets[node + 1]]
+                    if group[v] == node_group
+                ]
+                if aligned:
+                    target = half(sum(aligned) / len(aligned))
+                    target = min(target, limit - height[node] / 2)
+                    center[node] = max(center[node], target)
+            top = center[node] - height[node] / 2
+            limit = top - NODE_GAP
+            bottom = top + height[node] + GROUP_PADDING
+            band_height[node_group] = max(band_height[node_group], bottom)
+
+    bands: list[tuple[float, float]] = []
+    band_top = [0.0] * group_count
+    y = origin[1]
+    for group_index, group_height in enumerate(band_height):
+        band_top[group_index] = y
+        bands.append((y, y + group_height))
+        y += group_height
+    for node in range(total):
+        center[node] += band_top[group[node]]
+
+    positions = {
+        id: (x[i], center[i] - height[i] / 2) for id, i in zip(sizes, range(count))
+    }
+    routes: list[list[Point]] = []
+    for e in edge_range:
+        source, target = sources[e], targets[e]
+        if source == target:
+            top = center[source] - height[source] / 2
+            routes.append(loop_route(x[source], top, width[source], height[source]))
+        elif first_dummy[e] >= 0:
+            dummies = layer[lower[e]] - layer[upper[e]] - 1
+            chain = [upper[e], *range(first_dummy[e], first_dummy[e] + dummies)]
+            chain.append(lower[e])
+            route = chain_route(chain, x, center, width)
+            routes.append(route[::-1] if reverse[e] else route)
+        else:
+            channel = band_top[group[source]] + GROUP_PADDING / 2
+            start = (x[source] + width[source], center[source])
+            routes.append(channel_route(start, (x[target], center[target]), channel))
+    return GraphLayout(
+        positions,
+        routes,
+        bands,
+        max(layer_x - LAYER_GAP - origin[0], 0.0),
+        y - origin[1],
+    )
+
+
+def chain_route(
+    chain: list[int], x: list[float], center: list[float], width: list[float]
+):
+    """Return the waypoints from the right of the first to the left of the last node.
+
+    Neighbouring nodes at different heights are connected orthogonally.
+    """
+    source, target = chain[0], chain[-1]
+    start = (x[source] + width[source], center[source])
+    end = (x[target], center[target])
+    if len(chain) == 2 and start[1] != end[1]:
+        middle = half((start[0] + end[0]) / 2)
+        return [start, (middle, start[1]), (middle, end[1]), end]
+    return [start, *((x[v], center[v]) for v in chain[1:-1]), end]
+
+
+def channel_route(start: Point, end: Point, channel: float):
+    """Return the waypoints of a long edge along a channel above the nodes."""
+    start_x = start[0] + LAYER_GAP / 2
+    end_x = end[0] - LAYER_GAP / 2
+    return [
+        start,
+        (start_x, start[1]),
+        (start_x, channel),
+        (end_x, channel),
+        (end_x, end[1]),
+        end,
+    ]
+
+
+def loop_route(x: float, y: float, width: float, height: float):
+    """Return the waypoints of an edge from the right to the top of a node."""
+    center = y + height / 2
+    right = x + width + NODE_GAP / 2
+    top = y - NODE_GAP / 2
+    middle = x + half(width / 2)
+    return [(x + width, center), (right, center), (right, top), (middle, top)] + [
+        (middle, y)
+    ]
@@ -0,0 +1,111 @@
+"""Limits of the size and nesting of posted models checked while parsing.
+
+The limits are checked on the parse events of the streaming parser, so a too large
+or too deeply nested model is rejected before its remaining elements are read.
+"""
+
+from collections.abc import Iterable
+
+from pydantic import BaseModel
+
+from app.transform.exceptions import ModelLimitExceeded
+
+
+class ModelLimits(BaseModel):
+    """Maximum size and nesting of a model, None disables a limit."""
+
+    max_elements: int | None = None
+    max_depth: int | None = None
+    max_subprocess_depth: int | None = None
+    max_connections: int | None = None
+
+
+class LimitedEvents:
+    """Iterator of start and end parse events that enforces model limits.
+
+    Subprocesses (or pages) and connections (flows or arcs) are recognized by the
+    local name of their tag.
+    """
+
+    def __init__(
+        self,
+        events: Iterable,
+        limits: ModelLimits,
+        subprocess_tag: str,
+        connection_tag: str,
+    ):
+        """Wrap the events of a parser requested with start and end events."""
+        self._events = events
+        self._limits = limits
+        self._subprocess_tag = subprocess_tag
+        self._connection_tag = connection_tag
+
+    @property
+    def root(self):
+        """Return the root element of the parsed document."""
+        return self._events.root  # type: ignore[attr-defined]
+
+    def __iter__(self):
+        """Yield the parse events and raise as soon as a limit is exceeded."""
+        limits = self._limits
+        max_elements = limits.max_elements or float("inf")
+        max_depth = limits.max_depth or float("inf")
+        max_subprocess_depth = limits.max_subprocess_depth or float("inf")
+        max_connections = limits.max_connections or float("inf")
+
+        # local tag names of the subprocess and connection tags with namespace
+        kinds: dict[str, str | None] = {}
+        # kind of each open element
+        open_kinds: list[str | None] = []
+        elements = depth = subprocess_depth = connections = 0
+        for event, elem in self._events:
+            if event == "end":
+                depth -= 1
+                if open_kinds.pop() == self._subprocess_tag:
+                    subprocess_depth -= 1
+                yield event, elem
+                continue
+
+            tag = elem.tag
+            kind = kinds.get(tag, "")
+            if kind == "":
+                local_name = tag.rpartition("}")[2]
+                kind = kinds[tag] = (
+                    local_name
+                    if local_name in (self._subprocess_tag, self._connection_tag)
+                    else None
+                )
+            open_kinds.append(kind)
+
+            elements += 1
+            if elements > max_elements:
+                raise ModelLimitExceeded("max_elements", limits.max_elements)
+            depth += 1
+            if depth > max_depth:
+                raise ModelLimitExceeded("max_depth", limits.max_depth)
+            if kind == self._subprocess_tag:
+                subprocess_depth += 1
+                if subprocess_depth > max_subprocess_depth:
+                    raise ModelLimitExceeded(
+                        "max_subprocess_depth", limits.max_subprocess_depth
+                    )
+            elif kind == self._connection_tag:
+                connections += 1
+                if connections > max_connections:
+                    raise ModelLimitExceeded("max_connections", limits.max_connections)
+            yield event, elem
+
+
+def limit_events(
+    events: Iterable,
+    limits: ModelLimits | None,
+    subprocess_tag: str,
+    connection_tag: str,
+):
+    """Return the start and end parse events checked against the limits.
+
+    Without limits the events are returned as they are.
+    """
+    if limits is None:
+        return events
+    return LimitedEvents(events, limits, subprocess_tag, connection_tag)
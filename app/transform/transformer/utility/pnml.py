@@ -31,12 +31,7 @@ def generate_sink_id(id: str):
 
 def find_triggers(net: Net):
     """Find all event triggers."""
-    all_types = net._flatten_node_typ_map()
-
-    net_elements: list[NetElement] = [
-        node for node in all_types if isinstance(node, NetElement)
-    ]
     triggers: list[NetElement] = [
-        trigger for trigger in net_elements if trigger.is_workflow_event_trigger()
+        trigger for trigger in net.get_elements() if trigger.is_workflow_event_trigger()
     ]
     return triggers
@@ -0,0 +1,120 @@
+"""Self-check of the fast serialization paths against pydantic_xml.
+
+The compiled emitters (see xml_emitter) and the chunk writer (see xml_writer) use
+private internals of pydantic_xml and the standard library serializer. A changed
+behaviour of these internals wouldn't raise, but silently write other XML. The
+app writes sample models both ways at startup (otherwise they are written before
+the first model is serialized). On a mismatch the fast path isn't used and the
+models are serialized by pydantic_xml.
+"""
+
+import logging
+import xml.etree.ElementTree as ET
+
+from app.transform.transformer.models.bpmn.bpmn import (
+    BPMN,
+    EndEvent,
+    Lane,
+    LaneSet,
+    StartEvent,
+    Task,
+    UserTask,
+    XorGateway,
+)
+from app.transform.transformer.models.pnml.pnml import Net, Page, Place, Pnml, Transition
+from app.transform.transformer.models.pnml.workflow import WorkflowBranchingType
+from app.transform.transformer.utility.xml_emitter import compile_emitter
+from app.transform.transformer.utility.xml_writer import XML_HEADER
+
+logger = logging.getLogger(__name__)
+
+# name with the characters escaped in attributes and texts
+ESCAPED_NAME = 'a & <b>\n"c"\t'
+
+
+def sample_pnml() -> Pnml:
+    """Return a net with names, operators, resources, arcs and a page."""
+    pnml = Pnml.generate_empty_net("net")
+    net = pnml.net
+    start = net.add_element(Place.create(id='p"1&<', name=ESCAPED_NAME))
+    split = net.add_element(Transition.create(id="t1", name="split"))
+    split.mark_as_workflow_operator(WorkflowBranchingType.XorSplit, "t1")
+    task = net.add_element(Transition.create(id="t2", name="task"))
+    task.mark_as_workflow_resource("role", "unit")
+    subprocess = net.add_element(Transition.create(id="s1", name="subprocess"))
+    subprocess.mark_as_workflow_subprocess()
+    middle = net.add_element(Place.create(id="p2"))
+    end = net.add_element(Place.create(id="p3"))
+    net.add_arc(start, split)
+    net.add_arc(split, middle)
+    net.add_arc(middle, task)
+    net.add_arc(middle, subprocess)
+    net.add_arc(task, end)
+    net.add_arc(subprocess, end)
+    page_net = Net(id="s1")
+    page_net.add_element(Place.create(id="p2", name="inner"))
+    net.add_page(Page(id="s1", net=page_net))
+    return pnml
+
+
+def sample_bpmn() -> BPMN:
+    """Return a process with events, tasks, a gateway, flows and a lane."""
+    bpmn = BPMN.generate_empty_bpmn("process")
+    process = bpmn.process
+    start = process.add_node(StartEvent(id="start"))
+    split = process.add_node(XorGateway(id="split"))
+    task = process.add_node(Task(id="task", name=ESCAPED_NAME))
+    user_task = process.add_node(UserTask(id="user", name="user task"))
+    end = process.add_node(EndEvent(id="end"))
+    process.add_flow(start, split)
+    process.add_flow(split, task)
+    process.add_flow(split, user_task)
+    process.add_flow(task, end)
+    process.add_flow(user_task, end)
+    lane = Lane(id="lane", name="lane", flowNodeRefs={"task", "user"})
+    process.lane_sets.add(LaneSet(id="lanes", lanes={lane}))
+    return bpmn
+
+
+def check_emitters() -> bool:
+    """Return whether the emitters write the sample net like pydantic_xml.
+
+    The compact text of the net must read as the same net. Emitters don't declare
+    namespaces, the writer declares them for the emitted items. So the items of
+    namespaced models like BPMN are checked by check_chunks.
+    """
+    try:
+        pnml = sample_pnml().canonical()
+        expected = ET.tostring(pnml.to_xml_tree(), encoding="unicode")
+        # the compact text reads as the same net
+        compact = Pnml.from_xml_str(compile_emitter(Pnml, compact=True).to_xml(pnml))
+        emitted = compile_emitter(Pnml).to_xml(compact.canonical())
+        if compile_emitter(Pnml).to_xml(pnml) != expected or emitted != expected:
+            logger.warning(
+                "Emitted PNML differs from pydantic_xml, models are serialized by "
+                "pydantic_xml"
+            )
+            return False
+    except Exception:
+        logger.warning("Emitters can't write the sample net", exc_info=True)
+        return False
+    return True
+
+
+def check_chunks() -> bool:
+    """Return whether the chunks of the sample models join to their XML.
+
+    The items of the chunks are written by their emitters.
+    """
+    try:
+        for model in (sample_pnml(), sample_bpmn()):
+            if "".join(model.to_chunks()) != XML_HEADER + model.to_string():
+                logger.warning(
+                    f"Chunks of {type(model).__name__} differ from pydantic_xml, "
+                    "documents are serialized as a whole"
+                )
+                return False
+    except Exception:
+        logger.warning("Chunks of the sample models can't be written", exc_info=True)
+        return False
+    return True
@@ -1,7 +1,21 @@
 """General transformer utility (get name, create basic elements/nodes)."""
 
+import functools
+from collections import OrderedDict
+from collections.abc import Iterable
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    ForwardRef,
+    Self,
+    TypeVar,
+    cast,
+    get_args,
+    get_origin,
+)
 from xml.etree.ElementTree import Element
 
+from pydantic import model_validator
 from pydantic_xml import BaseXmlModel, attr
 
 from app.transform.exceptions import InternalTransformationException
@@ -47,9 +61,180 @@ class BaseModel(  # type: ignore[call-arg]
         """Return hash of this instance."""
         return hash((type(self),) + (self.id,))
 
+    if not TYPE_CHECKING:
+        # outside of TYPE_CHECKING like pydantic, so mypy checks attribute access
+
+        def __getattr__(self, item: str) -> Any:
+            """Return a private attribute without the descriptor check of pydantic.
+
+            The graph indexes of nets and processes are private attributes, which the
+            transformation passes read for each operation.
+            """
+            if item in type(self).__private_attributes__:
+                try:
+                    return self.__pydantic_private__[item]
+                except (KeyError, TypeError):
+                    pass
+            return super().__getattr__(item)
+
+    def sort_key(self) -> tuple[str, ...]:
+        """Return the key of this instance in the canonical order of a collection."""
+        return (self.id or "",)
+
+    def canonical(self) -> Self:
+        """Return this instance with its collections in a stable order.
+
+        Sets are iterated in the order of their hashes, which differs between
+        processes. Sets of the returned copy are replaced by sorted lists, so an
+        equal model is always serialized to the same XML. This instance is
+        returned unchanged if it has no sets to sort.
+        """
+        update: dict[str, Any] = {}
+        for field in nested_fields(type(self)):
+            value = getattr(self, field)
+            if isinstance(value, set | frozenset):
+                items = canonical_items(value)
+                if len(items) > 1 or items and items[0] is not next(iter(value)):
+                    update[field] = items
+            elif isinstance(value, BaseModel):
+                copy = value.canonical()
+                if copy is not value:
+                    update[field] = copy
+        if not update:
+            return self
+        return self.model_copy(update=update)
+
 
 class BaseBPMNModel(  # type: ignore[call-arg]
     BaseModel,
     nsmap={"": "http://www.omg.org/spec/BPMN/20100524/MODEL"},
 ):
     """BaseBPMNModel extension of BaseXmlModel."""
+
+
+class SharedModel(BaseModel, frozen=True):
+    """Immutable model, whose equal instances are shared.
+
+    Graphics and toolspecific parts are mostly equal for the elements of a net, so
+    a validated field value (e.g. a parsed part) is replaced by the equal instance of
+    the flyweight pool. The constructor returns a new instance, which is shared by
+    passing it to `flyweight`. Changing a shared instance raises an error, a changed
+    part is a copy of it (copy on write with `model_copy(update=...)`).
+    """
+
+    def __hash__(self):
+        """Return hash of the type and values of this instance."""
+        return hash((type(self), *self.__dict__.values()))
+
+    @model_validator(mode="after")
+    def _share(self) -> Self:
+        """Return the pooled instance equal to this instance."""
+        return flyweight(self)
+
+
+SharedModelT = TypeVar("SharedModelT", bound=SharedModel)
+
+# maximum number of instances of the flyweight pool
+FLYWEIGHT_LIMIT = 4096
+
+# pooled instances from the least to the most recently used
+_flyweights: OrderedDict[SharedModel, SharedModel] = OrderedDict()
+
+
+def flyweight(value: SharedModelT) -> SharedModelT:
+    """Return the pooled instance equal to a shared model, pool it if it's new.
+
+    Once the pool is full the least recently used instance is dropped. Common values
+    like default graphics are used by most elements and stay pooled, unique values
+    like positions are dropped after a while.
+    """
+    pooled = _flyweights.get(value)
+    if pooled is not None:
+        try:
+            _flyweights.move_to_end(value)
+        except KeyError:
+            # dropped by another thread meanwhile
+            pass
+        return cast(SharedModelT, pooled)
+    _flyweights[value] = value
+    if len(_flyweights) > FLYWEIGHT_LIMIT:
+        _flyweights.popitem(last=False)
+    return value
+
+
+class HelperNode:
+    """Transient node of a transformation, which is never serialized.
+
+    Helper nodes are part of nets and processes like their models, but they are
+    plain objects with slots instead of validated models. Subclasses list their
+    attributes in `__slots__`, which are compared by equality.
+    """
+
+    __slots__ = ("id",)
+
+    def __init__(self, id: str):
+        """Create a helper node with an id."""
+        self.id = id
+
+    def _values(self):
+        """Return the values of all slots of the class and its bases."""
+        return tuple(
+            getattr(self, name)
+            for cls in type(self).__mro__
+            for name in cls.__dict__.get("__slots__", ())
+        )
+
+    def __eq__(self, other: object) -> bool:
+        """Return whether a node has the same type and values."""
+        return (
+            isinstance(other, HelperNode)
+            and type(other) is type(self)
+            and self._values() == other._values()
+        )
+
+    def __hash__(self):
+        """Return hash of this instance like the one of models."""
+        return hash((type(self),) + (self.id,))
+
+    def __repr__(self):
+        """Return the type and id of this instance."""
+        return f"{type(self).__name__}(id={self.id!r})"
+
+
+@functools.cache
+def nested_fields(model_type: type[BaseModel]) -> tuple[str, ...]:
+    """Return the fields of a model type, which may hold sets or models with sets."""
+    return tuple(
+        name
+        for name, field in model_type.model_fields.items()
+        if may_nest(field.annotation)
+    )
+
+
+def may_nest(annotation: Any) -> bool:
+    """Return whether a value of a field annotation may be or hold a set."""
+    if isinstance(annotation, str | ForwardRef):
+        return True
+    if get_origin(annotation) in (set, frozenset):
+        return True
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return len(nested_fields(annotation)) > 0
+    return any(may_nest(arg) for arg in get_args(annotation))
+
+
+def canonical_key(item: Any) -> tuple[str, ...]:
+    """Return the key of a model or text in the canonical order of a collection."""
+    if type(item) is str:
+        return (item,)
+    return item.sort_key()
+
+
+def canonical_items(items: Iterable[Any]) -> list[Any]:
+    """Return the canonical models or texts of a collection sorted by their keys.
+
+    The items of a collection are either all models or all texts.
+    """
+    items = list(items)
+    if items and isinstance(items[0], BaseModel):
+        items = [item.canonical() for item in items]
+    return sorted(items, key=canonical_key)
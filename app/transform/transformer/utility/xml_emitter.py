@@ -0,0 +1,319 @@
+"""Compiled XML emitters of model classes.
+
+pydantic_xml serializes a model by walking the field serializers of its class
+and building an element tree of each instance, which is serialized afterwards.
+An emitter is compiled once per model class from the same field serializers and
+writes the XML text of an instance directly. The text equals the text of the
+element tree of `to_xml_tree` serialized by the standard library.
+
+Classes with field serializers without an emitter (e.g. raw elements, mappings or
+computed fields) aren't compiled, their instances are serialized by pydantic_xml.
+
+Emitters rely on private internals of pydantic_xml and the standard library. If
+these are missing, classes aren't compiled and instances are serialized by
+pydantic_xml. A changed behaviour is found by the self-check of serializer_check,
+which compares the emitted text of a sample net before the first emitter is used.
+The internals aren't part of the API of pydantic_xml, so its version is pinned
+exactly in requirements/base.txt and only raised after the tests of the emitters
+pass with the new version.
+
+Compact emitters leave out elements whose value equals the default of their field
+and empty attributes whose default is empty. Parsing the compact text restores
+these defaults, so it reads as the same model.
+"""
+
+import xml.etree.ElementTree as ET
+from collections.abc import Callable
+from typing import Any
+
+from pydantic_core import PydanticUndefined, to_jsonable_python
+from pydantic_xml import BaseXmlModel
+from pydantic_xml.serializers.factories import homogeneous, model, primitive, union
+from pydantic_xml.serializers.serializer import encode_primitive
+
+# emitter of a field value, which returns the text of its elements
+ChildEmitter = Callable[[Any], str]
+
+# escaping of the standard library serializer, None if it's missing
+_escape_attrib = getattr(ET, "_escape_attrib", None)
+_escape_cdata = getattr(ET, "_escape_cdata", None)
+
+
+class NotCompilable(Exception):
+    """A model class uses serializers without an emitter."""
+
+
+def encode(value: Any) -> str:
+    """Return the text of a primitive value like pydantic_xml."""
+    if type(value) is str:
+        return value
+    return encode_primitive(to_jsonable_python(value))
+
+
+def element_text(tag: str, attributes: str, content: str) -> str:
+    """Return the text of an element, which is short if it has no content."""
+    if content:
+        return f"<{tag}{attributes}>{content}</{tag}>"
+    return f"<{tag}{attributes} />"
+
+
+class ModelEmitter:
+    """Emitter of the attributes and content of the instances of a model class."""
+
+    def __init__(self, model_type: type[BaseXmlModel], compact: bool = False):
+        """Create an emitter of a model class, which is compiled afterwards."""
+        self.model_type = model_type
+        self.compact = compact
+        self.tag = ""
+        # namespace uris of the tags of the model class itself
+        self.namespaces: set[str] = set()
+        self.nested: list[ModelEmitter] = []
+        self._attributes: list[tuple[str, str]] = []
+        self._children: list[tuple[str, ChildEmitter]] = []
+        self._text: str | None = None
+        # values of the fields left out by a compact emitter
+        self._defaults: dict[str, Any] = {}
+        self._all_namespaces: frozenset[str] | None = None
+
+    def compile(self):
+        """Compile the field serializers of the model class."""
+        serializer = self.model_type.__xml_serializer__
+        if (
+            type(serializer) is not model.ModelSerializer
+            or self.model_type.__xml_skip_empty__ is not True
+        ):
+            raise NotCompilable(self.model_type.__name__)
+        decorators = self.model_type.__pydantic_decorators__
+        if decorators.field_serializers or decorators.model_serializers:
+            raise NotCompilable(self.model_type.__name__)
+        self.tag = self.qualified_name(serializer._element_name)
+        excluded = serializer._fields_serialization_exclude
+        for name, field in serializer._field_serializers.items():
+            if name in excluded:
+                continue
+            if getattr(field, "_computed", False):
+                raise NotCompilable(f"{self.model_type.__name__}.{name}")
+            default = self.model_type.model_fields[name].default
+            if type(field) is primitive.AttributeSerializer:
+                attribute = self.qualified_name(field._attr_name)
+                self._attributes.append((name, f' {attribute}="'))
+                if self.compact and default == "":
+                    self._defaults[name] = default
+            elif type(field) is primitive.TextSerializer:
+                self._text = name
+            else:
+                self._children.append((name, self.child_emitter(field)))
+                if self.compact and default not in (None, PydanticUndefined):
+                    self._defaults[name] = default
+
+    def qualified_name(self, name: str):
+        """Return the name of a tag or attribute with the prefix of its namespace."""
+        if not name.startswith("{"):
+            return name
+        uri, local = name[1:].split("}", 1)
+        prefix = ET._namespace_map.get(uri)  # type: ignore[attr-defined]
+        if prefix is None:
+            raise NotCompilable(f"namespace {uri} has no registered prefix")
+        self.namespaces.add(uri)
+        return f"{prefix}:{local}"
+
+    def child_emitter(self, field) -> ChildEmitter:
+        """Return the emitter of the elements of a field serializer."""
+        if getattr(field, "_nillable", False):
+            raise NotCompilable(f"{self.model_type.__name__} has a nillable field")
+        if type(field) is primitive.ElementSerializer:
+            return self.primitive_emitter(self.qualified_name(field._element_name))
+        if type(field) is model.ModelProxySerializer:
+            nested = compile_emitter(field.model, self.compact)
+            self.nested.append(nested)
+            tag = self.qualified_name(field._element_name)
+            if self.compact:
+                return self.compact_model_emitter(
+                    tag, nested, compile_emitter(field.model)
+                )
+            return self.model_emitter(tag, nested)
+        if type(field) is union.ModelSerializer:
+            emitters = {
+                proxy.model: self.child_emitter(proxy)
+                for proxy in field._inner_serializers
+            }
+            return self.union_emitter(emitters)
+        if type(field) is homogeneous.ElementSerializer:
+            return self.collection_emitter(self.child_emitter(field._inner_serializer))
+        raise NotCompilable(f"{self.model_type.__name__}: {type(field).__name__}")
+
+    @staticmethod
+    def primitive_emitter(tag: str) -> ChildEmitter:
+        """Return the emitter of an element with a primitive value as text."""
+
+        def emit(value):
+            if value is None:
+                return ""
+            text = encode(value)
+            if not text:
+                return ""
+            return f"<{tag}>{_escape_cdata(text)}</{tag}>"
+
+        return emit
+
+    @staticmethod
+    def model_emitter(tag: str, nested: "ModelEmitter") -> ChildEmitter:
+        """Return the emitter of an element of a nested model, empty ones are skipped."""
+
+        def emit(value):
+            if value is None:
+                return ""
+            attributes, content = nested(value)
+            if not attributes and not content:
+                return ""
+            return element_text(tag, attributes, content)
+
+        return emit
+
+    @staticmethod
+    def compact_model_emitter(
+        tag: str, nested: "ModelEmitter", full: "ModelEmitter"
+    ) -> ChildEmitter:
+        """Return the compact emitter of an element of a nested model.
+
+        An element left empty by leaving out its defaults is kept if the full
+        element isn't empty, parsing it restores the model instead of None.
+        """
+
+        def emit(value):
+            if value is None:
+                return ""
+            attributes, content = nested(value)
+            if not attributes and not content and full(value) == ("", ""):
+                return ""
+            return element_text(tag, attributes, content)
+
+        return emit
+
+    @staticmethod
+    def union_emitter(emitters: dict[type, ChildEmitter]) -> ChildEmitter:
+        """Return the emitter of a union of models, chosen by the class of a value."""
+
+        def emit(value):
+            emitter = emitters.get(type(value))
+            return "" if emitter is None else emitter(value)
+
+        return emit
+
+    @staticmethod
+    def collection_emitter(item_emitter: ChildEmitter) -> ChildEmitter:
+        """Return the emitter of the items of a collection."""
+
+        def emit(value):
+            if not value:
+                return ""
+            return "".join([item_emitter(item) for item in value if item is not None])
+
+        return emit
+
+    def field_emitter(self, name: str) -> ChildEmitter:
+        """Return the emitter of the elements of a field of the model class."""
+        return dict(self._children)[name]
+
+    def __call__(self, instance) -> tuple[str, str]:
+        """Return the attributes and the content of the element of an instance."""
+        values = instance.__dict__
+        defaults = self._defaults
+        attributes = [
+            f'{start}{_escape_attrib(encode(values[name]))}"'
+            for name, start in self._attributes
+            if values[name] is not None
+            and (name not in defaults or values[name] != defaults[name])
+        ]
+        content = [
+            emit(values[name])
+            for name, emit in self._children
+            if name not in defaults or values[name] != defaults[name]
+        ]
+        if self._text is not None and values[self._text] is not None:
+            content.insert(0, _escape_cdata(encode(values[self._text])))
+        return "".join(attributes), "".join(content)
+
+    def to_xml(self, instance) -> str:
+        """Return the element of an instance with the tag of the model class."""
+        return element_text(self.tag, *self(instance))
+
+    @property
+    def all_namespaces(self) -> frozenset[str]:
+        """Return the namespace uris of the tags of the class and nested classes."""
+        if self._all_namespaces is None:
+            found: set[str] = set()
+            visited: set[int] = set()
+            pending = [self]
+            while pending:
+                emitter = pending.pop()
+                if id(emitter) in visited:
+                    continue
+                visited.add(id(emitter))
+                found |= emitter.namespaces
+                pending.extend(emitter.nested)
+            self._all_namespaces = frozenset(found)
+        return self._all_namespaces
+
+
+_emitters: dict[tuple[type, bool], ModelEmitter | None] = {}
+
+
+def compile_emitter(
+    model_type: type[BaseXmlModel], compact: bool = False
+) -> ModelEmitter:
+    """Return the cached emitter of a model class or raise NotCompilable.
+
+    Emitters of nested classes are compiled as well, a class may nest itself.
+    """
+    key = (model_type, compact)
+    emitter = _emitters.get(key)
+    if emitter is not None:
+        return emitter
+    if key in _emitters:
+        raise NotCompilable(model_type.__name__)
+    emitter = _emitters[key] = ModelEmitter(model_type, compact)
+    try:
+        if _escape_attrib is None or _escape_cdata is None:
+            raise NotCompilable("the standard library serializer has changed")
+        emitter.compile()
+    except NotCompilable:
+        del _emitters[key]
+        raise
+    except (AttributeError, KeyError) as e:
+        # private internals of pydantic_xml or the standard library have changed
+        del _emitters[key]
+        raise NotCompilable(f"{model_type.__name__}: {e!r}") from e
+    return emitter
+
+
+# whether emitters write the sample net of the self-check like pydantic_xml, None
+# until checked
+_emitters_match: bool | None = None
+
+
+def emitters_match() -> bool:
+    """Return whether the emitters passed the self-check, which runs once."""
+    global _emitters_match
+    if _emitters_match is None:
+        # imported late, the self-check builds models, which import this module
+        from app.transform.transformer.utility.serializer_check import check_emitters
+
+        _emitters_match = check_emitters()
+    return _emitters_match
+
+
+def get_emitter(
+    model_type: type[BaseXmlModel], compact: bool = False
+) -> ModelEmitter | None:
+    """Return the (compact) emitter of a model class or None if it can't be compiled.
+
+    No emitter is returned if the emitters failed the self-check.
+    """
+    if not emitters_match():
+        return None
+    try:
+        return compile_emitter(model_type, compact)
+    except NotCompilable:
+        _emitters[(model_type, compact)] = None
+        return None
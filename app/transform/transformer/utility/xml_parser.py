@@ -0,0 +1,98 @@
+"""Selectable XML parser backends to read BPMN and PNML models.
+
+The "std" backend is the defusedxml protected expat parser of the standard library.
+The "lxml" backend uses libxml2 with the same restrictions as defusedxml: documents
+declaring entities are rejected, no DTD or other resource is loaded (no network) and
+the libxml2 size and depth limits stay active (no huge tree).
+
+Both backends build element trees, which can be deserialized by pydantic_xml.
+"""
+
+import io
+from typing import IO
+
+from defusedxml import EntitiesForbidden
+from defusedxml.ElementTree import iterparse as std_iterparse
+
+try:
+    from lxml import etree as lxml_etree
+except ImportError:
+    lxml_etree = None  # lxml is optional, only the std backend is available
+
+STD_BACKEND = "std"
+LXML_BACKEND = "lxml"
+PARSER_BACKENDS = (STD_BACKEND, LXML_BACKEND)
+
+
+def check_parser_backend(backend: str):
+    """Raise if the parser backend is unknown or can't be used."""
+    if backend not in PARSER_BACKENDS:
+        raise ValueError(
+            f"Unknown XML parser backend '{backend}', use one of {PARSER_BACKENDS}"
+        )
+    if backend == LXML_BACKEND and lxml_etree is None:
+        raise ValueError("XML parser backend 'lxml' requires the lxml package")
+
+
+class _HardenedLxmlEvents:
+    """Iterator of lxml parse events that rejects entity declarations."""
+
+    def __init__(self, events):
+        self._events = events
+
+    @property
+    def root(self):
+        """Return the root element of the parsed document."""
+        return self._events.root
+
+    def __iter__(self):
+        is_checked = False
+        for event, elem in self._events:
+            if not is_checked:
+                # the internal DTD is completely parsed before the first element
+                dtd = elem.getroottree().docinfo.internalDTD
+                if dtd is not None:
+                    for entity in dtd.iterentities():
+                        raise EntitiesForbidden(
+                            entity.name,
+                            entity.content,
+                            None,
+                            entity.system_url,
+                            None,
+                            None,
+                        )
+                is_checked = True
+            yield event, elem
+
+
+def iterparse(
+    source: IO, events: tuple[str, ...] = ("end",), backend: str | None = None
+):
+    """Return an iterator of parse events with the selected backend.
+
+    As for the standard library the iterator has a root attribute with the root
+    element after the iteration. Comments and processing instructions are not
+    part of the lxml tree, like for the standard library.
+    """
+    if backend is None or backend == STD_BACKEND:
+        return std_iterparse(source, events=events)
+    check_parser_backend(backend)
+
+    encoding = None
+    if isinstance(source, io.TextIOBase):
+        # lxml only reads bytes, text input is already decoded
+        source = io.BytesIO(source.read().encode())
+        encoding = "utf-8"
+    return _HardenedLxmlEvents(
+        lxml_etree.iterparse(
+            source,
+            events=events,
+            encoding=encoding,
+            resolve_entities=False,
+            load_dtd=False,
+            no_network=True,
+            huge_tree=False,
+            remove_comments=True,
+            remove_pis=True,
+        )
+    )
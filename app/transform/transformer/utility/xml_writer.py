@@ -0,0 +1,180 @@
+"""Piecewise serialization of large XML documents.
+
+A model is written element by element instead of building the element tree and
+the text of the whole document. The writer reuses the serializer of the standard
+library, so the text equals the text of `to_xml` (pydantic_xml std backend).
+Items of compiled model classes are written by their emitters (see xml_emitter).
+The serializer internals are checked once, without them or if the chunks of the
+sample models of serializer_check differ from their XML, documents are written as
+a whole.
+"""
+
+import xml.etree.ElementTree as ET
+from collections.abc import Callable, Iterable, Iterator
+
+from app.transform.transformer.utility.utility import canonical_items
+from app.transform.transformer.utility.xml_emitter import get_emitter
+
+XML_HEADER = '<?xml version="1.0" encoding="UTF-8"?>'
+
+# characters of the text returned at once
+CHUNK_SIZE = 64 * 1024
+
+# whether the standard library has the serializer internals used by the writer
+WRITER_INTERNALS = all(
+    hasattr(ET, name) for name in ("_namespaces", "_namespace_map", "_serialize_xml")
+)
+
+# whether documents are written piecewise, None until the self-check ran
+_chunked_writing: bool | None = None if WRITER_INTERNALS else False
+
+
+def chunked_writing() -> bool:
+    """Return whether documents are written piecewise, the self-check runs once."""
+    global _chunked_writing
+    if _chunked_writing is None:
+        # imported late, the self-check builds models, which import this module
+        from app.transform.transformer.utility.serializer_check import check_chunks
+
+        # the sample documents of the self-check are written piecewise
+        _chunked_writing = True
+        _chunked_writing = check_chunks()
+    return _chunked_writing
+
+
+def writes_chunks(root: object) -> bool:
+    """Return whether a document with a root element can be written piecewise.
+
+    Only elements of the std backend are written piecewise.
+    """
+    return isinstance(root, ET.Element) and chunked_writing()
+
+
+class XMLChunkWriter:
+    """Writes the elements of one document and returns the text in chunks.
+
+    Namespaces are declared on the root element. A namespace which is first used
+    by a later element is declared on that element.
+    """
+
+    def __init__(self, chunk_size: int = CHUNK_SIZE):
+        """Create a writer returning chunks of about chunk_size characters."""
+        self.chunk_size = chunk_size
+        self._parts: list[str] = []
+        self._size = 0
+        self._declared: set[str] | None = None
+        self._open_tags: list[str] = []
+
+    def write(self, text: str):
+        """Write text as it is, like the XML header."""
+        self._parts.append(text)
+        self._size += len(text)
+
+    def _undeclared_namespaces(self, elem: ET.Element, extra: Iterable[str] = ()):
+        """Return the qualified names of an element tree and its new namespaces."""
+        qnames, namespaces = ET._namespaces(elem)  # type: ignore[attr-defined]
+        for uri in extra:
+            namespaces.setdefault(uri, ET._namespace_map[uri])  # type: ignore[attr-defined]
+        if self._declared is None:
+            self._declared = set(namespaces)
+            return qnames, namespaces
+        new = {uri: p for uri, p in namespaces.items() if uri not in self._declared}
+        return qnames, new
+
+    def start(self, elem: ET.Element, namespaces: Iterable[str] = ()):
+        """Write the start tag and text of an element, its children are written next.
+
+        The namespaces (uris) are declared in addition to the namespaces of the
+        element, if it is the root element.
+        """
+        # the namespaces of the written children are declared on the element
+        qnames, new = self._undeclared_namespaces(elem, namespaces)
+        shallow = ET.Element(elem.tag, elem.attrib)
+        shallow.text = elem.text
+        end_tag = f"</{qnames[elem.tag]}>"
+        parts: list[str] = []
+        ET._serialize_xml(  # type: ignore[attr-defined]
+            parts.append, shallow, qnames, new, short_empty_elements=False
+        )
+        self.write("".join(parts)[: -len(end_tag)])
+        self._open_tags.append(end_tag)
+
+    def declares(self, namespaces: Iterable[str]) -> bool:
+        """Return whether the namespaces (uris) are declared by written elements."""
+        return self._declared is not None and self._declared.issuperset(namespaces)
+
+    def element(self, elem: ET.Element):
+        """Write an element with its children."""
+        qnames, new = self._undeclared_namespaces(elem)
+        ET._serialize_xml(  # type: ignore[attr-defined]
+            self.write, elem, qnames, new or None, short_empty_elements=True
+        )
+
+    def end(self):
+        """Write the end tag of the last started element."""
+        self.write(self._open_tags.pop())
+
+    def chunks(self, final: bool = False) -> Iterator[str]:
+        """Return the written text if it fills a chunk or if the document is final."""
+        if self._parts and (final or self._size >= self.chunk_size):
+            yield "".join(self._parts)
+            self._parts = []
+            self._size = 0
+
+
+def item_element(shell, field: str, item) -> ET.Element:
+    """Return the element of an item of a collection field of a model.
+
+    An item of a field without own tag is serialized by itself. Otherwise the
+    item is serialized as the only item of the shell, the model without the items
+    of its collection fields, to get the tag of the field.
+    """
+    if getattr(type(shell).model_fields[field], "path", None) is None:
+        return item.to_xml_tree()
+    items = type(getattr(shell, field))([item])
+    return shell.model_copy(update={field: items}).to_xml_tree()[-1]
+
+
+def item_emitter(
+    writer: XMLChunkWriter, shell, field: str, compact: bool = False
+) -> Callable[[object], str | None]:
+    """Return a function returning the (compact) text of an item of a collection field.
+
+    The function returns None if the class of the item (or of the shell for a
+    field with own tag) isn't compiled or uses namespaces the writer hasn't
+    declared. Such items are written as element trees.
+    """
+    if getattr(type(shell).model_fields[field], "path", None) is None:
+
+        def emit(item):
+            emitter = get_emitter(type(item), compact)
+            if emitter is None or not writer.declares(emitter.all_namespaces):
+                return None
+            return emitter.to_xml(item)
+
+        return emit
+
+    emitter = get_emitter(type(shell), compact)
+    if emitter is None or not writer.declares(emitter.all_namespaces):
+        return lambda item: None
+    field_emitter = emitter.field_emitter(field)
+    return lambda item: field_emitter((item,))
+
+
+def write_items(
+    writer: XMLChunkWriter, shell, model, fields: Iterable[str], compact: bool = False
+) -> Iterator[str]:
+    """Write the items of the collection fields of a model one by one.
+
+    The items are written in their canonical order. Compact items leave out
+    default values if their classes are compiled (see xml_emitter).
+    """
+    for field in fields:
+        emit = item_emitter(writer, shell, field, compact)
+        for item in canonical_items(getattr(model, field)):
+            text = emit(item)
+            if text is None:
+                writer.element(item_element(shell, field, item))
+            else:
+                writer.write(text)
+            yield from writer.chunks()
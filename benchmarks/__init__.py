@@ -0,0 +1 @@
+"""Benchmarks for the model transformer (run with `python -m benchmarks.<name>`)."""
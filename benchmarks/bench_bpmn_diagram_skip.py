@@ -0,0 +1,74 @@
+"""Compare reading a BPMN with and without its diagram interchange (DI).
+
+The bpmntopnml direction doesn't use the DI, so it is skipped while parsing. The
+table reports the time and the peak of traced allocations to read the model and
+the time of the complete transformation with both variants.
+
+Run with `python -m benchmarks.bench_bpmn_diagram_skip`.
+"""
+
+from app.transform.transformer.models.bpmn.bpmn import BPMN
+from app.transform.transformer.transform_bpmn_to_petrinet.transform import (
+    bpmn_to_workflow_net,
+)
+from benchmarks.common import (
+    bpmn_corpus,
+    measure,
+    peak_memory,
+    print_table,
+    synthetic_bpmn,
+)
+
+
+def main():
+    """Run the benchmark."""
+    cases = bpmn_corpus()
+    # reading the DI grows quadratically, larger models take minutes
+    cases += [(f"synthetic {n}", synthetic_bpmn(n, True)) for n in (20, 50)]
+
+    rows: list[list[object]] = []
+    for name, xml in cases:
+        repeat = 3 if len(xml) > 100_000 else 10
+
+        def full():
+            return BPMN.from_xml(xml)
+
+        def skipped():
+            return BPMN.from_xml(xml, skip_diagram=True)
+
+        row: list[object] = [
+            name,
+            len(xml),
+            measure(full, repeat),
+            measure(skipped, repeat),
+            peak_memory(full),
+            peak_memory(skipped),
+        ]
+        try:
+            bpmn_to_workflow_net(full())
+        except Exception:
+            # not every supported BPMN can be transformed
+            row += ["-", "-"]
+        else:
+            row += [
+                measure(lambda: bpmn_to_workflow_net(full()), repeat),
+                measure(lambda: bpmn_to_workflow_net(skipped()), repeat),
+            ]
+        rows.append(row)
+    print_table(
+        [
+            "model",
+            "bytes",
+            "full ms",
+            "skip ms",
+            "full peak MiB",
+            "skip peak MiB",
+            "full transform ms",
+            "skip transform ms",
+        ],
+        rows,
+    )
+
+
+if __name__ == "__main__":
+    main()
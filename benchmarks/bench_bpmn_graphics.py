@@ -0,0 +1,69 @@
+"""Compare ways to write the placeholder graphics of a transformed BPMN.
+
+The placeholder diagram interchange (DI) is built as pydantic models by
+set_graphics for to_string. The chunked serialization writes it as XML elements
+without models or leaves it out (graphics=none). The table reports the time of
+the complete pnmltobpmn transformation and of its serialization alone.
+
+Run with `python -m benchmarks.bench_bpmn_graphics`.
+"""
+
+from app.transform.transformer.models.bpmn.bpmn_graphics import GRAPHICS_NONE
+from app.transform.transformer.transform_petrinet_to_bpmn.transform import (
+    pnml_to_bpmn,
+)
+from benchmarks.common import measure, print_table, synthetic_pnml_model
+
+
+def consume(chunks):
+    """Iterate all chunks like a response being sent."""
+    for _ in chunks:
+        pass
+
+
+def main():
+    """Run the benchmark."""
+    rows: list[list[object]] = []
+    for blocks in (10, 100, 1000):
+        repeat = 3 if blocks > 100 else 10
+        pnml = synthetic_pnml_model(blocks)
+        bpmn = pnml_to_bpmn(synthetic_pnml_model(blocks))
+        nodes = len(bpmn.process._flatten_node_typ_map())
+
+        def transform_models():
+            pnml_to_bpmn(pnml.model_copy(deep=True)).to_string()
+
+        def transform_emitter():
+            consume(pnml_to_bpmn(pnml.model_copy(deep=True)).to_chunks())
+
+        def transform_without():
+            transformed = pnml_to_bpmn(pnml.model_copy(deep=True))
+            consume(transformed.to_chunks(graphics=GRAPHICS_NONE))
+
+        rows.append(
+            [
+                nodes,
+                measure(bpmn.to_string, repeat),
+                measure(lambda: consume(bpmn.to_chunks()), repeat),
+                measure(lambda: consume(bpmn.to_chunks(graphics=GRAPHICS_NONE)), repeat),
+                measure(transform_models, repeat),
+                measure(transform_emitter, repeat),
+                measure(transform_without, repeat),
+            ]
+        )
+    print_table(
+        [
+            "nodes",
+            "DI models ms",
+            "DI emitter ms",
+            "no DI ms",
+            "pnmltobpmn models ms",
+            "pnmltobpmn emitter ms",
+            "pnmltobpmn no DI ms",
+        ],
+        rows,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""Compare the former scan-then-parse BPMN ingest with the single-pass ingest.
+
+Both variants build the same pydantic model; the table reports the parse and tag
+validation step separately from the total ingest time.
+
+Run with `python -m benchmarks.bench_bpmn_ingest`.
+"""
+
+import io
+
+from defusedxml.ElementTree import fromstring
+
+from app.transform.transformer.models.bpmn.bpmn import (
+    BPMN,
+    parse_supported_bpmn_tree,
+    supported_tags,
+)
+from app.transform.transformer.utility.utility import get_tag_name
+from benchmarks.common import (
+    bpmn_corpus,
+    measure,
+    print_table,
+    synthetic_bpmn,
+)
+
+
+def scan_then_parse_tree(xml_content: str):
+    """Former ingest: parse the tree, then walk it to validate the tags."""
+    tree = fromstring(xml_content)
+    used_tags: set[str] = set()
+    amount_of_participants = 0
+    for elem in tree.iter():
+        if get_tag_name(elem) == "participant":
+            amount_of_participants += 1
+        used_tags.add(get_tag_name(elem))
+    if amount_of_participants > 1 or used_tags.difference(supported_tags):
+        raise ValueError("unsupported")
+    return tree
+
+
+def main():
+    """Run the benchmark."""
+    cases = bpmn_corpus()
+    cases += [(f"synthetic DI {n}", synthetic_bpmn(n, True)) for n in (20, 60)]
+    cases += [(f"synthetic {n}", synthetic_bpmn(n)) for n in (200, 1000, 4000)]
+
+    rows: list[list[object]] = []
+    for name, xml in cases:
+        repeat = 3 if len(xml) > 500_000 else 10
+        old_parse = measure(lambda: scan_then_parse_tree(xml), repeat)
+        new_parse = measure(lambda: parse_supported_bpmn_tree(io.StringIO(xml)), repeat)
+        old_total = measure(
+            lambda: BPMN.from_xml_tree(scan_then_parse_tree(xml)), repeat
+        )
+        new_total = measure(lambda: BPMN.from_xml(xml), repeat)
+        rows.append(
+            [
+                name,
+                len(xml),
+                old_parse,
+                new_parse,
+                f"{old_parse / new_parse:.2f}x",
+                old_total,
+                new_total,
+            ]
+        )
+    print_table(
+        [
+            "model",
+            "bytes",
+            "scan+parse ms",
+            "single-pass ms",
+            "speedup",
+            "old total ms",
+            "new total ms",
+        ],
+        rows,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""Measure the layered layout of transformed BPMN diagrams.
+
+The table reports the time of the layout of the nodes and flows alone, of the
+serialization with placeholder and with laid out graphics and of the complete
+pnmltobpmn transformation with layout.
+
+Run with `python -m benchmarks.bench_bpmn_layout`.
+"""
+
+from app.transform.transformer.models.bpmn.bpmn_graphics import GRAPHICS_LAYOUT
+from app.transform.transformer.transform_petrinet_to_bpmn.transform import (
+    pnml_to_bpmn,
+)
+from benchmarks.common import measure, print_table, synthetic_pnml_model
+
+
+def consume(chunks):
+    """Iterate all chunks like a response being sent."""
+    for _ in chunks:
+        pass
+
+
+def main():
+    """Run the benchmark."""
+    rows: list[list[object]] = []
+    for blocks in (10, 100, 1000, 2000):
+        repeat = 3 if blocks > 100 else 10
+        pnml = synthetic_pnml_model(blocks)
+        bpmn = pnml_to_bpmn(synthetic_pnml_model(blocks))
+        nodes = len(bpmn.process._flatten_node_typ_map())
+
+        def transform_layout():
+            transformed = pnml_to_bpmn(pnml.model_copy(deep=True))
+            consume(transformed.to_chunks(graphics=GRAPHICS_LAYOUT))
+
+        rows.append(
+            [
+                nodes,
+                len(bpmn.process.flows),
+                measure(lambda: consume(bpmn._layout()), repeat),
+                measure(lambda: consume(bpmn.to_chunks()), repeat),
+                measure(
+                    lambda: consume(bpmn.to_chunks(graphics=GRAPHICS_LAYOUT)), repeat
+                ),
+                measure(transform_layout, repeat),
+            ]
+        )
+    print_table(
+        [
+            "nodes",
+            "flows",
+            "layout ms",
+            "placeholder DI ms",
+            "layout DI ms",
+            "pnmltobpmn layout ms",
+        ],
+        rows,
+    )
+
+
+if __name__ == "__main__":
+    main()
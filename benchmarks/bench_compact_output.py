@@ -0,0 +1,49 @@
+"""Compare the full PNML output with the compact output profile.
+
+The transformed synthetic BPMN models are serialized with all toolspecific and
+graphics content and with graphics=compact, which leaves out default values. The
+table reports the time to serialize the chunks and the size of the text and of
+its gzip compressed body.
+
+Run with `python -m benchmarks.bench_compact_output`.
+"""
+
+import gzip
+
+from app.transform.transformer.transform_bpmn_to_petrinet.transform import (
+    bpmn_to_workflow_net,
+)
+from benchmarks.common import measure, print_table, synthetic_bpmn_model
+
+
+def main():
+    """Run the benchmark."""
+    rows: list[list[object]] = []
+    for blocks in (10, 100, 1000):
+        repeat = 3 if blocks > 100 else 10
+        pnml = bpmn_to_workflow_net(synthetic_bpmn_model(blocks))
+        row: list[object] = [f"pnml {blocks}"]
+        for compact in (False, True):
+
+            def serialize(compact=compact):
+                return "".join(pnml.to_chunks(compact=compact))
+
+            text = serialize().encode()
+            row += [measure(serialize, repeat), len(text), len(gzip.compress(text))]
+        rows.append(row)
+    print_table(
+        [
+            "model",
+            "full ms",
+            "full bytes",
+            "full gzip bytes",
+            "compact ms",
+            "compact bytes",
+            "compact gzip bytes",
+        ],
+        rows,
+    )
+
+
+if __name__ == "__main__":
+    main()
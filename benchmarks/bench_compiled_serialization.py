@@ -0,0 +1,89 @@
+"""Compare the compiled emitters with the element trees of pydantic_xml.
+
+The first columns report the time to serialize the canonical items of the
+transformed models one by one, as element trees (`to_xml_tree` and the serializer
+of the standard library) and by the compiled emitters of their classes. The last
+columns report the time of the chunked serialization of the whole model with the
+emitters disabled and enabled.
+
+Run with `python -m benchmarks.bench_compiled_serialization`.
+"""
+
+import xml.etree.ElementTree as ET
+from unittest import mock
+
+from app.transform.transformer.models.bpmn.bpmn import PROCESS_ITEM_FIELDS
+from app.transform.transformer.models.pnml.pnml import NET_ITEM_FIELDS
+from app.transform.transformer.transform_bpmn_to_petrinet.transform import (
+    bpmn_to_workflow_net,
+)
+from app.transform.transformer.transform_petrinet_to_bpmn.transform import (
+    pnml_to_bpmn,
+)
+from app.transform.transformer.utility.utility import canonical_items
+from app.transform.transformer.utility.xml_emitter import get_emitter
+from benchmarks.common import (
+    measure,
+    print_table,
+    synthetic_bpmn_model,
+    synthetic_pnml_model,
+)
+
+
+def main():
+    """Run the benchmark."""
+    rows: list[list[object]] = []
+    for blocks in (10, 100, 1000):
+        repeat = 3 if blocks > 100 else 10
+        pnml = bpmn_to_workflow_net(synthetic_bpmn_model(blocks))
+        bpmn = pnml_to_bpmn(synthetic_pnml_model(blocks))
+        cases = [
+            ("pnml", pnml, pnml.net, NET_ITEM_FIELDS),
+            ("bpmn", bpmn, bpmn.process, PROCESS_ITEM_FIELDS),
+        ]
+        for kind, model, parent, fields in cases:
+            items = [
+                item
+                for field in fields
+                for item in canonical_items(getattr(parent, field))
+            ]
+
+            def trees(items=items):
+                return [ET.tostring(i.to_xml_tree(), encoding="unicode") for i in items]
+
+            def compiled(items=items):
+                return [get_emitter(type(i)).to_xml(i) for i in items]  # type: ignore[union-attr]
+
+            def chunks(model=model):
+                return "".join(model.to_chunks())
+
+            with mock.patch(
+                "app.transform.transformer.utility.xml_writer.get_emitter",
+                return_value=None,
+            ):
+                tree_chunks_ms = measure(chunks, repeat)
+            rows.append(
+                [
+                    f"{kind} {blocks}",
+                    len(items),
+                    measure(trees, repeat),
+                    measure(compiled, repeat),
+                    tree_chunks_ms,
+                    measure(chunks, repeat),
+                ]
+            )
+    print_table(
+        [
+            "model",
+            "items",
+            "tree items ms",
+            "compiled items ms",
+            "tree chunks ms",
+            "compiled chunks ms",
+        ],
+        rows,
+    )
+
+
+if __name__ == "__main__":
+    main()
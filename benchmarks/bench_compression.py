@@ -0,0 +1,75 @@
+"""Compare the content codings of transform responses and request bodies.
+
+The transformed models are serialized once as JSON body, the table reports the
+time to compress the streamed chunks with gzip levels 1, 6 (the default of
+COMPRESSION_LEVEL) and 9 and with deflate, the size of the bodies and the time to
+read a gzip compressed PNML request body compared to the raw body.
+
+Run with `python -m benchmarks.bench_compression`.
+"""
+
+import gzip
+import io
+import zlib
+
+from app.compression import COMPRESS_WBITS, DecompressedStream, compress_chunks
+from app.transform.main import iter_json
+from app.transform.transformer.models.pnml.pnml import Pnml
+from app.transform.transformer.transform_petrinet_to_bpmn.transform import (
+    pnml_to_bpmn,
+)
+from benchmarks.common import measure, print_table, synthetic_pnml_model
+
+CODINGS = [("gzip", 1), ("gzip", 6), ("gzip", 9), ("deflate", 6)]
+
+
+def main():
+    """Run the benchmark."""
+    rows: list[list[object]] = []
+    for blocks in (10, 100, 1000):
+        repeat = 3 if blocks > 100 else 10
+        pnml = synthetic_pnml_model(blocks)
+        chunks = list(iter_json({"bpmn": pnml_to_bpmn(pnml).to_chunks()}))
+        row: list[object] = [f"bpmn {blocks}", sum(map(len, chunks))]
+        for coding, level in CODINGS:
+
+            def compress(coding=coding, level=level):
+                compressor = zlib.compressobj(
+                    level, zlib.DEFLATED, COMPRESS_WBITS[coding]
+                )
+                return b"".join(compress_chunks(chunks, compressor))
+
+            row += [measure(compress, repeat), len(compress())]
+        rows.append(row)
+    header = ["response", "bytes"]
+    for coding, level in CODINGS:
+        header += [f"{coding} {level} ms", f"{coding} {level} bytes"]
+    print_table(header, rows)
+
+    rows = []
+    for blocks in (10, 100, 1000):
+        repeat = 3 if blocks > 100 else 10
+        body = synthetic_pnml_model(blocks).to_xml()
+        compressed = gzip.compress(body)
+
+        def read_raw():
+            return Pnml.from_stream(io.BytesIO(body))
+
+        def read_gzip():
+            stream = DecompressedStream(io.BytesIO(compressed), 47)
+            return Pnml.from_stream(io.BufferedReader(stream))
+
+        rows.append(
+            [
+                f"pnml {blocks}",
+                len(body),
+                len(compressed),
+                measure(read_raw, repeat),
+                measure(read_gzip, repeat),
+            ]
+        )
+    print_table(["request", "bytes", "gzip bytes", "raw ms", "gzip ms"], rows)
+
+
+if __name__ == "__main__":
+    main()
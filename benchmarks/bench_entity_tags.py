@@ -0,0 +1,106 @@
+"""Measure the canonical serialization and revalidated transform requests.
+
+The first table compares serializing a model in the order of its sets with the
+canonical order, which sorts the items of each set. The second table reports the
+time of a transform request, of a request answered from the result cache and of
+a request with a matching If-None-Match tag (304) with and without the cache.
+
+Run with `python -m benchmarks.bench_entity_tags`.
+"""
+
+from app import create_app
+from app.transform.cache import RESULT_CACHE_EXTENSION
+from app.transform.transformer.transform_bpmn_to_petrinet.transform import (
+    bpmn_to_workflow_net,
+)
+from app.transform.transformer.transform_petrinet_to_bpmn.transform import (
+    pnml_to_bpmn,
+)
+from benchmarks.common import (
+    measure,
+    print_table,
+    synthetic_bpmn_model,
+    synthetic_pnml,
+    synthetic_pnml_model,
+)
+
+
+def serialization_rows():
+    """Return the rows of the serialization table."""
+    rows: list[list[object]] = []
+    for blocks in (10, 100, 1000):
+        repeat = 3 if blocks > 100 else 10
+        cases = [
+            ("pnml", bpmn_to_workflow_net(synthetic_bpmn_model(blocks))),
+            ("bpmn", pnml_to_bpmn(synthetic_pnml_model(blocks))),
+        ]
+        for kind, model in cases:
+
+            def set_order(model=model):
+                return model.to_xml(encoding="unicode")
+
+            def canonical(model=model):
+                return model.canonical().to_xml(encoding="unicode")
+
+            rows.append(
+                [
+                    f"{kind} {blocks}",
+                    measure(set_order, repeat),
+                    measure(canonical, repeat),
+                    measure(lambda: "".join(model.to_chunks()), repeat),
+                ]
+            )
+    return rows
+
+
+def request_rows():
+    """Return the rows of the request table."""
+    rows: list[list[object]] = []
+    for blocks in (10, 100, 1000):
+        repeat = 3 if blocks > 100 else 10
+        body = synthetic_pnml(blocks).encode()
+        app = create_app("testing")
+        client = app.test_client()
+
+        def post(headers=None):
+            return client.post(
+                "/transform?direction=pnmltobpmn",
+                data=body,
+                content_type="application/xml",
+                headers=headers,
+                buffered=True,
+            )
+
+        response = post()
+        revalidate = {"If-None-Match": response.headers["ETag"]}
+        cached_ms = measure(post, repeat)
+        cached_304_ms = measure(lambda: post(revalidate), repeat)
+        cache = app.extensions.pop(RESULT_CACHE_EXTENSION)
+        rows.append(
+            [
+                f"pnml {blocks}",
+                measure(post, repeat),
+                cached_ms,
+                measure(lambda: post(revalidate), repeat),
+                cached_304_ms,
+                len(response.get_data()),
+            ]
+        )
+        app.extensions[RESULT_CACHE_EXTENSION] = cache
+    return rows
+
+
+def main():
+    """Run the benchmark."""
+    print_table(
+        ["model", "set order ms", "canonical ms", "canonical chunks ms"],
+        serialization_rows(),
+    )
+    print_table(
+        ["request", "200 ms", "cached 200 ms", "304 ms", "cached 304 ms", "bytes"],
+        request_rows(),
+    )
+
+
+if __name__ == "__main__":
+    main()
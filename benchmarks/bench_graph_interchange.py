@@ -0,0 +1,72 @@
+"""Compare the XML models with their JSON graphs.
+
+The synthetic models are read from their XML documents and from their JSON
+graphs, which skip the XML parsing. The table reports the time to read and to
+write each representation and the size of its text.
+
+Run with `python -m benchmarks.bench_graph_interchange`.
+"""
+
+from app.transform.graph import (
+    bpmn_graph,
+    pnml_graph,
+    read_bpmn_graph,
+    read_pnml_graph,
+)
+from app.transform.transformer.models.bpmn.bpmn import BPMN
+from app.transform.transformer.models.pnml.pnml import Pnml
+from benchmarks.common import measure, print_table, synthetic_bpmn, synthetic_pnml
+
+
+def main():
+    """Run the benchmark."""
+    rows: list[list[object]] = []
+    for blocks in (10, 100, 1000):
+        repeat = 3 if blocks > 100 else 10
+        cases = [
+            (
+                "pnml",
+                synthetic_pnml(blocks),
+                Pnml.from_xml_str,
+                pnml_graph,
+                read_pnml_graph,
+            ),
+            ("bpmn", synthetic_bpmn(blocks), BPMN.from_xml, bpmn_graph, read_bpmn_graph),
+        ]
+        for kind, xml, read_xml, to_graph, read_graph in cases:
+            model = read_xml(xml)
+            graph = to_graph(model).model_dump_json(exclude_defaults=True)
+
+            def write_xml(model=model):
+                return "".join(model.to_chunks())
+
+            def write_graph(model=model, to_graph=to_graph):
+                return to_graph(model).model_dump_json(exclude_defaults=True)
+
+            rows.append(
+                [
+                    f"{kind} {blocks}",
+                    measure(lambda: read_xml(xml), repeat),
+                    measure(write_xml, repeat),
+                    len(write_xml()),
+                    measure(lambda: read_graph(graph), repeat),
+                    measure(write_graph, repeat),
+                    len(graph),
+                ]
+            )
+    print_table(
+        [
+            "model",
+            "xml read ms",
+            "xml write ms",
+            "xml chars",
+            "graph read ms",
+            "graph write ms",
+            "graph chars",
+        ],
+        rows,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""Measure the memory of the helper nodes of the transformations.
+
+The petri net to BPMN transformation replaces the operator transitions of a net
+with gateway helpers, the BPMN to petri net transformation links adjacent nodes
+with linking nodes. Helper nodes are plain objects with slots, the first table
+compares their size with equivalent models, which the helpers were before. The
+second table reports the time and the peak of traced allocations of each direction
+for nets and processes with an operator in each block.
+
+Run with `python -m benchmarks.bench_helper_nodes`.
+"""
+
+import tracemalloc
+from collections.abc import Callable
+
+from app.transform.transformer.models.bpmn.base import GenericBPMNNode, LinkingNode
+from app.transform.transformer.models.pnml.base import NetElement
+from app.transform.transformer.models.pnml.transform_helper import XORHelperPNML
+from app.transform.transformer.transform_bpmn_to_petrinet.transform import (
+    bpmn_to_workflow_net,
+)
+from app.transform.transformer.transform_petrinet_to_bpmn.transform import (
+    pnml_to_bpmn,
+)
+from benchmarks.bench_transform_passes import measure_pass
+from benchmarks.common import (
+    measure,
+    peak_memory,
+    print_table,
+    synthetic_bpmn_model,
+    synthetic_pnml_model,
+)
+
+NODES = 20000
+
+
+class XORHelperModel(NetElement):
+    """Gateway helper as a model like before."""
+
+
+def node_bytes(create: Callable[[str], object]):
+    """Return the traced bytes per node of creating nodes."""
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    nodes = [create(f"node{i}") for i in range(NODES)]
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del nodes
+    return round((after - before) / NODES)
+
+
+def node_rows():
+    """Return the rows of the size of helper nodes and equivalent models."""
+    for name, create in [
+        ("gateway helper model", lambda id: XORHelperModel(id=id)),
+        ("gateway helper", lambda id: XORHelperPNML(id=id)),
+        ("linking node model", lambda id: GenericBPMNNode(id=id)),
+        ("linking node", lambda id: LinkingNode(id=id)),
+    ]:
+        ms = measure(lambda: [create(f"node{i}") for i in range(NODES)], repeat=3)
+        yield [name, node_bytes(create), round(ms / NODES * 1000, 2)]
+
+
+def transform_rows(blocks: int):
+    """Return the rows of the transformations of a model size."""
+    repeat = 1 if blocks > 1000 else 3
+    for direction, create, transform in [
+        ("pnmltobpmn", lambda: synthetic_pnml_model(blocks), pnml_to_bpmn),
+        ("bpmntopnml", lambda: synthetic_bpmn_model(blocks), bpmn_to_workflow_net),
+    ]:
+        model = create()
+        yield [
+            f"{direction} {blocks}",
+            measure_pass(create, transform, repeat),
+            round(peak_memory(lambda: transform(model)), 2),
+        ]
+
+
+def main():
+    """Run the benchmark."""
+    print_table(["node", "bytes per node", "µs per node"], list(node_rows()))
+    print()
+    print_table(
+        ["transform", "ms", "peak MiB"],
+        [row for blocks in (100, 1000, 3000) for row in transform_rows(blocks)],
+    )
+
+
+if __name__ == "__main__":
+    main()
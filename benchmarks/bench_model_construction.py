@@ -0,0 +1,115 @@
+"""Profile the cost of constructing model objects during the transformations.
+
+The first table compares the validating constructor with pydantics unvalidated
+`model_construct` for the objects created in bulk by the transformations. The second
+table reports the share of the transformation time spent in the constructors of
+model objects (incl. validation), measured with cProfile.
+
+Run with `python -m benchmarks.bench_model_construction`.
+"""
+
+import cProfile
+import pstats
+import timeit
+from collections.abc import Callable
+
+from pydantic import main as pydantic_main
+
+from app.transform.transformer.models.bpmn.base import GenericBPMNNode
+from app.transform.transformer.models.bpmn.bpmn import BPMN, Flow
+from app.transform.transformer.models.pnml.base import Name
+from app.transform.transformer.models.pnml.pnml import Arc, Pnml, Transition
+from app.transform.transformer.models.pnml.transform_helper import XORHelperPNML
+from app.transform.transformer.transform_bpmn_to_petrinet.transform import (
+    bpmn_to_workflow_net,
+)
+from app.transform.transformer.transform_petrinet_to_bpmn.transform import pnml_to_bpmn
+from benchmarks.common import print_table, synthetic_bpmn, synthetic_pnml
+
+CONSTRUCTIONS: list[tuple[str, Callable[[], object], Callable[[], object]]] = [
+    (
+        "Transition with name",
+        lambda: Transition(id="t", name=Name(title="task")),
+        lambda: Transition.model_construct(
+            id="t", name=Name.model_construct(title="task")
+        ),
+    ),
+    (
+        "Arc",
+        lambda: Arc(id="a", source="p", target="t"),
+        lambda: Arc.model_construct(id="a", source="p", target="t"),
+    ),
+    (
+        "Flow",
+        lambda: Flow(id="f", sourceRef="s", targetRef="t"),
+        lambda: Flow.model_construct(id="f", sourceRef="s", targetRef="t"),
+    ),
+    (
+        "GenericBPMNNode",
+        lambda: GenericBPMNNode(id="n"),
+        lambda: GenericBPMNNode.model_construct(id="n"),
+    ),
+    (
+        "XORHelperPNML",
+        lambda: XORHelperPNML(id="x", name=Name(title=None)),
+        lambda: XORHelperPNML.model_construct(
+            id="x", name=Name.model_construct(title=None)
+        ),
+    ),
+]
+
+
+def per_call_us(func: Callable[[], object], number: int = 20_000):
+    """Return the best time of a call in microseconds."""
+    return min(timeit.repeat(func, number=number, repeat=3)) / number * 1e6
+
+
+def construction_share(read: Callable[[], object], transform: Callable):
+    """Return the total time, the constructor time and calls of a transformation."""
+    model = read()
+    profiler = cProfile.Profile()
+    profiler.runcall(transform, model)
+    stats = pstats.Stats(profiler)
+    init_code = pydantic_main.BaseModel.__init__.__code__
+    for (filename, line, func_name), stat in stats.stats.items():  # type: ignore
+        if (filename, line, func_name) == (
+            init_code.co_filename,
+            init_code.co_firstlineno,
+            "__init__",
+        ):
+            _, calls, _, cumulative, _ = stat
+            return stats.total_tt * 1000, cumulative * 1000, calls  # type: ignore
+    return stats.total_tt * 1000, 0.0, 0  # type: ignore
+
+
+def main():
+    """Run the benchmark."""
+    print_table(
+        ["object", "validated us", "model_construct us"],
+        [
+            [name, per_call_us(validated), per_call_us(constructed)]
+            for name, validated, constructed in CONSTRUCTIONS
+        ],
+    )
+    print()
+
+    rows: list[list[object]] = []
+    for n in (50, 200, 1000):
+        xml = synthetic_bpmn(n)
+        total, init, calls = construction_share(
+            lambda: BPMN.from_xml(xml), bpmn_to_workflow_net
+        )
+        rows.append([f"bpmn_to_workflow_net {n}", total, init, calls, init / total])
+        xml = synthetic_pnml(n)
+        total, init, calls = construction_share(
+            lambda: Pnml.from_xml_str(xml), pnml_to_bpmn
+        )
+        rows.append([f"pnml_to_bpmn {n}", total, init, calls, init / total])
+    print_table(
+        ["transformation", "profiled ms", "constructors ms", "objects", "share"],
+        [[*row[:4], f"{row[4] * 100:.1f}%"] for row in rows],
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""Measure selecting nodes by type with live node views and with node lists.
+
+The passes select gateways, helper elements and resources of nets and processes.
+A node list copies every node of the model before filtering, a node view iterates
+the sets of the selected node types. The first table reports the time and the
+traced allocations of selecting the gateways of a process and the gateway helpers
+of a net, the second one the transformations of each direction, which select
+nodes in several passes.
+
+Run with `python -m benchmarks.bench_node_views`.
+"""
+
+from app.transform.transformer.models.bpmn.base import Gateway
+from app.transform.transformer.models.pnml.transform_helper import (
+    GatewayHelperPNML,
+    XORHelperPNML,
+)
+from app.transform.transformer.transform_bpmn_to_petrinet.transform import (
+    bpmn_to_workflow_net,
+)
+from app.transform.transformer.transform_petrinet_to_bpmn.transform import (
+    pnml_to_bpmn,
+)
+from benchmarks.bench_transform_passes import measure_pass
+from benchmarks.common import (
+    measure,
+    peak_memory,
+    print_table,
+    synthetic_bpmn_model,
+    synthetic_pnml_model,
+)
+
+
+def selection_rows(blocks: int):
+    """Return the rows of selecting nodes by list and by view."""
+    process = synthetic_bpmn_model(blocks).process
+    net = synthetic_pnml_model(blocks).net
+    for i in range(blocks):
+        net.add_element(XORHelperPNML(id=f"helper{i}"))
+    cases = [
+        (
+            "gateways list",
+            lambda: [
+                node
+                for node in process._flatten_node_typ_map()
+                if isinstance(node, Gateway)
+            ],
+        ),
+        ("gateways view", lambda: [*process.get_nodes(Gateway)]),
+        ("gateway count view", lambda: len(process.get_nodes(Gateway))),
+        (
+            "helpers list",
+            lambda: [
+                node
+                for node in net._flatten_node_typ_map()
+                if isinstance(node, GatewayHelperPNML)
+            ],
+        ),
+        ("helpers view", lambda: [*net.get_elements(GatewayHelperPNML)]),
+    ]
+    for name, select in cases:
+        yield [
+            f"{name} {blocks}",
+            measure(select, repeat=20),
+            round(peak_memory(select) * 1024, 2),
+        ]
+
+
+def transform_rows(blocks: int):
+    """Return the rows of the transformations of a model size."""
+    repeat = 1 if blocks > 1000 else 3
+    for direction, create, transform in [
+        ("pnmltobpmn", lambda: synthetic_pnml_model(blocks), pnml_to_bpmn),
+        ("bpmntopnml", lambda: synthetic_bpmn_model(blocks), bpmn_to_workflow_net),
+    ]:
+        model = create()
+        yield [
+            f"{direction} {blocks}",
+            measure_pass(create, transform, repeat),
+            round(peak_memory(lambda: transform(model)), 2),
+        ]
+
+
+def main():
+    """Run the benchmark."""
+    print_table(
+        ["selection", "ms", "peak KiB"],
+        [row for blocks in (1000, 10000) for row in selection_rows(blocks)],
+    )
+    print()
+    print_table(
+        ["transform", "ms", "peak MiB"],
+        [row for blocks in (100, 1000, 3000) for row in transform_rows(blocks)],
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""Compare the std and the hardened lxml XML parser backend.
+
+For every model the table reports the time to parse the document only and the time
+to read the complete BPMN or PNML model with each backend. The documents are passed
+as bytes, like a raw request body.
+
+Run with `python -m benchmarks.bench_parser_backends`.
+"""
+
+import io
+
+from app.transform.transformer.models.bpmn.bpmn import BPMN
+from app.transform.transformer.models.pnml.pnml import Pnml
+from app.transform.transformer.utility.xml_parser import (
+    LXML_BACKEND,
+    STD_BACKEND,
+    iterparse,
+)
+from benchmarks.common import (
+    bpmn_corpus,
+    measure,
+    pnml_corpus,
+    print_table,
+    synthetic_bpmn,
+    synthetic_pnml,
+)
+
+
+def parse_only(xml: bytes, backend: str):
+    """Parse the document without building a model."""
+    for _ in iterparse(io.BytesIO(xml), backend=backend):
+        pass
+
+
+def main():
+    """Run the benchmark."""
+    cases = [(name, xml, BPMN.from_stream) for name, xml in bpmn_corpus()]
+    cases += [
+        (f"synthetic bpmn {n}", synthetic_bpmn(n), BPMN.from_stream) for n in (200, 1000)
+    ]
+    cases += [(name, xml, Pnml.from_stream) for name, xml in pnml_corpus()]
+    cases += [
+        (f"synthetic pnml {n}", synthetic_pnml(n), Pnml.from_stream) for n in (200, 1000)
+    ]
+
+    rows: list[list[object]] = []
+    for name, content, read_model in cases:
+        xml = content.encode()
+        repeat = 3 if len(xml) > 500_000 else 10
+        timings: list[object] = []
+        for backend in (STD_BACKEND, LXML_BACKEND):
+            timings.append(measure(lambda: parse_only(xml, backend), repeat))
+        for backend in (STD_BACKEND, LXML_BACKEND):
+            timings.append(measure(lambda: read_model(io.BytesIO(xml), backend), repeat))
+        rows.append([name, len(xml), *timings])
+    print_table(
+        [
+            "model",
+            "bytes",
+            "std parse ms",
+            "lxml parse ms",
+            "std model ms",
+            "lxml model ms",
+        ],
+        rows,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""Compare the tree based PNML parsing with the incremental PNML reader.
+
+Both variants build the same pydantic model. Besides the time the table reports the
+peak of traced allocations while parsing, which includes the element tree of the
+tree based variant.
+
+Run with `python -m benchmarks.bench_pnml_reader`.
+"""
+
+import io
+
+from defusedxml.ElementTree import fromstring
+
+from app.transform.transformer.models.pnml.pnml import Pnml, read_pnml_stream
+from benchmarks.common import (
+    measure,
+    peak_memory,
+    pnml_corpus,
+    print_table,
+    synthetic_pnml,
+)
+
+
+def main():
+    """Run the benchmark."""
+    cases = pnml_corpus()
+    cases += [(f"synthetic {n}", synthetic_pnml(n)) for n in (200, 1000, 4000)]
+
+    rows: list[list[object]] = []
+    for name, xml in cases:
+        repeat = 3 if len(xml) > 500_000 else 10
+
+        def tree():
+            return Pnml.from_xml_tree(fromstring(xml))
+
+        def stream():
+            return read_pnml_stream(io.StringIO(xml))
+
+        rows.append(
+            [
+                name,
+                len(xml),
+                measure(tree, repeat),
+                measure(stream, repeat),
+                peak_memory(tree),
+                peak_memory(stream),
+            ]
+        )
+    print_table(
+        [
+            "model",
+            "bytes",
+            "tree ms",
+            "stream ms",
+            "tree peak MiB",
+            "stream peak MiB",
+        ],
+        rows,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""Measure changing the id of a node in processes and nets of growing size.
+
+The subprocess handling of both directions renames the start and end nodes of each
+subprocess. A node is renamed in place, which changes the ends of its incident
+edges, so the cost grows with the degree of the node and not with the model. The
+table compares it with the former rename, which copied the node and removed and
+added it with all of its edges again, for nodes of degree 2 and 50.
+
+Run with `python -m benchmarks.bench_rename_nodes`.
+"""
+
+from app.transform.transformer.models.bpmn.bpmn import GenericBPMNNode, Process
+from app.transform.transformer.models.pnml.pnml import Net, Place, Transition
+from benchmarks.common import measure, print_table, synthetic_bpmn_model
+
+RENAMES = 200
+
+
+def rebuild_node_id(process: Process, node: GenericBPMNNode, new_id: str):
+    """Change the id of a node by copying it and adding its flows again."""
+    incoming = [(f.id, f.sourceRef, new_id) for f in process.get_incoming(node.id)]
+    outgoing = [(f.id, new_id, f.targetRef) for f in process.get_outgoing(node.id)]
+    for flow in [*process.get_incoming(node.id), *process.get_outgoing(node.id)]:
+        process.remove_flow(flow)
+    process.remove_node(node)
+    new_node = node.model_copy(deep=True)
+    new_node.id = new_id
+    process.add_node(new_node)
+    for id, source_id, target_id in [*outgoing, *incoming]:
+        process.add_flow(process.get_node(source_id), process.get_node(target_id), id)
+    return new_node
+
+
+def rebuild_element_id(net: Net, old_id: str, new_id: str):
+    """Change the id of an element by removing and adding its arcs again."""
+    element = net.get_element(old_id)
+    incoming, outgoing = net.get_incoming_outgoing_and_remove_arcs(element)
+    net.remove_element(element)
+    element.id = new_id
+    net.add_element(element)
+    net.connect_to_element(element, incoming)
+    net.connect_from_element(element, outgoing)
+
+
+def process_with_hub(blocks: int, degree: int):
+    """Return a synthetic process with a node connected to other nodes."""
+    process = synthetic_bpmn_model(blocks).process
+    hub = process.add_node(GenericBPMNNode(id="hub"))
+    for i in range(degree):
+        process.add_flow(process.add_node(GenericBPMNNode(id=f"n{i}")), hub)
+    return process
+
+
+def net_with_hub(blocks: int, degree: int):
+    """Return a net of places and transitions with a transition of a degree."""
+    net = Net()
+    for i in range(blocks * 6):
+        net.add_arc(Place(id=f"p{i}"), Transition(id=f"t{i}"))
+    hub = Transition(id="hub")
+    for i in range(degree):
+        net.add_arc(Place(id=f"p{i}"), hub)
+    return net
+
+
+def process_rows(blocks: int, degree: int):
+    """Return the rows of renaming a node of a process back and forth."""
+    process = process_with_hub(blocks, degree)
+    nodes = len(process.get_nodes())
+
+    def in_place():
+        node = process.get_node("hub")
+        for i in range(RENAMES):
+            process.change_node_id(node, "hub" if i % 2 else "moved")
+
+    def rebuild():
+        node = process.get_node("hub")
+        for i in range(RENAMES):
+            node = rebuild_node_id(process, node, "hub" if i % 2 else "moved")
+
+    for name, rename in [("rebuild", rebuild), ("in place", in_place)]:
+        ms = measure(rename, repeat=3) / RENAMES
+        yield [f"process {name} degree {degree}", nodes, round(ms * 1000, 1)]
+
+
+def net_rows(blocks: int, degree: int):
+    """Return the rows of renaming a transition of a net back and forth."""
+    net = net_with_hub(blocks, degree)
+    nodes = len(net.get_elements())
+
+    def in_place():
+        for i in range(RENAMES):
+            net.change_id(*(("moved", "hub") if i % 2 else ("hub", "moved")))
+
+    def rebuild():
+        for i in range(RENAMES):
+            rebuild_element_id(net, *(("moved", "hub") if i % 2 else ("hub", "moved")))
+
+    for name, rename in [("rebuild", rebuild), ("in place", in_place)]:
+        ms = measure(rename, repeat=3) / RENAMES
+        yield [f"net {name} degree {degree}", nodes, round(ms * 1000, 1)]
+
+
+def main():
+    """Run the benchmark."""
+    rows: list[list[object]] = []
+    for blocks in (100, 3000):
+        for degree in (2, 50):
+            rows.extend(process_rows(blocks, degree))
+            rows.extend(net_rows(blocks, degree))
+    print_table(["rename", "nodes", "µs per rename"], rows)
+
+
+if __name__ == "__main__":
+    main()
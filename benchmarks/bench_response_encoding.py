@@ -0,0 +1,79 @@
+"""Compare the JSON envelope with the raw XML body of transform responses.
+
+The transformed models are serialized once, the table reports the time to encode
+them as body and the size of the body: the complete string encoded by the default
+JSON provider of Flask (the former response), the streamed JSON object, which is
+encoded with orjson if it is installed, and the raw XML body of Accept:
+application/xml.
+
+Run with `python -m benchmarks.bench_response_encoding`.
+"""
+
+from app import create_app
+from app.json_provider import orjson
+from app.transform.main import iter_json, iter_xml
+from app.transform.transformer.transform_bpmn_to_petrinet.transform import (
+    bpmn_to_workflow_net,
+)
+from app.transform.transformer.transform_petrinet_to_bpmn.transform import (
+    pnml_to_bpmn,
+)
+from benchmarks.common import (
+    measure,
+    print_table,
+    synthetic_bpmn_model,
+    synthetic_pnml_model,
+)
+from flask.json.provider import DefaultJSONProvider
+
+
+def main():
+    """Run the benchmark."""
+    app = create_app("testing")
+    default_provider = DefaultJSONProvider(app)
+    print(f"JSON encoder: {'orjson' if orjson is not None else 'json'}")
+    rows: list[list[object]] = []
+    for blocks in (10, 100, 1000):
+        repeat = 3 if blocks > 100 else 10
+        cases = [
+            ("pnml", bpmn_to_workflow_net(synthetic_bpmn_model(blocks))),
+            ("bpmn", pnml_to_bpmn(synthetic_pnml_model(blocks))),
+        ]
+        for field, model in cases:
+            chunks = list(model.to_chunks())
+            text = "".join(chunks)
+
+            def encode_default():
+                return default_provider.response({field: text}).get_data()
+
+            def encode_json():
+                return b"".join(iter_json({field: iter(chunks)}))
+
+            def encode_xml():
+                return b"".join(iter_xml({field: iter(chunks)}))
+
+            rows.append(
+                [
+                    f"{field} {blocks}",
+                    measure(encode_default, repeat),
+                    measure(encode_json, repeat),
+                    measure(encode_xml, repeat),
+                    len(encode_json()),
+                    len(encode_xml()),
+                ]
+            )
+    print_table(
+        [
+            "model",
+            "default JSON ms",
+            "JSON chunks ms",
+            "XML chunks ms",
+            "JSON bytes",
+            "XML bytes",
+        ],
+        rows,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""Compare serializing a model to one string with serializing it in chunks.
+
+The table reports the time until the complete text and until the first chunk is
+available and the peak of traced allocations of both variants.
+
+Run with `python -m benchmarks.bench_serialization`.
+"""
+
+import time
+
+from app.transform.transformer.transform_bpmn_to_petrinet.transform import (
+    bpmn_to_workflow_net,
+)
+from app.transform.transformer.transform_petrinet_to_bpmn.transform import (
+    pnml_to_bpmn,
+)
+from benchmarks.common import (
+    measure,
+    peak_memory,
+    print_table,
+    synthetic_bpmn_model,
+    synthetic_pnml_model,
+)
+
+
+def consume(chunks):
+    """Iterate all chunks like a response being sent."""
+    for _ in chunks:
+        pass
+
+
+def first_chunk_ms(model, repeat: int):
+    """Return the best time until the first chunk of a model in milliseconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        next(iter(model.to_chunks()))
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main():
+    """Run the benchmark."""
+    rows: list[list[object]] = []
+    for blocks in (10, 100, 500):
+        repeat = 3 if blocks > 100 else 10
+        cases = [
+            ("pnml", bpmn_to_workflow_net(synthetic_bpmn_model(blocks))),
+            ("bpmn", pnml_to_bpmn(synthetic_pnml_model(blocks))),
+        ]
+        for kind, model in cases:
+            rows.append(
+                [
+                    f"{kind} {blocks}",
+                    len(model.to_string()),
+                    measure(model.to_string, repeat),
+                    measure(lambda: consume(model.to_chunks()), repeat),
+                    first_chunk_ms(model, repeat),
+                    peak_memory(model.to_string),
+                    peak_memory(lambda: consume(model.to_chunks())),
+                ]
+            )
+    print_table(
+        [
+            "model",
+            "chars",
+            "string ms",
+            "chunks ms",
+            "first chunk ms",
+            "string peak MiB",
+            "chunks peak MiB",
+        ],
+        rows,
+    )
+
+
+if __name__ == "__main__":
+    main()
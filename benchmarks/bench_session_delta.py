@@ -0,0 +1,62 @@
+"""Compare a session delta with posting and transforming the complete edited model.
+
+A delta renames one task and appends a task before the end event. The session
+applies it to the kept parsed model, a full request parses the edited XML again.
+Both transform the resulting model.
+
+Run with `python -m benchmarks.bench_session_delta`.
+"""
+
+import copy
+import time
+
+from app.transform.session import ModelDelta, ModelSession
+from app.transform.transformer.models.bpmn.bpmn import BPMN
+from app.transform.transformer.transform_bpmn_to_petrinet.transform import (
+    bpmn_to_workflow_net,
+)
+from benchmarks.common import measure, print_table, synthetic_bpmn_model
+
+DELTA = {
+    "remove_edges": ["join0TOend"],
+    "change_nodes": [{"id": "task0", "name": "renamed"}],
+    "add_nodes": [{"id": "appended", "type": "task", "name": "appended"}],
+    "add_edges": [
+        {"source": "join0", "target": "appended"},
+        {"source": "appended", "target": "end"},
+    ],
+}
+
+
+def main():
+    """Run the benchmark."""
+    rows: list[list[object]] = []
+    for blocks in (10, 100, 500):
+        bpmn = synthetic_bpmn_model(blocks)
+        # the delta always edits the last block
+        delta = copy.deepcopy(DELTA)
+        delta["remove_edges"] = [f"join{blocks - 1}TOend"]
+        delta["add_edges"][0]["source"] = f"join{blocks - 1}"
+        edited = copy.deepcopy(bpmn)
+        ModelSession("bpmntopnml", edited, None).apply(
+            ModelDelta.model_validate(delta), lambda model: b""
+        )
+        edited_xml = edited.to_xml(encoding="unicode")
+        repeat = 3 if blocks > 100 else 10
+
+        def full():
+            return bpmn_to_workflow_net(BPMN.from_xml(edited_xml, skip_diagram=True))
+
+        def session_delta():
+            session = ModelSession("bpmntopnml", copy.deepcopy(bpmn), None)
+            start = time.perf_counter()
+            session.apply(ModelDelta.model_validate(delta), bpmn_to_workflow_net)
+            return time.perf_counter() - start
+
+        delta_ms = min(session_delta() for _ in range(repeat)) * 1000
+        rows.append([blocks, len(edited_xml), measure(full, repeat), delta_ms])
+    print_table(["blocks", "bytes", "full request ms", "session delta ms"], rows)
+
+
+if __name__ == "__main__":
+    main()
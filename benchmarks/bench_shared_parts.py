@@ -0,0 +1,108 @@
+"""Measure the memory of nets with shared graphics and toolspecific parts.
+
+Names, elements and arcs of a net hold graphics and toolspecific parts, which are
+mostly equal: default offsets, dimensions and the toolspecific of transitions.
+These parts are immutable and equal parts are shared, so a large net doesn't hold
+an instance of each part per element. The table reports the growth of the peak
+resident memory and the traced allocations held by a parsed net, a generated net
+and a net transformed from a BPMN, with the time to create it. Each net is created
+in a new process, which reads the XML of a parsed net from a file.
+
+Run with `python -m benchmarks.bench_shared_parts`.
+"""
+
+import gc
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections.abc import Callable
+from pathlib import Path
+
+from app.transform.transformer.models.pnml.pnml import Pnml
+from app.transform.transformer.transform_bpmn_to_petrinet.transform import (
+    bpmn_to_workflow_net,
+)
+from benchmarks.common import (
+    print_table,
+    synthetic_bpmn_model,
+    synthetic_pnml,
+    synthetic_pnml_model,
+)
+
+CASES = ("parsed", "generated", "transformed")
+
+
+def peak_rss_mib():
+    """Return the peak resident memory of this process in MiB.
+
+    The peak of the resource usage is kept across exec, so it may be the peak of
+    the parent process, the peak of the memory of this process is read instead.
+    """
+    status = Path("/proc/self/status").read_text()
+    return int(status.split("VmHWM:")[1].split()[0]) / 1024
+
+
+def held_memory(create: Callable[[], object]):
+    """Return the peak resident and traced MiB of a created object and the ms."""
+    gc.collect()
+    rss = peak_rss_mib()
+    start = time.perf_counter()
+    held = create()
+    ms = (time.perf_counter() - start) * 1000
+    rss = peak_rss_mib() - rss
+    del held
+
+    tracemalloc.start()
+    held = create()
+    traced, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del held
+    return round(rss, 1), round(traced / 2**20, 1), round(ms)
+
+
+def creator(name: str, blocks: int, path: str) -> Callable[[], object]:
+    """Return the function creating a net of a model size."""
+    if name == "parsed":
+        xml = Path(path).read_text()
+        return lambda: Pnml.from_xml_str(xml)
+    if name == "generated":
+        return lambda: synthetic_pnml_model(blocks)
+    bpmn = synthetic_bpmn_model(blocks)
+    return lambda: bpmn_to_workflow_net(bpmn.model_copy(deep=True))
+
+
+def net_rows(blocks: int):
+    """Return the rows of holding the nets of a model size, each in a new process."""
+    with tempfile.NamedTemporaryFile("w", suffix=".pnml") as file:
+        file.write(synthetic_pnml(blocks))
+        file.flush()
+        for name in CASES:
+            result = subprocess.run(
+                [
+                    sys.executable,
+                    *("-m", "benchmarks.bench_shared_parts"),
+                    *(name, str(blocks), file.name),
+                ],
+                capture_output=True,
+                check=True,
+                text=True,
+            )
+            yield [f"{name} {blocks}", *result.stdout.split()]
+
+
+def main():
+    """Run the benchmark."""
+    if len(sys.argv) == 4:
+        name, blocks, path = sys.argv[1], int(sys.argv[2]), sys.argv[3]
+        print(*held_memory(creator(name, blocks, path)))
+        return
+    print_table(
+        ["net", "peak RSS MiB", "traced MiB", "ms"],
+        [row for blocks in (1000, 3000) for row in net_rows(blocks)],
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""Measure the transformation passes on synthetic models of growing size.
+
+The passes run on the graph indexes of nets and processes. The table reports the
+time of the preprocessing and transformation of each direction, without parsing
+and serialization, and the time per thousand nodes of the input model to show
+how the passes scale.
+
+Run with `python -m benchmarks.bench_transform_passes`.
+"""
+
+import time
+from collections.abc import Callable
+
+from app.transform.transformer.transform_bpmn_to_petrinet.transform import (
+    bpmn_to_workflow_net,
+)
+from app.transform.transformer.transform_petrinet_to_bpmn.transform import (
+    pnml_to_bpmn,
+)
+from benchmarks.common import print_table, synthetic_bpmn_model, synthetic_pnml_model
+
+
+def measure_pass(create: Callable[[], object], transform: Callable, repeat: int):
+    """Return the best time of a pass in ms, which runs on a new model each time."""
+    best = float("inf")
+    for _ in range(repeat):
+        model = create()
+        start = time.perf_counter()
+        transform(model)
+        best = min(best, time.perf_counter() - start)
+    return round(best * 1000, 2)
+
+
+def main():
+    """Run the benchmark."""
+    rows: list[list[object]] = []
+    for blocks in (100, 1000, 3000):
+        repeat = 1 if blocks > 1000 else 3
+        pnml = synthetic_pnml_model(blocks)
+        bpmn = synthetic_bpmn_model(blocks)
+        cases = [
+            (
+                "pnmltobpmn",
+                len(pnml.net.places) + len(pnml.net.transitions),
+                lambda blocks=blocks: synthetic_pnml_model(blocks),
+                pnml_to_bpmn,
+            ),
+            (
+                "bpmntopnml",
+                len(bpmn.process._flatten_node_typ_map()),
+                lambda blocks=blocks: synthetic_bpmn_model(blocks),
+                bpmn_to_workflow_net,
+            ),
+        ]
+        for direction, nodes, create, transform in cases:
+            ms = measure_pass(create, transform, repeat)
+            rows.append(
+                [f"{direction} {blocks}", nodes, ms, round(ms / nodes * 1000, 2)]
+            )
+    print_table(["model", "nodes", "ms", "ms per 1000 nodes"], rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,164 @@
+"""Shared corpus, synthetic model generators and timing helpers for benchmarks."""
+
+import os
+import time
+import tracemalloc
+from collections.abc import Callable
+from pathlib import Path
+from typing import cast
+
+os.environ.setdefault("FORCE_STD_XML", "true")
+
+from app.transform.transformer.models.bpmn.bpmn import (  # noqa: E402
+    BPMN,
+    EndEvent,
+    StartEvent,
+    Task,
+    XorGateway,
+)
+from app.transform.transformer.models.pnml.pnml import (  # noqa: E402
+    Place,
+    Pnml,
+    Transition,
+)
+from app.transform.transformer.models.pnml.workflow import (  # noqa: E402
+    WorkflowBranchingType,
+)
+
+ASSETS = Path(__file__).parent.parent / "tests" / "transform" / "assets"
+
+
+def _corpus(suffix: str, parse: Callable[[str], object]):
+    """Return (name, content) of all asset diagrams that can be parsed."""
+    corpus: list[tuple[str, str]] = []
+    for path in sorted(ASSETS.rglob(f"*{suffix}")):
+        content = path.read_text()
+        try:
+            parse(content)
+        except Exception:
+            continue
+        corpus.append((path.name, content))
+    return corpus
+
+
+def bpmn_corpus():
+    """Return all supported BPMN diagrams of the test assets."""
+    return _corpus(".bpmn", BPMN.from_xml)
+
+
+def pnml_corpus():
+    """Return all valid PNML diagrams of the test assets."""
+    return _corpus(".pnml", Pnml.from_xml_str)
+
+
+def synthetic_bpmn_model(blocks: int):
+    """Return a BPMN process with blocks of a task followed by a XOR split/join.
+
+    Each block holds five nodes: task, XOR split, two branch tasks and XOR join.
+    """
+    bpmn = BPMN.generate_empty_bpmn("synthetic")
+    process = bpmn.process
+    previous = process.add_node(StartEvent(id="start"))
+    for i in range(blocks):
+        task = process.add_node(Task(id=f"task{i}", name=f"Task {i}"))
+        split = process.add_node(XorGateway(id=f"split{i}"))
+        join = process.add_node(XorGateway(id=f"join{i}"))
+        process.add_flow(previous, task)
+        process.add_flow(task, split)
+        for branch in ("a", "b"):
+            branch_task = process.add_node(
+                Task(id=f"task{i}{branch}", name=f"Task {i}{branch}")
+            )
+            process.add_flow(split, branch_task)
+            process.add_flow(branch_task, join)
+        previous = join
+    process.add_flow(previous, process.add_node(EndEvent(id="end")))
+    return bpmn
+
+
+def synthetic_bpmn(blocks: int, with_diagram: bool = False):
+    """Return the XML of a synthetic BPMN (with or without placeholder DI)."""
+    bpmn = synthetic_bpmn_model(blocks)
+    if with_diagram:
+        return bpmn.to_string()
+    return cast(str, bpmn.to_xml(encoding="unicode"))
+
+
+def synthetic_pnml_model(blocks: int):
+    """Return a workflow net with blocks of a transition and a XOR split/join.
+
+    Each block holds a transition followed by a XOR split operator with two branch
+    transitions and a XOR join operator.
+    """
+    pnml = Pnml.generate_empty_net("synthetic")
+    net = pnml.net
+    previous = net.add_element(Place.create(id="p_start", name="start"))
+    for i in range(blocks):
+        task = net.add_element(Transition.create(id=f"t{i}", name=f"Task {i}"))
+        before_split = net.add_element(Place.create(id=f"p{i}_split"))
+        after_join = net.add_element(Place.create(id=f"p{i}_join"))
+        net.add_arc(previous, task)
+        net.add_arc(task, before_split)
+        for j, branch in enumerate(("a", "b")):
+            split = net.add_element(
+                Transition.create(id=f"xs{i}_op_{j + 1}").mark_as_workflow_operator(
+                    WorkflowBranchingType.XorSplit, f"xs{i}"
+                )
+            )
+            branch_in = net.add_element(Place.create(id=f"p{i}{branch}_in"))
+            branch_task = net.add_element(
+                Transition.create(id=f"t{i}{branch}", name=f"Task {i}{branch}")
+            )
+            branch_out = net.add_element(Place.create(id=f"p{i}{branch}_out"))
+            join = net.add_element(
+                Transition.create(id=f"xj{i}_op_{j + 1}").mark_as_workflow_operator(
+                    WorkflowBranchingType.XorJoin, f"xj{i}"
+                )
+            )
+            net.add_arc(before_split, split)
+            net.add_arc(split, branch_in)
+            net.add_arc(branch_in, branch_task)
+            net.add_arc(branch_task, branch_out)
+            net.add_arc(branch_out, join)
+            net.add_arc(join, after_join)
+        previous = after_join
+    end = net.add_element(Transition.create(id="t_end", name="end"))
+    net.add_arc(previous, end)
+    net.add_arc(end, net.add_element(Place.create(id="p_end", name="end")))
+    return pnml
+
+
+def synthetic_pnml(blocks: int):
+    """Return the XML of a synthetic workflow net."""
+    return synthetic_pnml_model(blocks).to_string()
+
+
+def measure(func: Callable[[], object], repeat: int = 5):
+    """Return the best wall clock time of several runs in milliseconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def peak_memory(func: Callable[[], object]):
+    """Return the peak of traced allocations of a call in MiB."""
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak / 2**20
+
+
+def print_table(header: list[str], rows: list[list[object]]):
+    """Print rows as a simple aligned text table."""
+    cells = [header] + [
+        [f"{c:.2f}" if isinstance(c, float) else str(c) for c in row] for row in rows
+    ]
+    widths = [max(len(row[i]) for row in cells) for i in range(len(header))]
+    for i, row in enumerate(cells):
+        print("  ".join(c.ljust(w) for c, w in zip(row, widths)))
+        if i == 0:
+            print("  ".join("-" * w for w in widths))
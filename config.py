@@ -27,6 +27,26 @@ class Config:
     JSON_SORT_KEYS = False
     PROPAGATE_EXCEPTIONS = False
     LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
+    # XML parser to read posted models: "std" (defusedxml) or "lxml" (hardened)
+    XML_PARSER_BACKEND = os.getenv("XML_PARSER_BACKEND", "std")
+    # Cache of transformation results per worker, bound by the size of the results
+    RESULT_CACHE_ENABLED = os.getenv("RESULT_CACHE_ENABLED", "true").lower() == "true"
+    RESULT_CACHE_MAX_BYTES = int(os.getenv("RESULT_CACHE_MAX_BYTES", 32 * 1024 * 1024))
+    # Limits of posted models, rejected before the transformation (0 disables a limit)
+    MAX_CONTENT_LENGTH = int(os.getenv("MAX_CONTENT_LENGTH", 16 * 1024 * 1024)) or None
+    MODEL_MAX_ELEMENTS = int(os.getenv("MODEL_MAX_ELEMENTS", 500_000))
+    MODEL_MAX_DEPTH = int(os.getenv("MODEL_MAX_DEPTH", 100))
+    MODEL_MAX_SUBPROCESS_DEPTH = int(os.getenv("MODEL_MAX_SUBPROCESS_DEPTH", 20))
+    MODEL_MAX_CONNECTIONS = int(os.getenv("MODEL_MAX_CONNECTIONS", 100_000))
+    # Compression of responses with gzip or deflate from this body size on
+    COMPRESSION_ENABLED = os.getenv("COMPRESSION_ENABLED", "true").lower() == "true"
+    COMPRESSION_MIN_BYTES = int(os.getenv("COMPRESSION_MIN_BYTES", 1024))
+    COMPRESSION_LEVEL = int(os.getenv("COMPRESSION_LEVEL", 6))
+    # Transformation sessions of edited models per worker
+    SESSION_MAX_COUNT = int(os.getenv("SESSION_MAX_COUNT", 32))
+    SESSION_TTL_SECONDS = int(os.getenv("SESSION_TTL_SECONDS", 30 * 60))
+    # Size bound of the posted models and responses of the sessions per worker
+    SESSION_MAX_BYTES = int(os.getenv("SESSION_MAX_BYTES", 32 * 1024 * 1024))
 
     @staticmethod
     def init_app(app):
@@ -0,0 +1,168 @@
+"""Unit tests for the request handling of the transform endpoint."""
+
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import flask
+
+from app import create_app
+from app.model_transformer.metrics import MODEL_LIMIT_HITS
+from app.transform.exceptions import UnexpectedError
+from app.transform.main import process_transform_request
+from app.transform.transformer.models.pnml.pnml import Pnml
+
+ASSETS = Path("tests/transform/assets")
+BPMN_FILE = ASSETS / "diagrams/bpmn/02Verbesserte_Integration_UserService.bpmn"
+
+
+class TestRawXMLRequest(unittest.TestCase):
+    """This class tests posting the model as raw XML body."""
+
+    def setUp(self):
+        """Performs setup before each test case."""
+        self.client = create_app("testing").test_client()
+
+    def test_bpmn_raw_body_equals_form(self):
+        """Tests whether a raw BPMN body is transformed like the form field."""
+        bpmn = BPMN_FILE.read_bytes()
+        form_res = self.client.post(
+            "/transform?direction=bpmntopnml", data={"bpmn": bpmn.decode()}
+        )
+        raw_res = self.client.post(
+            "/transform?direction=bpmntopnml",
+            data=bpmn,
+            content_type="application/xml",
+        )
+        self.assertEqual(raw_res.status_code, 200)
+        self.assertEqual(raw_res.get_json(), form_res.get_json())
+
+    def test_pnml_raw_body_equals_form(self):
+        """Tests whether a raw PNML body is transformed like the form field."""
+        pnml = (ASSETS / "diagrams/pnml/Example-Workflow.pnml").read_bytes()
+        form_res = self.client.post(
+            "/transform?direction=pnmltobpmn", data={"pnml": pnml.decode()}
+        )
+        raw_res = self.client.post(
+            "/transform?direction=pnmltobpmn",
+            data=pnml,
+            content_type="text/xml; charset=utf-8",
+        )
+        self.assertEqual(raw_res.status_code, 200)
+        self.assertEqual(raw_res.get_json(), form_res.get_json())
+
+    def test_invalid_raw_body(self):
+        """Tests whether an empty or malformed raw body is rejected."""
+        for body in [b"", b"<pnml><net>"]:
+            with self.subTest(body=body):
+                res = self.client.post(
+                    "/transform?direction=pnmltobpmn",
+                    data=body,
+                    content_type="application/xml",
+                )
+                self.assertEqual(res.status_code, 400)
+                self.assertIn("[11]", res.get_data(as_text=True))
+
+    def test_missing_form_field(self):
+        """Tests whether a form request without model field is rejected."""
+        res = self.client.post("/transform?direction=bpmntopnml", data={"x": "y"})
+        self.assertEqual(res.status_code, 400)
+        self.assertIn("[1001]", res.get_data(as_text=True))
+
+
+class TestModelLimitsRequest(unittest.TestCase):
+    """This class tests rejecting posted models exceeding the configured limits."""
+
+    def setUp(self):
+        """Performs setup before each test case."""
+        self.app = create_app("testing")
+        self.client = self.app.test_client()
+
+    def test_too_large_body(self):
+        """Tests whether a body larger than MAX_CONTENT_LENGTH is rejected."""
+        self.app.config["MAX_CONTENT_LENGTH"] = 100
+        for data, content_type in [
+            (BPMN_FILE.read_bytes(), "application/xml"),
+            ({"bpmn": BPMN_FILE.read_text()}, None),
+        ]:
+            with self.subTest(content_type=content_type):
+                res = self.client.post(
+                    "/transform?direction=bpmntopnml",
+                    data=data,
+                    content_type=content_type,
+                )
+                self.assertEqual(res.status_code, 400)
+                self.assertIn("[12]", res.get_data(as_text=True))
+                self.assertIn("max_content_length", res.get_data(as_text=True))
+
+    def test_too_many_elements(self):
+        """Tests whether a model with too many elements is rejected and counted."""
+        self.app.config["MODEL_MAX_ELEMENTS"] = 10
+        hits = MODEL_LIMIT_HITS.labels(limit="max_elements")._value.get()
+        res = self.client.post(
+            "/transform?direction=bpmntopnml",
+            data=BPMN_FILE.read_bytes(),
+            content_type="application/xml",
+        )
+        self.assertEqual(res.status_code, 400)
+        self.assertIn("[12]", res.get_data(as_text=True))
+        self.assertEqual(
+            MODEL_LIMIT_HITS.labels(limit="max_elements")._value.get(), hits + 1
+        )
+
+
+def failing_chunks(*args, **kwargs):
+    """Return chunks of a model, which can't be serialized."""
+    raise ValueError("model can't be serialized")
+    yield ""
+
+
+class TestSerializationError(unittest.TestCase):
+    """This class tests errors while serializing the transformed model."""
+
+    def setUp(self):
+        """Performs setup before each test case."""
+        self.client = create_app("testing").test_client()
+
+    def test_error_before_response(self):
+        """Tests whether a failing serialization is an error instead of a result."""
+        for accept in ["application/json", "application/xml"]:
+            with self.subTest(accept=accept):
+                with mock.patch.object(Pnml, "to_chunks", failing_chunks):
+                    res = self.client.post(
+                        "/transform?direction=bpmntopnml",
+                        data=BPMN_FILE.read_bytes(),
+                        content_type="application/xml",
+                        headers={"Accept": accept},
+                    )
+                self.assertEqual(res.status_code, 400)
+                self.assertEqual(res.get_data(as_text=True), str(UnexpectedError()))
+
+
+class TestPreflight(unittest.TestCase):
+    """This class tests the answers to CORS preflight requests."""
+
+    def setUp(self):
+        """Performs setup before each test case."""
+        self.app = create_app("testing")
+
+    def test_preflight_answers_agree(self):
+        """Tests whether flask-cors and the handler allow the same requests."""
+        res = self.app.test_client().options(
+            "/transform",
+            headers={
+                "Origin": "https://editor.example",
+                "Access-Control-Request-Method": "POST",
+                "Access-Control-Request-Headers": "Content-Type, Content-Encoding",
+            },
+        )
+        with self.app.test_request_context("/transform", method="OPTIONS"):
+            handled = process_transform_request(flask.request)
+        for response in [res, handled]:
+            with self.subTest(response=response):
+                self.assertEqual(response.status_code, 200)
+                self.assertIn("POST", response.headers["Access-Control-Allow-Methods"])
+                self.assertIn(
+                    "content-encoding",
+                    response.headers["Access-Control-Allow-Headers"].lower(),
+                )
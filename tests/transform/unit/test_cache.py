@@ -0,0 +1,149 @@
+"""Unit tests for the cache of transformation results."""
+
+import unittest
+from pathlib import Path
+
+from app import create_app
+from app.model_transformer.metrics import (
+    RESULT_CACHE_EVICTIONS,
+    RESULT_CACHE_HITS,
+    RESULT_CACHE_MISSES,
+)
+from app.transform.cache import RESULT_CACHE_EXTENSION, ModelDigest, ResultCache
+
+BPMN_FILE = Path(
+    "tests/transform/assets/diagrams/bpmn/02Verbesserte_Integration_UserService.bpmn"
+)
+
+
+def counter_value(counter):
+    """Return the current value of a prometheus counter."""
+    return counter._value.get()
+
+
+class TestResultCache(unittest.TestCase):
+    """This class tests the LRU cache of response bodies."""
+
+    def test_key_normalization(self):
+        """Tests whether equal documents of different encodings share a key."""
+        key = ResultCache.create_key("bpmntopnml", "<a>\n<b/>\n</a>")
+        self.assertEqual(key, ResultCache.create_key("bpmntopnml", b"<a>\n<b/>\n</a>"))
+        self.assertEqual(
+            key, ResultCache.create_key("bpmntopnml", b"<a>\r\n<b/>\r\n</a>\r\n")
+        )
+        self.assertEqual(key, ResultCache.create_key("bpmntopnml", "<a>\n<b/>\n</a> \n"))
+        self.assertNotEqual(key, ResultCache.create_key("pnmltobpmn", "<a>\n<b/>\n</a>"))
+        self.assertNotEqual(key, ResultCache.create_key("bpmntopnml", "<a><b/></a>"))
+
+    def test_digest_of_parts(self):
+        """Tests whether a model read in parts has the key of the whole model."""
+        model = b"<a>\r\n<b/>  \r\n</a>\r\n \n"
+        key = ResultCache.create_key("bpmntopnml", model)
+        for size in range(1, len(model)):
+            with self.subTest(size=size):
+                digest = ModelDigest("bpmntopnml")
+                for start in range(0, len(model), size):
+                    digest.update(model[start : start + size])
+                self.assertEqual(digest.hexdigest(), key)
+
+    def test_lru_eviction(self):
+        """Tests whether the least recently used body is evicted first."""
+        cache = ResultCache(max_bytes=10)
+        evictions = counter_value(RESULT_CACHE_EVICTIONS)
+        cache.put("a", b"1234")
+        cache.put("b", b"1234")
+        self.assertEqual(cache.get("a"), b"1234")
+        cache.put("c", b"1234")
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("a"), b"1234")
+        self.assertEqual(cache.get("c"), b"1234")
+        self.assertEqual(cache.size, 8)
+        self.assertEqual(counter_value(RESULT_CACHE_EVICTIONS), evictions + 1)
+
+    def test_byte_bound(self):
+        """Tests whether the cache never stores more bytes than its bound."""
+        cache = ResultCache(max_bytes=10)
+        cache.put("large", b"12345678901")
+        self.assertEqual(len(cache), 0)
+        cache.put("a", b"123")
+        cache.put("a", b"123456")
+        self.assertEqual(cache.size, 6)
+        cache.put("b", b"123456")
+        self.assertEqual(len(cache), 1)
+        self.assertEqual(cache.size, 6)
+
+    def test_hit_and_miss_counters(self):
+        """Tests whether lookups are counted as hits and misses."""
+        cache = ResultCache(max_bytes=10)
+        hits, misses = (
+            counter_value(RESULT_CACHE_HITS),
+            counter_value(RESULT_CACHE_MISSES),
+        )
+        cache.get("a")
+        cache.put("a", b"1")
+        cache.get("a")
+        self.assertEqual(counter_value(RESULT_CACHE_HITS), hits + 1)
+        self.assertEqual(counter_value(RESULT_CACHE_MISSES), misses + 1)
+
+    def test_streamed_body(self):
+        """Tests whether a streamed body is stored once all chunks are sent."""
+        cache = ResultCache(max_bytes=10)
+        chunks = cache.put_chunks("a", iter([b"123", b"456"]))
+        self.assertEqual(next(chunks), b"123")
+        self.assertEqual(len(cache), 0)
+        self.assertEqual(list(chunks), [b"456"])
+        self.assertEqual(cache.get("a"), b"123456")
+
+        chunks = cache.put_chunks("b", [b"123456", b"78901"])
+        self.assertEqual(list(chunks), [b"123456", b"78901"])
+        self.assertIsNone(cache.get("b"))
+
+
+class TestResultCacheRequest(unittest.TestCase):
+    """This class tests the result cache of the transform endpoint."""
+
+    def setUp(self):
+        """Performs setup before each test case."""
+        self.app = create_app("testing")
+        self.client = self.app.test_client()
+
+    def test_repeated_request_is_cached(self):
+        """Tests whether a repeated transformation is answered from the cache."""
+        bpmn = BPMN_FILE.read_text()
+        hits = counter_value(RESULT_CACHE_HITS)
+        # the streamed body is cached once it is sent completely
+        first = self.client.post(
+            "/transform?direction=bpmntopnml", data={"bpmn": bpmn}, buffered=True
+        )
+        second = self.client.post(
+            "/transform?direction=bpmntopnml",
+            data=bpmn.encode(),
+            content_type="application/xml",
+        )
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(second.status_code, 200)
+        self.assertEqual(second.get_data(), first.get_data())
+        self.assertEqual(second.headers["Access-Control-Allow-Origin"], "*")
+        self.assertEqual(counter_value(RESULT_CACHE_HITS), hits + 1)
+        self.assertEqual(len(self.app.extensions[RESULT_CACHE_EXTENSION]), 1)
+
+    def test_failed_transformation_is_not_cached(self):
+        """Tests whether an invalid model is not stored in the cache."""
+        res = self.client.post(
+            "/transform?direction=pnmltobpmn",
+            data=b"<pnml><net>",
+            content_type="application/xml",
+        )
+        self.assertEqual(res.status_code, 400)
+        self.assertEqual(len(self.app.extensions[RESULT_CACHE_EXTENSION]), 0)
+
+    def test_disabled_cache(self):
+        """Tests whether the transformation works without the cache."""
+        del self.app.extensions[RESULT_CACHE_EXTENSION]
+        res = self.client.post(
+            "/transform?direction=bpmntopnml",
+            data=BPMN_FILE.read_bytes(),
+            content_type="application/xml",
+        )
+        self.assertEqual(res.status_code, 200)
+        self.assertIn("pnml", res.get_json())
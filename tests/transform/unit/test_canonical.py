@@ -0,0 +1,162 @@
+"""Unit tests for the canonical serialization and entity tags of results."""
+
+import gzip
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+from app import create_app
+from app.transform.cache import RESULT_CACHE_EXTENSION
+from app.transform.main import RESULT_VERSION, result_version
+from app.transform.transformer.models.bpmn.bpmn import Lane
+from app.transform.transformer.models.pnml.pnml import Pnml
+from app.transform.transformer.utility.xml_writer import XML_HEADER
+
+PNML_FILE = Path("tests/transform/assets/diagrams/pnml/Insurance.pnml")
+BPMN_FILE = Path(
+    "tests/transform/assets/diagrams/bpmn/02Verbesserte_Integration_UserService.bpmn"
+)
+
+# prints the digest of the transformed test models
+SERIALIZE_SCRIPT = f"""
+import hashlib
+from pathlib import Path
+from app.transform.transformer.models.bpmn.bpmn import BPMN
+from app.transform.transformer.models.pnml.pnml import Pnml
+from app.transform.transformer.transform_bpmn_to_petrinet.transform import (
+    bpmn_to_workflow_net,
+)
+from app.transform.transformer.transform_petrinet_to_bpmn.transform import (
+    pnml_to_bpmn,
+)
+pnml = Pnml.from_xml_str(Path("{PNML_FILE}").read_text())
+bpmn = BPMN.from_xml(Path("{BPMN_FILE}").read_text())
+texts = [*pnml_to_bpmn(pnml).to_chunks(), *bpmn_to_workflow_net(bpmn).to_chunks()]
+print(hashlib.sha256("".join(texts).encode()).hexdigest())
+"""
+
+
+class TestCanonicalSerialization(unittest.TestCase):
+    """This class tests the stable order of serialized models."""
+
+    def test_sets_are_sorted(self):
+        """Tests whether the items of sets are serialized in the order of ids."""
+        lane = Lane(id="lane", flowNodeRefs={"c", "a", "b"})
+        text = lane.canonical().to_xml(encoding="unicode")
+        self.assertLess(text.index(">a<"), text.index(">b<"))
+        self.assertLess(text.index(">b<"), text.index(">c<"))
+        self.assertEqual(lane.flowNodeRefs, {"a", "b", "c"})
+
+        pnml = Pnml.from_xml_str(PNML_FILE.read_text())
+        text = "".join(pnml.to_chunks())
+        ids = sorted(place.id for place in pnml.net.places)
+        positions = [text.index(f'<place id="{id}"') for id in ids]
+        self.assertEqual(positions, sorted(positions))
+        self.assertEqual(text, XML_HEADER + pnml.to_string())
+
+    def test_independent_of_hash_seed(self):
+        """Tests whether processes with other hash seeds serialize the same XML."""
+        digests = set()
+        for seed in ("1", "2", "3"):
+            env = os.environ | {"PYTHONHASHSEED": seed, "FORCE_STD_XML": "true"}
+            result = subprocess.run(
+                [sys.executable, "-c", SERIALIZE_SCRIPT],
+                env=env,
+                capture_output=True,
+                text=True,
+                check=True,
+            )
+            digests.add(result.stdout.strip())
+        self.assertEqual(len(digests), 1)
+
+
+class TestEntityTagRequest(unittest.TestCase):
+    """This class tests the entity tags of the transform endpoint."""
+
+    def setUp(self):
+        """Performs setup before each test case."""
+        self.app = create_app("testing")
+        self.client = self.app.test_client()
+
+    def post_pnml(self, headers: dict[str, str] | None = None):
+        """Post the PNML as raw XML body with headers."""
+        return self.client.post(
+            "/transform?direction=pnmltobpmn",
+            data=PNML_FILE.read_bytes(),
+            content_type="application/xml",
+            headers=headers,
+            buffered=True,
+        )
+
+    def test_strong_entity_tag(self):
+        """Tests whether equal results have equal strong tags with and without cache."""
+        first = self.post_pnml()
+        etag, weak = first.get_etag()
+        self.assertFalse(weak)
+        self.assertEqual(self.post_pnml().get_etag(), (etag, False))
+        xml = self.post_pnml({"Accept": "application/xml"})
+        self.assertNotEqual(xml.get_etag()[0], etag)
+
+        del self.app.extensions[RESULT_CACHE_EXTENSION]
+        uncached = self.post_pnml()
+        self.assertEqual(uncached.get_etag(), (etag, False))
+        self.assertEqual(uncached.get_data(), first.get_data())
+
+    def test_not_modified(self):
+        """Tests whether a matching If-None-Match tag is answered with 304."""
+        etag, _ = self.post_pnml().get_etag()
+        for cached in (True, False):
+            if not cached:
+                del self.app.extensions[RESULT_CACHE_EXTENSION]
+            with self.subTest(cached=cached):
+                res = self.post_pnml({"If-None-Match": f'"other", "{etag}"'})
+                self.assertEqual(res.status_code, 304)
+                self.assertEqual(res.get_data(), b"")
+                self.assertEqual(res.get_etag(), (etag, False))
+                res = self.post_pnml({"If-None-Match": '"other"'})
+                self.assertEqual(res.status_code, 200)
+
+    def test_result_version(self):
+        """Tests whether the tags change with the modules and packages of results."""
+        etag, _ = self.post_pnml().get_etag()
+        self.assertTrue(etag.endswith(f"-{RESULT_VERSION}"))
+        with tempfile.TemporaryDirectory() as directory:
+            module = Path(directory) / "transformer" / "transform.py"
+            module.parent.mkdir()
+            module.write_text("RESULT = 1\n")
+            version = result_version([module.parent], [])
+            self.assertEqual(result_version([module.parent], []), version)
+            module.write_text("RESULT = 2\n")
+            self.assertNotEqual(result_version([module.parent], []), version)
+        self.assertNotEqual(result_version([], ["pydantic"]), result_version([], []))
+
+    def test_cross_origin_entity_tag(self):
+        """Tests whether a browser may read the tag and send it back."""
+        origin = {"Origin": "https://editor.example"}
+        res = self.client.options(
+            "/transform",
+            headers={
+                **origin,
+                "Access-Control-Request-Method": "POST",
+                "Access-Control-Request-Headers": "If-None-Match",
+            },
+        )
+        allowed = res.headers["Access-Control-Allow-Headers"].lower()
+        self.assertIn("if-none-match", allowed)
+        res = self.post_pnml(origin)
+        self.assertIsNotNone(res.get_etag()[0])
+        self.assertIn("ETag", res.headers["Access-Control-Expose-Headers"])
+
+    def test_compressed_entity_tag(self):
+        """Tests whether a compressed result has the tag of its coding."""
+        etag, _ = self.post_pnml().get_etag()
+        res = self.post_pnml({"Accept-Encoding": "gzip"})
+        self.assertEqual(res.get_etag(), (f"{etag}-gzip", False))
+        self.assertIn(b"bpmn", gzip.decompress(res.get_data()))
+        headers = {"Accept-Encoding": "gzip", "If-None-Match": f'"{etag}-gzip"'}
+        res = self.post_pnml(headers)
+        self.assertEqual(res.status_code, 304)
+        self.assertEqual(res.get_etag(), (f"{etag}-gzip", False))
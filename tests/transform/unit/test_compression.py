@@ -0,0 +1,112 @@
+"""Unit tests for compressed responses and request bodies."""
+
+import gzip
+import io
+import unittest
+import zlib
+from pathlib import Path
+
+from app import create_app
+from app.compression import DecompressedStream
+from app.transform.exceptions import InvalidContentEncoding, ModelLimitExceeded
+
+PNML_FILE = Path("tests/transform/assets/diagrams/pnml/Insurance.pnml")
+
+
+class TestDecompressedStream(unittest.TestCase):
+    """This class tests reading compressed streams."""
+
+    def test_read_in_parts(self):
+        """Tests whether a read returns at most the requested bytes."""
+        content = b"<a>" + b"x" * 100_000 + b"</a>"
+        stream = DecompressedStream(io.BytesIO(gzip.compress(content)), 47)
+        self.assertEqual(len(stream.read(10)), 10)
+        self.assertEqual(stream.read(10), b"x" * 10)
+        self.assertEqual(len(stream.read()), len(content) - 20)
+        self.assertEqual(stream.read(10), b"")
+
+    def test_invalid_content(self):
+        """Tests whether invalid or truncated content is rejected."""
+        for compressed in [b"not compressed", gzip.compress(b"<a></a>")[:-10]]:
+            with self.subTest(compressed=compressed):
+                stream = DecompressedStream(io.BytesIO(compressed), 47)
+                with self.assertRaises(InvalidContentEncoding):
+                    stream.read()
+
+    def test_max_size(self):
+        """Tests whether content larger than the maximum size is rejected."""
+        compressed = gzip.compress(b"x" * 100_000)
+        stream = DecompressedStream(io.BytesIO(compressed), 47, 100_000)
+        self.assertEqual(len(stream.read()), 100_000)
+        stream = DecompressedStream(io.BytesIO(compressed), 47, 99_999)
+        with self.assertRaises(ModelLimitExceeded):
+            stream.read()
+
+
+class TestCompressionRequest(unittest.TestCase):
+    """This class tests the compression of the transform endpoint."""
+
+    def setUp(self):
+        """Performs setup before each test case."""
+        self.app = create_app("testing")
+        self.client = self.app.test_client()
+
+    def post_pnml(self, data: bytes, headers: dict[str, str]):
+        """Post a PNML as raw XML body with headers."""
+        return self.client.post(
+            "/transform?direction=pnmltobpmn",
+            data=data,
+            content_type="application/xml",
+            headers=headers,
+            buffered=True,
+        )
+
+    def test_compressed_response(self):
+        """Tests whether the response is compressed as accepted by the client."""
+        expected = self.post_pnml(PNML_FILE.read_bytes(), {}).get_data()
+        for coding, decompress in [
+            ("gzip", gzip.decompress),
+            ("deflate", zlib.decompress),
+        ]:
+            with self.subTest(coding=coding):
+                res = self.post_pnml(
+                    PNML_FILE.read_bytes(), {"Accept-Encoding": f"br, {coding}"}
+                )
+                self.assertEqual(res.status_code, 200)
+                self.assertEqual(res.headers["Content-Encoding"], coding)
+                self.assertIn("Accept-Encoding", res.headers["Vary"])
+                self.assertLess(len(res.get_data()), len(expected))
+                self.assertEqual(decompress(res.get_data()), expected)
+
+    def test_uncompressed_response(self):
+        """Tests whether small bodies and other codings are sent uncompressed."""
+        res = self.post_pnml(PNML_FILE.read_bytes(), {"Accept-Encoding": "br"})
+        self.assertNotIn("Content-Encoding", res.headers)
+        self.app.config["COMPRESSION_MIN_BYTES"] = 10_000_000
+        res = self.post_pnml(PNML_FILE.read_bytes(), {"Accept-Encoding": "gzip"})
+        self.assertNotIn("Content-Encoding", res.headers)
+        self.assertIn("bpmn", res.get_json())
+
+    def test_compressed_request(self):
+        """Tests whether a gzip compressed body is transformed like the raw body."""
+        expected = self.post_pnml(PNML_FILE.read_bytes(), {}).get_data()
+        res = self.post_pnml(
+            gzip.compress(PNML_FILE.read_bytes()), {"Content-Encoding": "gzip"}
+        )
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(res.get_data(), expected)
+
+    def test_invalid_compressed_request(self):
+        """Tests whether invalid or unknown request codings are rejected."""
+        res = self.post_pnml(PNML_FILE.read_bytes(), {"Content-Encoding": "gzip"})
+        self.assertEqual(res.status_code, 400)
+        res = self.post_pnml(PNML_FILE.read_bytes(), {"Content-Encoding": "br"})
+        self.assertEqual(res.status_code, 415)
+
+    def test_decompressed_size_limit(self):
+        """Tests whether the decompressed body is limited by MAX_CONTENT_LENGTH."""
+        content = PNML_FILE.read_bytes()
+        self.app.config["MAX_CONTENT_LENGTH"] = len(content) - 1
+        res = self.post_pnml(gzip.compress(content), {"Content-Encoding": "gzip"})
+        self.assertEqual(res.status_code, 400)
+        self.assertIn("[12]", res.get_data(as_text=True))
@@ -0,0 +1,220 @@
+"""Unit tests for the JSON graph interchange of models."""
+
+import json
+import unittest
+from pathlib import Path
+
+from app import create_app
+from app.transform.exceptions import InvalidModelGraph, ModelLimitExceeded
+from app.transform.graph import (
+    GRAPH_MIMETYPE,
+    bpmn_graph,
+    pnml_graph,
+    read_bpmn_graph,
+    read_pnml_graph,
+)
+from app.transform.transformer.equality.bpmn import compare_bpmn
+from app.transform.transformer.equality.petrinet import compare_pnml
+from app.transform.transformer.models.bpmn.bpmn import BPMN
+from app.transform.transformer.models.pnml.pnml import Pnml
+from app.transform.transformer.utility.limits import ModelLimits
+
+BPMN_ASSETS = Path("tests/transform/assets/diagrams/bpmn")
+PNML_ASSETS = Path("tests/transform/assets/diagrams/pnml")
+UNSUPPORTED_PNML = "Testfall EventBasedGateway.pnml"
+# the other BPMN assets contain unsupported elements
+BPMN_FILES = [
+    *sorted(BPMN_ASSETS.glob("0[234]*.bpmn")),
+    Path("tests/transform/assets/multiplesubprocesses.bpmn"),
+]
+SUBPROCESSES_PNML = Path("tests/transform/assets/multiplesubprocesses.pnml")
+
+
+def graph_json(graph) -> str:
+    """Return the JSON text of a graph document like the transform endpoint."""
+    return graph.model_dump_json(exclude_defaults=True)
+
+
+class TestModelGraph(unittest.TestCase):
+    """This class tests converting models to JSON graphs and back."""
+
+    def test_pnml_round_trip(self):
+        """Tests whether the graph of a PNML reads as the same net."""
+        for path in sorted(PNML_ASSETS.glob("*.pnml")):
+            if path.name == UNSUPPORTED_PNML:
+                continue
+            with self.subTest(path=path):
+                pnml = Pnml.from_xml_str(path.read_text())
+                parsed = read_pnml_graph(graph_json(pnml_graph(pnml)))
+                self.assertTrue(compare_pnml(pnml.net, parsed.net))
+                self.assertEqual("".join(parsed.to_chunks()), "".join(pnml.to_chunks()))
+
+    def test_bpmn_round_trip(self):
+        """Tests whether the graph of a BPMN reads as the same process."""
+        for path in BPMN_FILES:
+            with self.subTest(path=path):
+                bpmn = BPMN.from_xml(path.read_text(), skip_diagram=True)
+                parsed = read_bpmn_graph(graph_json(bpmn_graph(bpmn)))
+                self.assertTrue(compare_bpmn(bpmn, parsed))
+                self.assertEqual("".join(parsed.to_chunks()), "".join(bpmn.to_chunks()))
+
+    def test_graph_structure(self):
+        """Tests whether nodes, edges and nested graphs are listed by id."""
+        pnml = Pnml.from_xml_str(SUBPROCESSES_PNML.read_text())
+        graph = json.loads(graph_json(pnml_graph(pnml)))
+        net = graph["net"]
+        self.assertEqual(
+            {node["type"] for node in net["nodes"]}, {"place", "transition"}
+        )
+        self.assertTrue(
+            all({"source", "target"} <= edge.keys() for edge in net["edges"])
+        )
+        self.assertEqual(len(net["pages"]), len(pnml.net.pages))
+
+        bpmn = BPMN.from_xml(BPMN_FILES[-1].read_text())
+        process = json.loads(graph_json(bpmn_graph(bpmn)))["process"]
+        subprocess_ids = {sub["id"] for sub in process["subprocesses"]}
+        self.assertTrue(subprocess_ids)
+        # edges connect nodes and subprocesses of their process
+        self.assertTrue(
+            any(edge["target"] in subprocess_ids for edge in process["edges"])
+        )
+        self.assertNotIn("incoming", json.dumps(process))
+
+    def test_invalid_graph(self):
+        """Tests whether invalid graphs are rejected with their reason."""
+        place = {"id": "p1", "type": "place"}
+        for graph in [
+            "{",
+            {"nodes": []},
+            {"net": {"nodes": [place, place]}},
+            {"net": {"nodes": [{"id": "x", "type": "task"}]}},
+            {"net": {"nodes": [place], "edges": [{"source": "p1", "target": "t1"}]}},
+        ]:
+            with self.subTest(graph=graph):
+                content = graph if isinstance(graph, str) else json.dumps(graph)
+                with self.assertRaises(InvalidModelGraph) as context:
+                    read_pnml_graph(content)
+                self.assertIn("[17]", str(context.exception))
+
+    def test_reserved_attributes(self):
+        """Tests whether attributes setting fields of the graph are rejected."""
+        place = {"id": "p1", "type": "place"}
+        task = {"id": "t1", "type": "task"}
+        edge = {"source": "p1", "target": "p1"}
+        for read, graph in [
+            (read_pnml_graph, {"net": {"nodes": [{**place, "attributes": place}]}}),
+            (
+                read_pnml_graph,
+                {"net": {"nodes": [{**place, "attributes": {"name": 1}}]}},
+            ),
+            (
+                read_pnml_graph,
+                {"net": {"nodes": [place], "edges": [{**edge, "attributes": edge}]}},
+            ),
+            (
+                read_bpmn_graph,
+                {
+                    "process": {
+                        "id": "p",
+                        "nodes": [{**task, "attributes": {"outgoing": []}}],
+                    }
+                },
+            ),
+            (
+                read_bpmn_graph,
+                {
+                    "process": {
+                        "id": "p",
+                        "nodes": [task],
+                        "edges": [
+                            {
+                                "source": "t1",
+                                "target": "t1",
+                                "attributes": {"sourceRef": "t1"},
+                            }
+                        ],
+                    }
+                },
+            ),
+        ]:
+            with self.subTest(graph=graph):
+                with self.assertRaises(InvalidModelGraph) as context:
+                    read(json.dumps(graph))
+                self.assertIn("[17]", str(context.exception))
+
+    def test_graph_limits(self):
+        """Tests whether each applicable limit rejects a too large graph."""
+        content = graph_json(
+            pnml_graph(Pnml.from_xml_str(SUBPROCESSES_PNML.read_text()))
+        )
+        for limit_name, limit in [
+            ("max_elements", 10),
+            ("max_subprocess_depth", 1),
+            ("max_connections", 1),
+        ]:
+            with self.subTest(limit_name=limit_name):
+                with self.assertRaises(ModelLimitExceeded) as context:
+                    read_pnml_graph(content, ModelLimits(**{limit_name: limit}))
+                self.assertEqual(context.exception.limit_name, limit_name)
+        read_pnml_graph(content, ModelLimits(max_elements=10_000, max_depth=1))
+
+
+class TestGraphRequest(unittest.TestCase):
+    """This class tests posting and accepting JSON graphs at the transform endpoint."""
+
+    def setUp(self):
+        """Performs setup before each test case."""
+        self.client = create_app("testing").test_client()
+
+    def post(self, query: str, data: bytes, content_type: str, accept: str):
+        """Post a raw model body accepting a media type."""
+        return self.client.post(
+            f"/transform?{query}",
+            data=data,
+            content_type=content_type,
+            headers={"Accept": accept},
+            buffered=True,
+        )
+
+    def test_graph_input(self):
+        """Tests whether a posted graph is transformed like its XML model."""
+        path = PNML_ASSETS / "Insurance.pnml"
+        graph = graph_json(pnml_graph(Pnml.from_xml_str(path.read_text())))
+        from_xml = self.post(
+            "direction=pnmltobpmn", path.read_bytes(), "application/xml", "*/*"
+        )
+        from_graph = self.post(
+            "direction=pnmltobpmn", graph.encode(), GRAPH_MIMETYPE, "*/*"
+        )
+        self.assertEqual(from_graph.status_code, 200)
+        self.assertEqual(from_graph.get_data(), from_xml.get_data())
+
+    def test_graph_output(self):
+        """Tests whether a request accepting graphs gets the graph of the result."""
+        path = BPMN_FILES[0]
+        res = self.post(
+            "direction=bpmntopnml", path.read_bytes(), "application/xml", GRAPH_MIMETYPE
+        )
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(res.mimetype, GRAPH_MIMETYPE)
+        xml = self.post(
+            "direction=bpmntopnml", path.read_bytes(), "application/xml", "*/*"
+        )
+        self.assertNotEqual(res.headers["ETag"], xml.headers["ETag"])
+        expected = Pnml.from_xml_str(xml.get_json()["pnml"].split("?>", 1)[1])
+        self.assertTrue(compare_pnml(read_pnml_graph(res.get_data()).net, expected.net))
+
+    def test_invalid_graph_request(self):
+        """Tests whether invalid graphs and graphics options of graphs are rejected."""
+        res = self.post("direction=bpmntopnml", b"[]", GRAPH_MIMETYPE, "*/*")
+        self.assertEqual(res.status_code, 400)
+        self.assertIn("[17]", res.get_data(as_text=True))
+        res = self.post(
+            "direction=pnmltobpmn&graphics=layout",
+            (PNML_ASSETS / "Insurance.pnml").read_bytes(),
+            "application/xml",
+            GRAPH_MIMETYPE,
+        )
+        self.assertEqual(res.status_code, 400)
+        self.assertIn("[4]", res.get_data(as_text=True))
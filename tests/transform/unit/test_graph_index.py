@@ -0,0 +1,325 @@
+"""Unit tests for the graph index of nets and processes."""
+
+import timeit
+import unittest
+
+from app.transform.exceptions import InternalTransformationException
+from app.transform.transformer.models.bpmn.base import Gateway, LinkingNode
+from app.transform.transformer.models.bpmn.bpmn import (
+    AndGateway,
+    Process,
+    Task,
+    XorGateway,
+)
+from app.transform.transformer.models.pnml.pnml import (
+    Net,
+    Page,
+    Place,
+    Transition,
+)
+from app.transform.transformer.models.pnml.transform_helper import (
+    ANDHelperPNML,
+    GatewayHelperPNML,
+    HelperPNMLElement,
+    MessageHelperPNML,
+    XORHelperPNML,
+)
+from app.transform.transformer.utility.graph_index import GraphIndex
+
+
+class TestGraphIndex(unittest.TestCase):
+    """This class tests the indexes of the graph index."""
+
+    def test_adjacency(self):
+        """Tests whether edges are indexed by their endpoints."""
+        graph: GraphIndex[str, str] = GraphIndex()
+        graph.add_node("a", "A")
+        graph.add_node("b", "B")
+        graph.add_edge("ab", "a->b", "a", "b")
+        # edges may reference ids without node
+        graph.add_edge("bc", "b->c", "b", "c")
+        self.assertEqual(graph.outgoing("a"), {"a->b"})
+        self.assertEqual(graph.incoming("b"), {"a->b"})
+        self.assertEqual(graph.incoming("c"), {"b->c"})
+        self.assertNotIn("c", graph)
+        self.assertEqual(len(graph), 2)
+        self.assertEqual(graph.kind("a"), str)
+        self.assertEqual(graph.remove_edge("ab"), "a->b")
+        self.assertEqual(graph.outgoing("a"), set())
+        self.assertEqual(graph.incoming("unknown"), set())
+
+    def test_remove_node(self):
+        """Tests whether removing a node detaches its edges and keeps its id."""
+        graph: GraphIndex[str, str] = GraphIndex()
+        graph.add_node("a", "A")
+        graph.add_edge("ab", "a->b", "a", "b")
+        incoming, outgoing = graph.remove_node("a")
+        self.assertEqual((incoming, outgoing), (set(), {"a->b"}))
+        self.assertNotIn("a", graph)
+        self.assertIsNone(graph.get("a"))
+        with self.assertRaises(KeyError):
+            graph.node("a")
+        graph.add_node("a", "A2")
+        self.assertEqual(list(graph.nodes()), ["A2"])
+        self.assertEqual(graph.outgoing("a"), set())
+
+    def test_models_use_index(self):
+        """Tests whether nets and processes keep their nodes in the index."""
+        net = Net()
+        place, transition = Place(id="p1"), Transition(id="t1")
+        net.add_arc(place, transition)
+        self.assertIs(net.get_element("p1"), place)
+        self.assertEqual(net.get_out_degree(place), 1)
+        net.remove_element_with_connecting_arcs(transition)
+        self.assertEqual(net.get_out_degree(place), 0)
+        self.assertEqual(set(net._graph.node_ids()), {"p1"})
+
+        process = Process(id="process")
+        flow = process.add_flow(Task(id="a"), Task(id="b"))
+        self.assertEqual(process.get_incoming("b"), {flow})
+        self.assertIs(process.get_flow_target_by_id(flow.id), process.get_node("b"))
+
+    def test_equality(self):
+        """Tests whether equal models have equal indexes in any insertion order."""
+        first, second = Net(), Net()
+        first.add_arc(Place(id="p1"), Transition(id="t1"))
+        second.add_element(Transition(id="t1"))
+        second.add_arc(Place(id="p1"), Transition(id="t1"))
+        self.assertEqual(first._graph, second._graph)
+        second.add_element(Place(id="p2"))
+        self.assertNotEqual(first._graph, second._graph)
+
+
+class TestEdgeIndex(unittest.TestCase):
+    """This class tests the edge index of nets and processes."""
+
+    def test_index_pairs(self):
+        """Tests whether edges are found by the pair of their endpoints."""
+        graph: GraphIndex[str, str] = GraphIndex()
+        graph.add_edge("ab", "a->b", "a", "b")
+        graph.add_edge("ab2", "a->b 2", "a", "b")
+        self.assertEqual(graph.edge_between("a", "b"), "a->b")
+        self.assertIsNone(graph.edge_between("b", "a"))
+        self.assertIsNone(graph.edge_between("a", "unknown"))
+        graph.remove_edge("ab")
+        self.assertEqual(graph.edge_between("a", "b"), "a->b 2")
+
+        # adding a key again replaces its edge
+        graph.add_edge("ab2", "a->c", "a", "c")
+        self.assertIsNone(graph.edge_between("a", "b"))
+        self.assertEqual(graph.incoming("b"), set())
+        graph.move_edge("ab2", "c", "a")
+        self.assertEqual(graph.edge_between("c", "a"), "a->c")
+        self.assertEqual(graph.outgoing("a"), set())
+
+    def test_net_arcs(self):
+        """Tests whether arcs sharing an id are indexed with their endpoints."""
+        net = Net()
+        place = Place(id="p1")
+        first, second = Transition(id="t1_op_1"), Transition(id="t1_op_2")
+        net.add_arc(place, first, "a1")
+        net.add_arc(place, second, "a1")
+        self.assertEqual(len(net._graph.edges), 2)
+        self.assertEqual(net.get_arc_between("p1", "t1_op_2").target, "t1_op_2")
+        with self.assertRaises(InternalTransformationException):
+            net.add_arc(place, first, "a1")
+
+        # an arc of a removed element is indexed with its changed endpoint
+        net.remove_element(first)
+        self.assertIsNone(net.get_arc_between("p1", "t1_op_1"))
+        arc = net.get_arc_between("p1", "")
+        net.remove_arc(arc)
+        self.assertEqual(net.get_out_degree(place), 1)
+
+    def test_process_flows(self):
+        """Tests whether flows are found by id and by their endpoints."""
+        process = Process(id="process")
+        flow = process.add_flow(Task(id="a"), Task(id="b"))
+        self.assertTrue(process.is_flow_existing(flow.id))
+        self.assertIs(process.get_flow_between("a", "b"), flow)
+        process.remove_node(process.get_node("b"))
+        self.assertIsNone(process.get_flow_between("a", "b"))
+        self.assertIs(process.get_flow_between("a", ""), flow)
+        self.assertTrue(process.is_flow_existing(flow.id))
+
+
+class TestRenameNode(unittest.TestCase):
+    """This class tests changing the ids of nodes in place."""
+
+    def test_process(self):
+        """Tests whether a node keeps its object and flows with a new id."""
+        process = Process(id="process")
+        node = Task(id="b")
+        first = process.add_flow(Task(id="a"), node)
+        second = process.add_flow(node, Task(id="c"))
+        process.change_node_id(node, "renamed")
+        self.assertIs(process.get_node("renamed"), node)
+        self.assertFalse(process.is_node_existing("b"))
+        self.assertIn(node, process.tasks)
+        self.assertEqual((first.targetRef, second.sourceRef), ("renamed", "renamed"))
+        self.assertEqual(process.get_incoming("renamed"), {first})
+        self.assertIs(process.get_flow_between("renamed", "c"), second)
+        self.assertEqual(process.flows, {first, second})
+        with self.assertRaises(InternalTransformationException):
+            process.change_node_id(node, "a")
+
+    def test_net(self):
+        """Tests whether an element keeps its object and arcs with a new id."""
+        net = Net()
+        transition = Transition(id="t1")
+        net.add_arc(Place(id="p1"), transition, "a1")
+        net.add_arc(transition, Place(id="p2"), "a2")
+        net.change_id("t1", "renamed")
+        self.assertIs(net.get_element("renamed"), transition)
+        self.assertIn(transition, net.transitions)
+        self.assertEqual(
+            {(arc.id, arc.source, arc.target) for arc in net.arcs},
+            {("a1", "p1", "renamed"), ("a2", "renamed", "p2")},
+        )
+        self.assertEqual(net.get_arc_between("p1", "renamed").id, "a1")
+        self.assertEqual(net.get_out_degree(transition), 1)
+        self.assertIsNone(net.get_node_or_none("t1"))
+
+
+class TestNodeViews(unittest.TestCase):
+    """This class tests the live node views of nets and processes."""
+
+    def test_process_views(self):
+        """Tests whether the views follow added and removed nodes."""
+        process = Process(id="process")
+        gateways = process.get_nodes(Gateway)
+        self.assertEqual(len(gateways), 0)
+        xor, task = XorGateway(id="xor"), Task(id="a")
+        process.add_flow(xor, task)
+        process.add_node(AndGateway(id="and"))
+        self.assertEqual(len(gateways), 2)
+        self.assertEqual({node.id for node in gateways}, {"xor", "and"})
+        self.assertIn(xor, gateways)
+        self.assertNotIn(task, gateways)
+        self.assertEqual(len(process.get_nodes()), 3)
+        self.assertEqual(len(process.get_nodes((Task, AndGateway))), 2)
+
+        process.remove_node(xor)
+        self.assertEqual([node.id for node in gateways], ["and"])
+        self.assertEqual(len(process.get_nodes()), len(process._graph))
+
+    def test_net_views(self):
+        """Tests whether the views of a net select elements and helpers by type."""
+        net = net_with_pages(1)
+        net.add_arc(Place(id="p1"), Transition(id="t1"))
+        helpers = net.get_elements(HelperPNMLElement)
+        helper = net.add_element(XORHelperPNML(id="h1"))
+        net.add_element(MessageHelperPNML(id="h2"))
+        self.assertEqual(len(helpers), 2)
+        self.assertEqual(list(net.get_elements(GatewayHelperPNML)), [helper])
+        # pages aren't elements
+        self.assertEqual(len(net.get_elements()), 4)
+
+        net.remove_element(helper)
+        self.assertEqual([node.id for node in helpers], ["h2"])
+        self.assertEqual(len(net.get_elements()), len(net._graph))
+
+
+def net_with_pages(count: int) -> Net:
+    """Return a net with subprocess pages, each page has a nested page."""
+    return Net(
+        pages={
+            Page(id=f"s{i}", net=Net(pages={Page(id=f"n{i}", net=Net())}))
+            for i in range(count)
+        }
+    )
+
+
+class TestPageIndex(unittest.TestCase):
+    """This class tests the page index of nets."""
+
+    def test_lookup(self):
+        """Tests whether pages are found by id and by path of nested pages."""
+        net = net_with_pages(3)
+        self.assertEqual(net.get_page("s1").id, "s1")
+        self.assertEqual(net.get_nested_page(["s2", "n2"]).id, "n2")
+        with self.assertRaises(InternalTransformationException):
+            net.get_page("n1")
+        with self.assertRaises(InternalTransformationException):
+            net.get_nested_page(["s1", "n2"])
+
+    def test_add_page(self):
+        """Tests whether adding a page of an existing id returns the existing page."""
+        net = net_with_pages(1)
+        existing = net.get_page("s0")
+        self.assertIs(net.add_page(Page(id="s0", net=Net())), existing)
+        added = net.add_page(Page(id="s1", net=Net()))
+        self.assertIs(net.get_page("s1"), added)
+        self.assertEqual(len(net.pages), 2)
+
+    def test_change_id(self):
+        """Tests whether changed ids of pages and subprocess transitions are indexed."""
+        net = net_with_pages(2)
+        net.change_page_id("s0", "renamed")
+        self.assertEqual(net.get_page("renamed").id, "renamed")
+        self.assertIn(net.get_page("renamed"), net.pages)
+        with self.assertRaises(InternalTransformationException):
+            net.get_page("s0")
+        with self.assertRaises(InternalTransformationException):
+            net.change_page_id("renamed", "s1")
+        with self.assertRaises(InternalTransformationException):
+            net.change_page_id("s0", "t")
+        # pages aren't nodes
+        with self.assertRaises(InternalTransformationException):
+            net.change_id("renamed", "t")
+
+        # the page of a subprocess transition is renamed by itself
+        net.add_arc(Place(id="p"), Transition(id="s1"))
+        net.change_id("s1", "t")
+        self.assertEqual(net.get_element("t").id, "t")
+        self.assertEqual(net.get_page("s1").id, "s1")
+        net.change_page_id("s1", "t")
+        self.assertEqual(net.get_page("t").id, "t")
+        self.assertEqual({p.id for p in net.pages}, {"renamed", "t"})
+
+    def test_lookup_cost_is_flat(self):
+        """Tests whether the lookup of a page doesn't grow with the page count."""
+        times = []
+        for count in (10, 2000):
+            net = net_with_pages(count)
+            timer = timeit.Timer(lambda net=net: net.get_page("s5"))
+            times.append(min(timer.repeat(repeat=5, number=200)))
+        small, large = times
+        # a linear lookup takes about 200 times as long for 2000 pages
+        self.assertLess(large, small * 5)
+
+
+class TestHelperNodes(unittest.TestCase):
+    """This class tests the slot based helper nodes of nets and processes."""
+
+    def test_net_helpers(self):
+        """Tests whether helper elements are connected and compared like elements."""
+        net = Net()
+        helper = XORHelperPNML(id="h1")
+        net.add_arc(Place(id="p1"), helper)
+        self.assertIs(net.get_element("h1"), helper)
+        self.assertEqual(net.get_in_degree(helper), 1)
+        self.assertEqual(helper, XORHelperPNML(id="h1"))
+        self.assertNotEqual(helper, ANDHelperPNML(id="h1"))
+        self.assertEqual(hash(helper), hash(XORHelperPNML(id="h1")))
+        self.assertFalse(hasattr(helper, "__dict__"))
+
+        # the workflow annotations of net elements apply to helpers
+        trigger = MessageHelperPNML(id="h2").mark_as_workflow_message()
+        self.assertTrue(trigger.is_workflow_message())
+        self.assertNotEqual(trigger, MessageHelperPNML(id="h2"))
+        self.assertIsNone(helper.get_name())
+
+    def test_linking_nodes(self):
+        """Tests whether linking nodes are nodes of processes."""
+        process = Process(id="process")
+        node = LinkingNode(id="link")
+        process.add_flow(Task(id="a"), node)
+        process.add_flow(node, Task(id="b"))
+        self.assertEqual((node.get_in_degree(), node.get_out_degree()), (1, 1))
+        self.assertIn(node, process.get_nodes())
+        self.assertEqual(list(process.get_nodes(LinkingNode)), [node])
+        process.change_node_id(node, "renamed")
+        self.assertIs(process.get_node("renamed"), node)
+        process.remove_node_with_connecting_flows(node)
+        self.assertEqual(len(process.get_nodes()), 2)
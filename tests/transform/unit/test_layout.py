@@ -0,0 +1,151 @@
+"""Unit tests for the layered layout of generated BPMN diagrams."""
+
+import unittest
+from pathlib import Path
+
+from app import create_app
+from app.transform.transformer.models.bpmn.bpmn import BPMN
+from app.transform.transformer.models.bpmn.bpmn_graphics import (
+    GRAPHICS_LAYOUT,
+    BPMNEdge,
+    BPMNShape,
+)
+from app.transform.transformer.models.pnml.pnml import Pnml
+from app.transform.transformer.transform_petrinet_to_bpmn.transform import pnml_to_bpmn
+from app.transform.transformer.utility.layout import MAX_SPAN, layered_layout
+from app.transform.transformer.utility.xml_writer import XML_HEADER
+
+PNML_ASSETS = Path("tests/transform/assets/diagrams/pnml")
+SUBPROCESSES_BPMN = Path("tests/transform/assets/multiplesubprocesses.bpmn")
+
+SIZE = (100.0, 80.0)
+
+
+def overlaps(a: tuple[float, ...], b: tuple[float, ...]):
+    """Return whether two bounds (x, y, width, height) overlap."""
+    horizontal = a[0] < b[0] + b[2] and b[0] < a[0] + a[2]
+    return horizontal and a[1] < b[1] + b[3] and b[1] < a[1] + a[3]
+
+
+def laid_out_elements(bpmn: BPMN):
+    """Return the shapes and edges of the diagram of a BPMN."""
+    if bpmn.diagram is None or bpmn.diagram.plane is None:
+        raise AssertionError("BPMN has no diagram")
+    return bpmn.diagram.plane.eles
+
+
+class TestLayeredLayout(unittest.TestCase):
+    """This class tests the layout of graphs independent of BPMN."""
+
+    def test_edges_point_right(self):
+        """Tests whether each edge of an acyclic graph leads to a later layer."""
+        edges = [("a", "b"), ("a", "c"), ("b", "d"), ("c", "d"), ("a", "d")]
+        layout = layered_layout(dict.fromkeys("abcd", SIZE), edges)
+        for (source, target), route in zip(edges, layout.routes):
+            self.assertLess(layout.positions[source][0], layout.positions[target][0])
+            self.assertEqual(route[0][0], layout.positions[source][0] + SIZE[0])
+            self.assertEqual(route[-1][0], layout.positions[target][0])
+        self.assertEqual(layout.positions["b"][0], layout.positions["c"][0])
+
+    def test_nodes_do_not_overlap(self):
+        """Tests whether the nodes of a layer are placed below each other."""
+        edges = [("s", str(i)) for i in range(5)] + [(str(i), "e") for i in range(5)]
+        sizes = {"s": (36.0, 36.0), "e": (36.0, 36.0)}
+        sizes |= {str(i): SIZE for i in range(5)}
+        layout = layered_layout(sizes, edges)
+        bounds = [(*layout.positions[id], *size) for id, size in sizes.items()]
+        for i, a in enumerate(bounds):
+            for b in bounds[i + 1 :]:
+                self.assertFalse(overlaps(a, b))
+        # the start is centered on its successors
+        successors = [layout.positions[str(i)][1] + SIZE[1] / 2 for i in range(5)]
+        start_center = layout.positions["s"][1] + 18
+        self.assertEqual(start_center, sum(successors) / 5)
+
+    def test_cycles_and_loops(self):
+        """Tests whether cycles, self loops and long edges are routed."""
+        chain = [(str(i), str(i + 1)) for i in range(MAX_SPAN + 2)]
+        edges = [*chain, ("3", "1"), ("2", "2"), ("0", str(MAX_SPAN + 2))]
+        sizes = {str(i): SIZE for i in range(MAX_SPAN + 3)}
+        layout = layered_layout(sizes, edges)
+        xs = [layout.positions[str(i)][0] for i in range(MAX_SPAN + 3)]
+        self.assertEqual(xs, sorted(xs))
+        self.assertEqual(len(set(xs)), len(xs))
+        self.assertEqual(len(layout.routes), len(edges))
+        self.assertTrue(all(len(route) >= 2 for route in layout.routes))
+        # the long edge is routed above the nodes
+        channel = layout.routes[-1][2][1]
+        self.assertLess(channel, min(y for _, y in layout.positions.values()))
+
+    def test_groups_are_bands(self):
+        """Tests whether the nodes of each group are inside of its band."""
+        edges = [("a", "b"), ("b", "c"), ("c", "d")]
+        groups = {"a": 1, "b": 0, "c": 1, "d": 0}
+        layout = layered_layout(dict.fromkeys("abcd", SIZE), edges, groups, 3)
+        self.assertEqual(len(layout.bands), 3)
+        self.assertEqual(layout.bands[0][1], layout.bands[1][0])
+        for id, group in groups.items():
+            top, bottom = layout.bands[group]
+            y = layout.positions[id][1]
+            self.assertTrue(top < y and y + SIZE[1] < bottom)
+        self.assertEqual(layout.height, layout.bands[-1][1])
+
+    def test_origin(self):
+        """Tests whether the layout is moved to its origin."""
+        edges = [("a", "b")]
+        layout = layered_layout(dict.fromkeys("ab", SIZE), edges)
+        moved = layered_layout(dict.fromkeys("ab", SIZE), edges, origin=(10, 20))
+        self.assertEqual(moved.positions["b"], (layout.positions["b"][0] + 10, 40.0))
+        self.assertEqual(moved.routes[0][0], (110.0, 80.0))
+        self.assertEqual(moved.width, layout.width)
+
+
+class TestBPMNLayout(unittest.TestCase):
+    """This class tests the laid out graphics of BPMN diagrams."""
+
+    def test_chunks_equal_models(self):
+        """Tests whether the laid out graphics equal the BPMNDI models."""
+        pnml = Pnml.from_xml_str((PNML_ASSETS / "LoanApplication.pnml").read_text())
+        for bpmn in [pnml_to_bpmn(pnml), BPMN.from_xml(SUBPROCESSES_BPMN.read_text())]:
+            text = "".join(bpmn.to_chunks(graphics=GRAPHICS_LAYOUT))
+            bpmn.set_graphics(layout=True)
+            xml = bpmn.canonical().to_xml(encoding="unicode")
+            self.assertEqual(text, XML_HEADER + xml)
+
+    def test_shapes_are_laid_out(self):
+        """Tests whether shapes are separate and edges connect their nodes."""
+        pnml = Pnml.from_xml_str((PNML_ASSETS / "Insurance.pnml").read_text())
+        bpmn = pnml_to_bpmn(pnml)
+        bpmn.set_graphics(layout=True)
+        eles = laid_out_elements(bpmn)
+        shapes = {e.bpmnElement: e for e in eles if isinstance(e, BPMNShape)}
+        bounds = [
+            (s.bounds.x, s.bounds.y, s.bounds.width, s.bounds.height)
+            for s in shapes.values()
+        ]
+        for i, a in enumerate(bounds):
+            for b in bounds[i + 1 :]:
+                self.assertFalse(overlaps(a, b))
+        for edge in eles:
+            if not isinstance(edge, BPMNEdge):
+                continue
+            flow = bpmn.process.get_flow(edge.bpmnElement)
+            source = shapes[flow.sourceRef].bounds
+            target = shapes[flow.targetRef].bounds
+            first, last = edge.waypoints[0], edge.waypoints[-1]
+            self.assertIn(first.x, (source.x, source.x + source.width))
+            self.assertIn(last.x, (target.x, target.x + target.width))
+
+    def test_layout_request(self):
+        """Tests whether graphics=layout returns a laid out diagram."""
+        client = create_app("testing").test_client()
+        res = client.post(
+            "/transform?direction=pnmltobpmn&graphics=layout",
+            data=(PNML_ASSETS / "Insurance.pnml").read_bytes(),
+            content_type="application/xml",
+        )
+        self.assertEqual(res.status_code, 200)
+        bpmn = BPMN.from_xml(res.get_json()["bpmn"].removeprefix(XML_HEADER))
+        shapes = [e for e in laid_out_elements(bpmn) if isinstance(e, BPMNShape)]
+        self.assertGreater(len(shapes), 0)
+        self.assertTrue(all(s.bounds.x > 0 and s.bounds.y > 0 for s in shapes))
@@ -0,0 +1,322 @@
+"""Unit tests for parsing BPMN and PNML models from XML.
+
+Includes tests to check that invalid or unsupported input is rejected while parsing.
+"""
+
+import io
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from app.transform.exceptions import (
+    InvalidInputXML,
+    ModelLimitExceeded,
+    NotSupportedBPMNElement,
+)
+from app.transform.transformer.equality.petrinet import compare_pnml
+from app.transform.transformer.models.bpmn.bpmn import (
+    BPMN,
+    Collaboration,
+    Participant,
+    Task,
+)
+from app.transform.transformer.models.pnml.base import DEFAULT_TOOLSPECIFIC
+from app.transform.transformer.models.pnml.graphics import Coordinates
+from app.transform.transformer.models.pnml.pnml import (
+    Pnml,
+    Transition,
+    read_pnml_stream,
+)
+from app.transform.transformer.models.pnml.workflow import WorkflowBranchingType
+from app.transform.transformer.utility import utility
+from app.transform.transformer.utility.limits import ModelLimits
+from app.transform.transformer.utility.utility import flyweight
+from app.transform.transformer.utility.xml_parser import (
+    LXML_BACKEND,
+    check_parser_backend,
+    lxml_etree,
+)
+from defusedxml.ElementTree import fromstring
+from pydantic import ValidationError
+
+BPMN_ASSETS = "tests/transform/assets/diagrams/bpmn"
+PNML_ASSETS = "tests/transform/assets/diagrams/pnml"
+
+
+class TestBPMNIngest(unittest.TestCase):
+    """This class tests the validating BPMN ingest."""
+
+    def test_single_pool_rule(self):
+        """Tests whether a BPMN with more than one pool is rejected."""
+        with self.assertRaises(NotSupportedBPMNElement) as context:
+            BPMN.from_file(f"{BPMN_ASSETS}/05Fehlerhandling_mehrals1Pool.bpmn")
+        self.assertIn("exactly one pool", str(context.exception))
+
+    def test_unsupported_tags_are_collected(self):
+        """Tests whether all unsupported tags of a BPMN are reported."""
+        with self.assertRaises(NotSupportedBPMNElement) as context:
+            BPMN.from_file(f"{BPMN_ASSETS}/VendingMachine.bpmn")
+        self.assertIn("extensionelements", str(context.exception))
+        self.assertIn("signaviometadata", str(context.exception))
+
+    def test_invalid_xml(self):
+        """Tests whether malformed XML is rejected as invalid input."""
+        with self.assertRaises(InvalidInputXML):
+            BPMN.from_xml("<bpmn:definitions><bpmn:process>")
+
+    def test_supported_bpmn(self):
+        """Tests whether a supported BPMN is parsed into the model."""
+        bpmn = BPMN.from_file("tests/transform/assets/multiplesubprocesses.bpmn")
+        self.assertIsNotNone(bpmn.process)
+        self.assertGreater(len(bpmn.process.subprocesses), 0)
+
+
+class TestBPMNDiagramSkipping(unittest.TestCase):
+    """This class tests skipping the diagram interchange while parsing a BPMN."""
+
+    def test_same_model_without_diagram(self):
+        """Tests whether only the diagram is missing in the skipped model."""
+        for path in sorted(Path(BPMN_ASSETS).glob("*.bpmn")):
+            content = path.read_text()
+            try:
+                bpmn = BPMN.from_xml(content)
+            except Exception:
+                continue
+            with self.subTest(path=path.name):
+                skipped = BPMN.from_xml(content, skip_diagram=True)
+                self.assertIsNone(skipped.diagram)
+                bpmn.diagram = None
+                self.assertEqual(skipped.to_xml(), bpmn.to_xml())
+
+    def test_elements_after_large_diagram(self):
+        """Tests whether root elements after a skipped diagram are kept."""
+        bpmn = BPMN.generate_empty_bpmn("process")
+        for i in range(500):
+            bpmn.process.add_node(Task(id=f"task{i}", name=f"Task {i}"))
+        bpmn.collaboration = Collaboration(
+            id="collaboration",
+            participant=Participant(id="participant", processRef="process"),
+        )
+        content = bpmn.to_string()
+        # move the collaboration behind the diagram
+        start = content.index("<bpmn:collaboration")
+        end = content.index("</bpmn:collaboration>") + len("</bpmn:collaboration>")
+        collaboration = content[start:end]
+        content = content[:start] + content[end:]
+        content = content.replace(
+            "</bpmn:definitions>", f"{collaboration}</bpmn:definitions>"
+        )
+        # the diagram spans several chunks read by the parser
+        self.assertGreater(len(content), 65_536)
+
+        skipped = BPMN.from_xml(content, skip_diagram=True)
+        self.assertIsNone(skipped.diagram)
+        self.assertIsNotNone(skipped.collaboration)
+        self.assertEqual(len(skipped.process.tasks), 500)
+
+    def test_unsupported_diagram_tags(self):
+        """Tests whether unsupported tags of a skipped diagram are still reported."""
+        content = Path(f"{BPMN_ASSETS}/VendingMachine.bpmn").read_text()
+        with self.assertRaises(NotSupportedBPMNElement):
+            BPMN.from_xml(content, skip_diagram=True)
+
+
+class TestPNMLStreamReader(unittest.TestCase):
+    """This class tests the incremental PNML reader."""
+
+    def test_same_model_as_tree_parsing(self):
+        """Tests whether the reader builds the same nets as the tree deserialization."""
+        for path in sorted(Path("tests/transform/assets").rglob("*.pnml")):
+            xml_content = path.read_text()
+            try:
+                expected = Pnml.from_xml_tree(fromstring(xml_content))
+            except Exception:
+                continue
+            with self.subTest(path=path.name):
+                pnml = read_pnml_stream(io.StringIO(xml_content))
+                self.assertEqual(pnml, expected)
+                self.assertTrue(compare_pnml(pnml.net, expected.net)[0])
+
+    def test_helper_structures(self):
+        """Tests whether nodes and arcs are indexed while streaming."""
+        pnml = Pnml.from_file(f"{PNML_ASSETS}/Example-Workflow.pnml")
+        net = pnml.net
+        self.assertEqual(
+            set(net._graph.node_ids()), {n.id for n in [*net.places, *net.transitions]}
+        )
+        self.assertEqual(len(net._graph.edges), len(net.arcs))
+        for arc in net.arcs:
+            self.assertIn(arc, net.get_outgoing(arc.source))
+            self.assertIn(arc, net.get_incoming(arc.target))
+
+    def test_nested_pages(self):
+        """Tests whether nets of nested pages are built with their elements."""
+        pnml = Pnml.from_file("tests/transform/assets/multiplesubprocesses.pnml")
+        self.assertGreater(len(pnml.net.pages), 0)
+        for page in pnml.net.pages:
+            self.assertGreater(len(page.net._graph), 0)
+
+    def test_arcs_before_nodes(self):
+        """Tests whether arcs are indexed even if they precede their nodes."""
+        xml_content = (
+            "<pnml><net id='n'><arc id='a' source='p' target='t'/>"
+            "<place id='p'/><transition id='t'/></net></pnml>"
+        )
+        net = read_pnml_stream(io.StringIO(xml_content)).net
+        self.assertEqual(net.get_out_degree(net.get_element("p")), 1)
+        self.assertEqual(net.get_in_degree(net.get_element("t")), 1)
+
+    def test_invalid_pnml(self):
+        """Tests whether malformed or incomplete PNML is rejected."""
+        for xml_content in ["<pnml><net>", "<other><net/></other>", "<pnml/>"]:
+            with self.subTest(xml_content=xml_content):
+                with self.assertRaises(InvalidInputXML):
+                    Pnml.from_xml_str(xml_content)
+
+
+@unittest.skipIf(lxml_etree is None, "lxml is not installed")
+class TestSharedParts(unittest.TestCase):
+    """This class tests the shared graphics and toolspecific parts of nets."""
+
+    def test_parsed_parts_are_shared(self):
+        """Tests whether equal parts of parsed elements are the same instance."""
+        with open(f"{PNML_ASSETS}/Insurance.pnml") as file:
+            net = Pnml.from_xml_str(file.read()).net
+        places = sorted(net.places, key=lambda place: place.id)
+        first, second = places[0], places[1]
+        self.assertIsNot(first.graphics, second.graphics)
+        self.assertIs(first.graphics.dimension, second.graphics.dimension)
+        toolspecifics = {id(t.toolspecific) for t in net.transitions}
+        self.assertLess(len(toolspecifics), len(net.transitions))
+
+    def test_copy_on_write(self):
+        """Tests whether marking an element changes a copy of its toolspecific."""
+        first, second = Transition(id="t1"), Transition(id="t2")
+        first.set_copy_of_exisiting_toolspecific(DEFAULT_TOOLSPECIFIC)
+        first.mark_as_workflow_operator(WorkflowBranchingType.XorSplit, "t")
+        self.assertIsNone(DEFAULT_TOOLSPECIFIC.operator)
+        second.mark_as_workflow_operator(WorkflowBranchingType.XorSplit, "t")
+        self.assertIs(first.toolspecific, second.toolspecific)
+        with self.assertRaises(ValidationError):
+            first.toolspecific.subprocess = True  # type: ignore[misc]
+        first.mark_as_workflow_subprocess()
+        self.assertTrue(first.is_workflow_subprocess())
+        self.assertFalse(second.is_workflow_subprocess())
+
+    def test_pool_drops_unique_values(self):
+        """Tests whether the full pool drops unique values and keeps used values."""
+        with (
+            mock.patch.object(utility, "FLYWEIGHT_LIMIT", 2),
+            mock.patch.dict(utility._flyweights, clear=True),
+        ):
+            common = flyweight(Coordinates(x=1, y=1))
+            for x in range(2, 10):
+                unique = flyweight(Coordinates(x=x, y=0))
+                self.assertIs(flyweight(Coordinates(x=1, y=1)), common)
+            self.assertEqual(list(utility._flyweights), [unique, common])
+
+
+class TestLxmlParserBackend(unittest.TestCase):
+    """This class tests the hardened lxml parser backend."""
+
+    def test_same_models_as_std(self):
+        """Tests whether both backends build the same models."""
+        for path in sorted(Path("tests/transform/assets").rglob("*.pnml")):
+            xml_content = path.read_text()
+            try:
+                expected = Pnml.from_xml_str(xml_content)
+            except InvalidInputXML:
+                continue
+            with self.subTest(path=path.name):
+                self.assertEqual(Pnml.from_xml_str(xml_content, LXML_BACKEND), expected)
+        for path in sorted(Path("tests/transform/assets").rglob("*.bpmn")):
+            xml_content = path.read_text()
+            try:
+                expected = BPMN.from_xml(xml_content)
+            except NotSupportedBPMNElement:
+                continue
+            with self.subTest(path=path.name):
+                self.assertEqual(BPMN.from_xml(xml_content, LXML_BACKEND), expected)
+
+    def test_binary_stream(self):
+        """Tests whether a binary stream is parsed with its declared encoding."""
+        xml_content = (
+            '<?xml version="1.0" encoding="ISO-8859-1"?>'
+            '<pnml><net id="n"><place id="\u00fc"/></net></pnml>'
+        )
+        stream = io.BytesIO(xml_content.encode("iso-8859-1"))
+        pnml = Pnml.from_stream(stream, LXML_BACKEND)
+        self.assertIsNotNone(pnml.net.get_node_or_none("\u00fc"))
+
+    def test_entities_are_rejected(self):
+        """Tests whether internal and external entity declarations are rejected."""
+        for entity in ['"expanded"', 'SYSTEM "file:///etc/passwd"']:
+            xml_content = (
+                f"<?xml version='1.0'?><!DOCTYPE pnml [<!ENTITY e {entity}>]>"
+                "<pnml><net id='&e;'/></pnml>"
+            )
+            with self.subTest(entity=entity):
+                with self.assertRaises(InvalidInputXML):
+                    Pnml.from_xml_str(xml_content, LXML_BACKEND)
+
+    def test_unknown_backend(self):
+        """Tests whether an unknown backend is rejected by the config check."""
+        with self.assertRaises(ValueError):
+            check_parser_backend("expat")
+
+
+class TestModelLimits(unittest.TestCase):
+    """This class tests the limits of posted models checked while parsing."""
+
+    def assert_limit_exceeded(self, read, path: str, limit_name: str, limit: int):
+        """Assert that reading a file exceeds a single limit."""
+        content = Path(path).read_text()
+        with self.assertRaises(ModelLimitExceeded) as context:
+            read(content, None, ModelLimits(**{limit_name: limit}))
+        self.assertEqual(context.exception.limit_name, limit_name)
+        self.assertIn("[12]", str(context.exception))
+
+    def test_pnml_limits(self):
+        """Tests whether each limit rejects a too large PNML."""
+        path = "tests/transform/assets/multiplesubprocesses.pnml"
+        for limit_name, limit in [
+            ("max_elements", 10),
+            ("max_depth", 3),
+            ("max_subprocess_depth", 1),
+            ("max_connections", 1),
+        ]:
+            with self.subTest(limit_name=limit_name):
+                self.assert_limit_exceeded(Pnml.from_xml_str, path, limit_name, limit)
+
+    def test_bpmn_limits(self):
+        """Tests whether each limit rejects a too large BPMN."""
+        path = "tests/transform/assets/multiplesubprocesses.bpmn"
+        for limit_name, limit in [
+            ("max_elements", 10),
+            ("max_depth", 3),
+            ("max_subprocess_depth", 1),
+            ("max_connections", 1),
+        ]:
+            with self.subTest(limit_name=limit_name):
+                self.assert_limit_exceeded(BPMN.from_xml, path, limit_name, limit)
+
+    def test_model_within_limits(self):
+        """Tests whether a model within the limits is read like without limits."""
+        content = Path("tests/transform/assets/multiplesubprocesses.pnml").read_text()
+        limits = ModelLimits(
+            max_elements=10_000,
+            max_depth=20,
+            max_subprocess_depth=2,
+            max_connections=1_000,
+        )
+        self.assertTrue(
+            compare_pnml(
+                Pnml.from_xml_str(content, None, limits).net,
+                Pnml.from_xml_str(content).net,
+            )
+        )
+
+    def test_disabled_limit(self):
+        """Tests whether a limit of zero is not enforced."""
+        content = Path("tests/transform/assets/multiplesubprocesses.bpmn").read_text()
+        BPMN.from_xml(content, None, ModelLimits(max_elements=0, max_depth=0))
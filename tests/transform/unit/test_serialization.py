@@ -0,0 +1,206 @@
+"""Unit tests for the chunked serialization of BPMN and PNML models."""
+
+import json
+import unittest
+from pathlib import Path
+
+from app import create_app
+from app.transform.main import iter_json
+from app.transform.transformer.models.bpmn.bpmn import BPMN
+from app.transform.transformer.models.bpmn.bpmn_graphics import GRAPHICS_NONE
+from app.transform.transformer.models.pnml.pnml import Pnml
+from app.transform.transformer.transform_bpmn_to_petrinet.transform import (
+    bpmn_to_workflow_net,
+)
+from app.transform.transformer.transform_petrinet_to_bpmn.transform import pnml_to_bpmn
+from app.transform.transformer.utility.xml_writer import XML_HEADER
+from flask import jsonify
+
+BPMN_ASSETS = Path("tests/transform/assets/diagrams/bpmn")
+PNML_ASSETS = Path("tests/transform/assets/diagrams/pnml")
+SUBPROCESSES_BPMN = Path("tests/transform/assets/multiplesubprocesses.bpmn")
+
+
+class TestChunkedSerialization(unittest.TestCase):
+    """This class tests serializing models element by element."""
+
+    def test_pnml_chunks_equal_string(self):
+        """Tests whether the chunks of a PNML join to its serialized string."""
+        for name in ["Subprocesses.pnml", "LoanApplicationResources.pnml"]:
+            with self.subTest(name=name):
+                pnml = Pnml.from_xml_str((PNML_ASSETS / name).read_text())
+                self.assertEqual(
+                    "".join(pnml.to_chunks(chunk_size=100)),
+                    XML_HEADER + pnml.to_string(),
+                )
+
+    def test_bpmn_chunks_equal_string(self):
+        """Tests whether the chunks of a BPMN join to its serialized string."""
+        for path in [
+            BPMN_ASSETS / "02Verbesserte_Integration_UserService.bpmn",
+            SUBPROCESSES_BPMN,
+        ]:
+            with self.subTest(path=path):
+                bpmn = BPMN.from_xml(path.read_text())
+                self.assertEqual(
+                    "".join(bpmn.to_chunks(chunk_size=100)),
+                    XML_HEADER + bpmn.to_string(),
+                )
+        pnml = Pnml.from_xml_str((PNML_ASSETS / "Insurance.pnml").read_text())
+        bpmn = pnml_to_bpmn(pnml)
+        self.assertEqual("".join(bpmn.to_chunks()), XML_HEADER + bpmn.to_string())
+
+    def test_compact_pnml_round_trip(self):
+        """Tests whether a compact PNML is smaller and parses to the same net."""
+        pnmls = [
+            Pnml.from_xml_str((PNML_ASSETS / name).read_text())
+            for name in ["Subprocesses.pnml", "LoanApplicationResources.pnml"]
+        ]
+        bpmn_path = BPMN_ASSETS / "02Verbesserte_Integration_UserService.bpmn"
+        pnmls.append(bpmn_to_workflow_net(BPMN.from_xml(bpmn_path.read_text())))
+        for pnml in pnmls:
+            with self.subTest(net=pnml.net.id):
+                compact = "".join(pnml.to_chunks(chunk_size=100, compact=True))
+                self.assertLess(len(compact), len(XML_HEADER + pnml.to_string()))
+                parsed = Pnml.from_xml_str(compact.removeprefix(XML_HEADER))
+                self.assertEqual(parsed.to_string(), pnml.to_string())
+        # the transformed net has default toolspecific content only
+        self.assertNotIn("<timeUnit>", compact)
+
+    def test_chunk_size(self):
+        """Tests whether the text is split into several chunks."""
+        pnml = Pnml.from_xml_str((PNML_ASSETS / "LoanApplication.pnml").read_text())
+        chunks = list(pnml.to_chunks(chunk_size=1000))
+        self.assertGreater(len(chunks), 2)
+        # a chunk is returned as soon as an element fills it
+        self.assertTrue(all(len(c) < 2000 for c in chunks))
+
+    def test_json_chunks_equal_jsonify(self):
+        """Tests whether the streamed JSON body equals the body of jsonify."""
+        fields = {"session": "id", "pnml": '<a name="ä">\n"\\</a>'}
+        with create_app("testing").app_context():
+            expected = jsonify(fields).get_data()
+        chunked = {"session": "id", "pnml": iter(['<a name="ä">', '\n"\\</a>'])}
+        body = b"".join(iter_json(chunked))
+        self.assertEqual(body, expected)
+        self.assertEqual(json.loads(body), fields)
+
+    def test_bpmn_without_graphics(self):
+        """Tests whether a BPMN without graphics has no diagram interchange."""
+        pnml = Pnml.from_xml_str((PNML_ASSETS / "Insurance.pnml").read_text())
+        text = "".join(pnml_to_bpmn(pnml).to_chunks(graphics=GRAPHICS_NONE))
+        self.assertNotIn("BPMNDiagram", text)
+        self.assertNotIn("xmlns:dc", text)
+        bpmn = BPMN.from_xml(text.removeprefix(XML_HEADER))
+        self.assertIsNone(bpmn.diagram)
+        self.assertGreater(len(bpmn.process._flatten_node_typ_map()), 0)
+
+
+class TestGraphicsRequest(unittest.TestCase):
+    """This class tests the graphics option of the transform endpoint."""
+
+    def setUp(self):
+        """Performs setup before each test case."""
+        self.client = create_app("testing").test_client()
+
+    def post_pnml(self, query: str):
+        """Post a PNML as raw XML body."""
+        return self.client.post(
+            f"/transform?{query}",
+            data=(PNML_ASSETS / "Insurance.pnml").read_bytes(),
+            content_type="application/xml",
+        )
+
+    def test_graphics_none(self):
+        """Tests whether graphics=none skips the diagram interchange."""
+        with_graphics = self.post_pnml("direction=pnmltobpmn").get_json()["bpmn"]
+        without = self.post_pnml("direction=pnmltobpmn&graphics=none").get_json()
+        self.assertIn("BPMNDiagram", with_graphics)
+        self.assertNotIn("BPMNDiagram", without["bpmn"])
+
+    def test_graphics_compact(self):
+        """Tests whether graphics=compact returns a compact PNML."""
+        bpmn = (BPMN_ASSETS / "02Verbesserte_Integration_UserService.bpmn").read_bytes()
+        results = []
+        for query in ["direction=bpmntopnml", "direction=bpmntopnml&graphics=compact"]:
+            res = self.client.post(
+                f"/transform?{query}", data=bpmn, content_type="application/xml"
+            )
+            self.assertEqual(res.status_code, 200)
+            results.append(res.get_json()["pnml"])
+        full, compact = results
+        self.assertIn("<timeUnit>", full)
+        self.assertNotIn("<timeUnit>", compact)
+        self.assertLess(len(compact), len(full))
+
+    def test_invalid_graphics(self):
+        """Tests whether an unknown or unsupported graphics option is rejected."""
+        for query in [
+            "direction=pnmltobpmn&graphics=full",
+            "direction=bpmntopnml&graphics=none",
+            "direction=bpmntopnml&graphics=layout",
+            "direction=pnmltobpmn&graphics=compact",
+        ]:
+            with self.subTest(query=query):
+                res = self.post_pnml(query)
+                self.assertEqual(res.status_code, 400)
+                self.assertIn("[4]", res.get_data(as_text=True))
+
+
+class TestXMLResponse(unittest.TestCase):
+    """This class tests the content negotiation of the transform endpoint."""
+
+    def setUp(self):
+        """Performs setup before each test case."""
+        self.client = create_app("testing").test_client()
+
+    def post_pnml(self, accept: str | None):
+        """Post a PNML as raw XML body accepting a media type."""
+        headers = {"Accept": accept} if accept else {}
+        return self.client.post(
+            "/transform?direction=pnmltobpmn",
+            data=(PNML_ASSETS / "Insurance.pnml").read_bytes(),
+            content_type="application/xml",
+            headers=headers,
+            buffered=True,
+        )
+
+    def test_xml_body(self):
+        """Tests whether the model is the body of a request accepting XML."""
+        json_res = self.post_pnml(None)
+        for accept in ["application/xml", "text/xml", "application/json;q=0.5, */*"]:
+            with self.subTest(accept=accept):
+                res = self.post_pnml(accept)
+                self.assertEqual(res.status_code, 200)
+                self.assertEqual(res.mimetype, "application/xml")
+                self.assertIn("Accept", res.headers["Vary"])
+                self.assertEqual(res.get_data(as_text=True), json_res.get_json()["bpmn"])
+
+    def test_json_is_default(self):
+        """Tests whether the JSON object is returned without preference for XML."""
+        for accept in [None, "*/*", "application/json", "application/*"]:
+            with self.subTest(accept=accept):
+                res = self.post_pnml(accept)
+                self.assertEqual(res.mimetype, "application/json")
+                self.assertIn("BPMNDiagram", res.get_json()["bpmn"])
+
+
+class TestJSONProvider(unittest.TestCase):
+    """This class tests the arguments of the JSON provider of the app."""
+
+    def test_dumps_arguments(self):
+        """Tests whether the arguments of dumps are applied like by default."""
+        app = create_app("testing")
+        data = {"b": 1, "a": [1, {"c": None}]}
+        for kwargs in [
+            {},
+            {"sort_keys": False},
+            {"indent": 2},
+            {"indent": 4},
+            {"separators": (", ", ": ")},
+        ]:
+            with self.subTest(kwargs=kwargs):
+                # flask passes the separators without indent
+                base = {} if "indent" in kwargs else {"separators": (",", ":")}
+                expected = json.dumps(data, **{"sort_keys": True, **base, **kwargs})
+                self.assertEqual(app.json.dumps(data, **kwargs), expected)
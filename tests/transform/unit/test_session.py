@@ -0,0 +1,316 @@
+"""Unit tests for transformation sessions and model deltas."""
+
+import json
+import time
+import unittest
+
+from app import create_app
+from app.model_transformer.metrics import REQUEST_COUNT, SESSION_EVICTIONS
+from app.transform.exceptions import (
+    InvalidModelDelta,
+    ModelLimitExceeded,
+    UnknownSession,
+)
+from app.transform.session import (
+    ModelDelta,
+    ModelSession,
+    SessionStore,
+    apply_bpmn_delta,
+    apply_pnml_delta,
+)
+from app.transform.transformer.equality.petrinet import compare_pnml
+from app.transform.transformer.models.bpmn.bpmn import BPMN, EndEvent, StartEvent, Task
+from app.transform.transformer.models.pnml.pnml import Place, Pnml, Transition
+
+
+def create_bpmn(*task_ids: str):
+    """Return a BPMN of a start event, a sequence of tasks and an end event."""
+    bpmn = BPMN.generate_empty_bpmn("process")
+    process = bpmn.process
+    previous = process.add_node(StartEvent(id="start"))
+    for task_id in task_ids:
+        task = process.add_node(Task(id=task_id, name=task_id))
+        process.add_flow(previous, task)
+        previous = task
+    process.add_flow(previous, process.add_node(EndEvent(id="end")))
+    return bpmn
+
+
+def create_pnml():
+    """Return a net of a place, a transition and a place."""
+    pnml = Pnml.generate_empty_net("net")
+    net = pnml.net
+    start = net.add_element(Place.create(id="p1"))
+    transition = net.add_element(Transition.create(id="t1", name="task"))
+    net.add_arc(start, transition)
+    net.add_arc(transition, net.add_element(Place.create(id="p2")))
+    return pnml
+
+
+class TestSessionStore(unittest.TestCase):
+    """This class tests the bounds of the session store."""
+
+    def test_count_bound(self):
+        """Tests whether the least recently used session is evicted first."""
+        store = SessionStore(max_sessions=2, ttl_seconds=60)
+        evictions = SESSION_EVICTIONS._value.get()
+        first = store.add(ModelSession("bpmntopnml", create_bpmn(), b""))
+        second = store.add(ModelSession("bpmntopnml", create_bpmn(), b""))
+        store.get(first.id)
+        store.add(ModelSession("bpmntopnml", create_bpmn(), b""))
+        self.assertEqual(len(store), 2)
+        self.assertIs(store.get(first.id), first)
+        self.assertRaises(UnknownSession, store.get, second.id)
+        self.assertEqual(SESSION_EVICTIONS._value.get(), evictions + 1)
+
+    def test_size_bound(self):
+        """Tests whether the oldest sessions are evicted to fit the size bound."""
+        store = SessionStore(max_sessions=4, ttl_seconds=60, max_bytes=100)
+        first = store.add(ModelSession("bpmntopnml", create_bpmn(), b"1" * 30, "", 10))
+        second = store.add(ModelSession("bpmntopnml", create_bpmn(), b"2" * 40))
+        self.assertEqual(store.size, 80)
+        third = store.add(ModelSession("bpmntopnml", create_bpmn(), b"3" * 40))
+        self.assertRaises(UnknownSession, store.get, first.id)
+        self.assertIs(store.get(second.id), second)
+        self.assertEqual(store.size, 80)
+
+        # grown sessions are checked on the next access
+        second.body = b"2" * 80
+        self.assertIs(store.get(second.id), second)
+        self.assertRaises(UnknownSession, store.get, third.id)
+        with self.assertRaises(ModelLimitExceeded):
+            store.add(ModelSession("bpmntopnml", create_bpmn(), b"4" * 101))
+        self.assertEqual(len(store), 1)
+
+    def test_ttl(self):
+        """Tests whether idle sessions expire."""
+        store = SessionStore(max_sessions=2, ttl_seconds=60)
+        session = store.add(ModelSession("bpmntopnml", create_bpmn(), b""))
+        session.last_access = time.monotonic() - 61
+        self.assertRaises(UnknownSession, store.get, session.id)
+        self.assertEqual(len(store), 0)
+
+    def test_remove(self):
+        """Tests whether a removed session is unknown."""
+        store = SessionStore(max_sessions=2, ttl_seconds=60)
+        session = store.add(ModelSession("bpmntopnml", create_bpmn(), b""))
+        store.remove(session.id)
+        self.assertRaises(UnknownSession, store.get, session.id)
+        self.assertRaises(UnknownSession, store.remove, session.id)
+
+
+class TestModelDelta(unittest.TestCase):
+    """This class tests applying deltas to models."""
+
+    def test_bpmn_delta(self):
+        """Tests whether a BPMN delta results in the edited model."""
+        bpmn = create_bpmn("task1")
+        apply_bpmn_delta(
+            bpmn,
+            ModelDelta.model_validate(
+                {
+                    "remove_edges": ["task1TOend"],
+                    "change_nodes": [{"id": "task1", "name": "first"}],
+                    "add_nodes": [{"id": "task2", "type": "task", "name": "task2"}],
+                    "add_edges": [
+                        {"source": "task1", "target": "task2"},
+                        {"source": "task2", "target": "end"},
+                    ],
+                }
+            ),
+        )
+        process = bpmn.process
+        self.assertEqual(process.get_node("task1").name, "first")
+        self.assertEqual(
+            {(f.sourceRef, f.targetRef) for f in process.flows},
+            {("start", "task1"), ("task1", "task2"), ("task2", "end")},
+        )
+
+    def test_remove_node_with_flows(self):
+        """Tests whether removing a node removes its flows."""
+        bpmn = create_bpmn("task1", "task2")
+        apply_bpmn_delta(bpmn, ModelDelta(remove_nodes=["task2"]))
+        self.assertEqual(
+            {(f.sourceRef, f.targetRef) for f in bpmn.process.flows},
+            {("start", "task1")},
+        )
+        self.assertEqual(bpmn.process.get_node("end").get_in_degree(), 0)
+
+    def test_pnml_delta(self):
+        """Tests whether a PNML delta renames and connects nodes."""
+        pnml = create_pnml()
+        apply_pnml_delta(
+            pnml,
+            ModelDelta.model_validate(
+                {
+                    "change_nodes": [{"id": "t1", "name": "renamed"}],
+                    "add_nodes": [{"id": "t2", "type": "transition"}],
+                    "add_edges": [{"source": "p2", "target": "t2"}],
+                }
+            ),
+        )
+        net = pnml.net
+        self.assertEqual(net.get_element("t1").get_name(), "renamed")
+        self.assertEqual(net.get_in_degree(net.get_element("t2")), 1)
+
+    def test_invalid_delta_keeps_model(self):
+        """Tests whether a rejected delta doesn't change the model."""
+        pnml = create_pnml()
+        for delta in [
+            {"remove_nodes": ["t1"], "change_nodes": [{"id": "unknown"}]},
+            {"add_nodes": [{"id": "t2", "type": "gateway"}]},
+            {"add_nodes": [{"id": "p1", "type": "place"}]},
+            {"remove_nodes": ["t1"], "add_edges": [{"source": "p1", "target": "p2"}]},
+        ]:
+            with self.subTest(delta=delta):
+                with self.assertRaises(InvalidModelDelta):
+                    apply_pnml_delta(pnml, ModelDelta.model_validate(delta))
+                self.assertEqual(set(pnml.net._graph.node_ids()), {"p1", "t1", "p2"})
+                self.assertEqual(len(pnml.net.arcs), 2)
+
+
+class TestSessionRequest(unittest.TestCase):
+    """This class tests the session endpoints."""
+
+    def setUp(self):
+        """Performs setup before each test case."""
+        self.client = create_app("testing").test_client()
+
+    def post_bpmn(self, url: str, bpmn: BPMN):
+        """Post a BPMN as raw XML body."""
+        return self.client.post(
+            url, data=bpmn.to_string(), content_type="application/xml"
+        )
+
+    def test_delta_equals_full_transformation(self):
+        """Tests whether a session delta results in the transformed edited model."""
+        res = self.post_bpmn(
+            "/transform/sessions?direction=bpmntopnml", create_bpmn("a")
+        )
+        self.assertEqual(res.status_code, 201)
+        session_id = res.get_json()["session"]
+
+        res = self.client.post(
+            f"/transform/sessions/{session_id}",
+            json={
+                "remove_edges": ["aTOend"],
+                "add_nodes": [{"id": "b", "type": "task", "name": "b"}],
+                "add_edges": [
+                    {"source": "a", "target": "b"},
+                    {"source": "b", "target": "end"},
+                ],
+            },
+        )
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(res.get_json()["session"], session_id)
+        expected = self.post_bpmn(
+            "/transform?direction=bpmntopnml", create_bpmn("a", "b")
+        ).get_json()
+        equal, error = compare_pnml(
+            Pnml.from_xml_str(expected["pnml"]).net,
+            Pnml.from_xml_str(res.get_json()["pnml"]).net,
+        )
+        self.assertTrue(equal, error)
+
+        # an empty delta returns the last transformation
+        res_empty = self.client.post(f"/transform/sessions/{session_id}", json={})
+        self.assertEqual(res_empty.get_data(), res.get_data())
+
+    def test_invalid_delta(self):
+        """Tests whether an invalid delta is rejected."""
+        res = self.post_bpmn(
+            "/transform/sessions?direction=bpmntopnml", create_bpmn("a")
+        )
+        session_id = res.get_json()["session"]
+        for data in [
+            json.dumps({"remove_nodes": ["unknown"]}),
+            json.dumps({"add_nodes": "a"}),
+            "[]",
+        ]:
+            with self.subTest(data=data):
+                res = self.client.post(
+                    f"/transform/sessions/{session_id}",
+                    data=data,
+                    content_type="application/json",
+                )
+                self.assertEqual(res.status_code, 400)
+                self.assertIn("[15]", res.get_data(as_text=True))
+
+    def test_delete_session(self):
+        """Tests whether a deleted session is unknown."""
+        res = self.post_bpmn(
+            "/transform/sessions?direction=bpmntopnml", create_bpmn("a")
+        )
+        session_id = res.get_json()["session"]
+        self.assertEqual(
+            self.client.delete(f"/transform/sessions/{session_id}").status_code, 204
+        )
+        res = self.client.post(f"/transform/sessions/{session_id}", json={})
+        self.assertEqual(res.status_code, 400)
+        self.assertIn("[13]", res.get_data(as_text=True))
+        self.assertEqual(
+            self.client.delete(f"/transform/sessions/{session_id}").status_code, 400
+        )
+
+    def test_cross_origin_delete(self):
+        """Tests whether a browser may delete a session from another origin."""
+        res = self.post_bpmn(
+            "/transform/sessions?direction=bpmntopnml", create_bpmn("a")
+        )
+        url = f"/transform/sessions/{res.get_json()['session']}"
+        origin = {"Origin": "https://editor.example"}
+        res = self.client.options(
+            url, headers={**origin, "Access-Control-Request-Method": "DELETE"}
+        )
+        self.assertEqual(res.status_code, 200)
+        self.assertIn("DELETE", res.headers["Access-Control-Allow-Methods"])
+        res = self.client.delete(url, headers=origin)
+        self.assertEqual(res.status_code, 204)
+        self.assertEqual(res.headers["Access-Control-Allow-Origin"], "*")
+
+    def test_delete_session_metrics(self):
+        """Tests whether deletions are counted with the status of their response."""
+
+        def count(status: str):
+            return REQUEST_COUNT.labels(
+                method="DELETE", endpoint="/transform/sessions/<id>", status=status
+            )._value.get()
+
+        res = self.post_bpmn(
+            "/transform/sessions?direction=bpmntopnml", create_bpmn("a")
+        )
+        session_id = res.get_json()["session"]
+        counts = [count("204"), count("400"), count("200")]
+        self.client.delete(f"/transform/sessions/{session_id}")
+        self.client.delete(f"/transform/sessions/{session_id}")
+        self.assertEqual(
+            [count("204"), count("400"), count("200")],
+            [counts[0] + 1, counts[1] + 1, counts[2]],
+        )
+
+    def test_session_metrics(self):
+        """Tests whether sessions and deltas are counted with their response status."""
+
+        def count(endpoint: str, status: str):
+            return REQUEST_COUNT.labels(
+                method="POST", endpoint=endpoint, status=status
+            )._value.get()
+
+        labels = [
+            ("/transform/sessions", "201"),
+            ("/transform/sessions", "200"),
+            ("/transform/sessions/<id>", "200"),
+            ("/transform/sessions/<id>", "400"),
+        ]
+        counts = [count(*label) for label in labels]
+        res = self.post_bpmn(
+            "/transform/sessions?direction=bpmntopnml", create_bpmn("a")
+        )
+        url = f"/transform/sessions/{res.get_json()['session']}"
+        self.client.post(url, json={"change_nodes": [{"id": "a", "name": "b"}]})
+        self.client.post(url, json={"remove_nodes": ["unknown"]})
+        self.client.post("/transform/sessions/unknown", json={})
+        self.assertEqual(
+            [count(*label) for label in labels],
+            [counts[0] + 1, counts[1], counts[2] + 1, counts[3] + 2],
+        )
@@ -0,0 +1,139 @@
+"""Unit tests for the compiled XML emitters of model classes."""
+
+import unittest
+import xml.etree.ElementTree as ET
+from pathlib import Path
+from unittest import mock
+
+from app.transform.transformer.models.bpmn.bpmn import BPMN
+from app.transform.transformer.models.pnml.pnml import Pnml, Transition
+from app.transform.transformer.models.pnml.workflow import (
+    Operator,
+    WorkflowBranchingType,
+)
+from app.transform.transformer.utility import xml_emitter, xml_writer
+from app.transform.transformer.utility.utility import BaseModel
+from app.transform.transformer.utility.xml_emitter import ModelEmitter, get_emitter
+from pydantic_xml import element, wrapped
+
+BPMN_ASSETS = Path("tests/transform/assets/diagrams/bpmn")
+PNML_ASSETS = Path("tests/transform/assets/diagrams/pnml")
+UNSUPPORTED_PNML = "Testfall EventBasedGateway.pnml"
+# the other BPMN assets contain unsupported elements
+BPMN_FILES = [
+    *sorted(BPMN_ASSETS.glob("0[234]*.bpmn")),
+    Path("tests/transform/assets/multiplesubprocesses.bpmn"),
+]
+
+
+def tree_text(model) -> str:
+    """Return the text of the element tree of a model."""
+    return ET.tostring(model.to_xml_tree(), encoding="unicode")
+
+
+class TestXMLEmitter(unittest.TestCase):
+    """This class tests emitting models without element trees."""
+
+    def test_pnml_equals_element_tree(self):
+        """Tests whether the emitted nets equal the serialized element trees."""
+        for path in sorted(PNML_ASSETS.glob("*.pnml")):
+            if path.name == UNSUPPORTED_PNML:
+                continue
+            with self.subTest(path=path):
+                pnml = Pnml.from_xml_str(path.read_text()).canonical()
+                emitter = get_emitter(Pnml)
+                assert emitter is not None
+                self.assertEqual(emitter.to_xml(pnml), tree_text(pnml))
+
+    def test_bpmn_chunks_equal_element_trees(self):
+        """Tests whether the chunks of the emitters equal the chunks of trees."""
+        for path in BPMN_FILES:
+            with self.subTest(path=path):
+                bpmn = BPMN.from_xml(path.read_text())
+                compiled = "".join(bpmn.to_chunks())
+                with mock.patch(
+                    "app.transform.transformer.utility.xml_writer.get_emitter",
+                    return_value=None,
+                ):
+                    self.assertEqual(compiled, "".join(bpmn.to_chunks()))
+
+    def test_escaped_values(self):
+        """Tests whether attributes, texts and enums are encoded like pydantic_xml."""
+        transition = Transition.create('t"1&<\n', 'a & <b>\n"c"\t')
+        transition.toolspecific = None
+        self.assertEqual(
+            get_emitter(Transition).to_xml(transition),  # type: ignore[union-attr]
+            tree_text(transition),
+        )
+        operator = Operator(id="op", type=WorkflowBranchingType.XorJoin)
+        emitted = get_emitter(Operator).to_xml(operator)  # type: ignore[union-attr]
+        self.assertEqual(emitted, tree_text(operator))
+        self.assertIn(f'type="{WorkflowBranchingType.XorJoin.value}"', emitted)
+
+    def test_not_compiled(self):
+        """Tests whether classes with serializers without emitter aren't compiled."""
+
+        class Wrapped(BaseModel, tag="wrapped"):  # type: ignore[call-arg]
+            value: str = wrapped("outer", element(tag="inner"))
+
+        class Nesting(BaseModel, tag="nesting"):  # type: ignore[call-arg]
+            nested: Wrapped
+
+        self.assertIsNone(get_emitter(Wrapped))
+        self.assertIsNone(get_emitter(Nesting))
+
+    def test_changed_internals(self):
+        """Tests whether models are serialized if serializer internals are missing."""
+        pnml = Pnml.from_xml_str((PNML_ASSETS / "Example-Workflow.pnml").read_text())
+        expected = "".join(pnml.to_chunks())
+        for error in (AttributeError("_field_serializers"), KeyError("uri")):
+            with (
+                self.subTest(error=error),
+                mock.patch.dict(xml_emitter._emitters, clear=True),
+                mock.patch.object(ModelEmitter, "compile", side_effect=error),
+            ):
+                self.assertIsNone(get_emitter(Pnml))
+                self.assertIsNone(get_emitter(Transition, compact=True))
+                self.assertEqual("".join(pnml.to_chunks()), expected)
+        with (
+            mock.patch.dict(xml_emitter._emitters, clear=True),
+            mock.patch.object(xml_emitter, "_escape_cdata", None),
+        ):
+            self.assertIsNone(get_emitter(Operator))
+        with mock.patch.object(xml_writer, "_chunked_writing", False):
+            self.assertEqual(
+                list(pnml.to_chunks()), [xml_writer.XML_HEADER + pnml.to_string()]
+            )
+
+    def test_changed_behaviour(self):
+        """Tests whether the self-check finds changed internals and falls back."""
+        pnml = Pnml.from_xml_str((PNML_ASSETS / "Example-Workflow.pnml").read_text())
+        expected = "".join(pnml.to_chunks())
+        with (
+            mock.patch.object(xml_emitter, "_emitters_match", None),
+            mock.patch.dict(xml_emitter._emitters, clear=True),
+            mock.patch.object(xml_emitter, "_escape_attrib", lambda text: text),
+        ):
+            self.assertFalse(xml_emitter.emitters_match())
+            self.assertIsNone(get_emitter(Transition))
+            self.assertEqual("".join(pnml.to_chunks()), expected)
+
+        class ChangedElementTree:
+            """ElementTree of the writer, which doesn't write short empty elements."""
+
+            def __getattr__(self, name):
+                return getattr(ET, name)
+
+            @staticmethod
+            def _serialize_xml(write, elem, qnames, namespaces, **kwargs):
+                kwargs["short_empty_elements"] = False
+                ET._serialize_xml(  # type: ignore[attr-defined]
+                    write, elem, qnames, namespaces, **kwargs
+                )
+
+        with (
+            mock.patch.object(xml_writer, "_chunked_writing", None),
+            mock.patch.object(xml_writer, "ET", ChangedElementTree()),
+        ):
+            self.assertFalse(xml_writer.chunked_writing())
+            self.assertEqual("".join(pnml.to_chunks()), expected)